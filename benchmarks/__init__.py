@@ -0,0 +1,6 @@
+"""
+Benchmarks for the zttt package
+================================
+
+Usage: python -m benchmarks [--out results.json] [--baseline baseline.json] [--threshold 0.1]
+"""
@@ -0,0 +1,288 @@
+"""
+The benchmark suite for the hot paths of the zttt package.
+
+Each benchmark returns a dictionary of metrics. The first metric of every benchmark is its primary metric,
+which is the one compared against the baseline.
+"""
+
+import json
+import platform
+import subprocess
+import sys
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter, perf_counter_ns
+from typing import List, Dict, Callable, Union, Any
+
+import zttt
+from zttt import PvP, PvC
+
+
+# Metrics where a lower value is better, all the others are better when higher
+LOWER_IS_BETTER = ('p50_us', 'p99_us', 'import_zttt_us', 'import_pvp_us', 'import_pvc_us')
+
+# The startup budget of a fresh interpreter running 'import zttt', in microseconds
+IMPORT_BUDGET_US = 1000
+
+# The statements timed by bench_import
+_IMPORT_STATEMENTS = (
+    ('import_zttt_us', 'import zttt'),
+    ('import_pvp_us', 'from zttt import PvP'),
+    ('import_pvc_us', 'from zttt import PvC'),
+)
+
+
+def _random_games(n: int, seed: int) -> List[List[int]]:
+    """Plays random PvP games and returns their histories so that the benchmarks replay fixed moves
+
+    :param n: The number of games
+    :type n: int
+    :param seed: The seed of the moves
+    :type seed: int
+    :return: The histories of the games
+    :rtype: List[List[int]]
+    """
+
+    rng = Random(seed)
+    histories = []
+    for _ in range(n):
+        game = PvP()
+        while game.status:
+            game.play(rng.choice(game.empty_positions))
+        histories.append(game.history)
+    return histories
+
+
+def _percentile(samples: List[int], fraction: float) -> float:
+    """Returns the percentile of sorted samples in microseconds
+
+    :param samples: The sorted samples in nanoseconds
+    :type samples: List[int]
+    :param fraction: The percentile as a fraction
+    :type fraction: float
+    :return: The percentile in microseconds
+    :rtype: float
+    """
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))] / 1000
+
+
+def bench_pvp_play(scale: int) -> Dict[str, float]:
+    """PvP.play calls per second"""
+
+    histories = _random_games(scale, 0)
+    moves = sum(len(history) for history in histories)
+    start = perf_counter()
+    for history in histories:
+        game = PvP()
+        for pos in history:
+            game.play(pos)
+    elapsed = perf_counter() - start
+    return {'moves_per_s': moves / elapsed, 'games_per_s': len(histories) / elapsed}
+
+
+def bench_pvc_construct(scale: int) -> Dict[str, float]:
+    """PvC objects constructed per second for both the engines"""
+
+    start = perf_counter()
+    for _ in range(scale):
+        PvC(True)
+    engine_first = scale / (perf_counter() - start)
+
+    start = perf_counter()
+    for _ in range(scale):
+        PvC(False)
+    player_first = scale / (perf_counter() - start)
+    return {'engine_first_per_s': engine_first, 'player_first_per_s': player_first}
+
+
+def _engine_latency(engine_first: bool, scale: int) -> Dict[str, float]:
+    """The latency of PvC.play (the player move and the engine reply) against random moves"""
+
+    rng = Random(1)
+    samples = []
+    for _ in range(scale):
+        game = PvC(engine_first)
+        while game.status:
+            pos = rng.choice(game._empty_positions)
+            start = perf_counter_ns()
+            game.play(pos)
+            samples.append(perf_counter_ns() - start)
+    samples.sort()
+    return {'p50_us': _percentile(samples, 0.5), 'p99_us': _percentile(samples, 0.99)}
+
+
+def bench_engine_first_latency(scale: int) -> Dict[str, float]:
+    """Per move latency of ZTEngineFirst"""
+    return _engine_latency(True, scale)
+
+
+def bench_player_first_latency(scale: int) -> Dict[str, float]:
+    """Per move latency of ZTPlayerFirst"""
+    return _engine_latency(False, scale)
+
+
+def bench_board_render(scale: int) -> Dict[str, float]:
+    """ZTBaseBoard.board renders per second"""
+
+    games = []
+    for history in _random_games(scale // 10 + 1, 2):
+        game = PvP()
+        for pos in history[:-1]:
+            game.play(pos)
+        games.append(game)
+
+    renders = 100 * len(games)
+    start = perf_counter()
+    for _ in range(100):
+        for game in games:
+            game.board
+    return {'renders_per_s': renders / (perf_counter() - start)}
+
+
+def bench_full_games(scale: int) -> Dict[str, float]:
+    """Full random games per second, including the choice of the moves"""
+
+    rng = Random(3)
+    start = perf_counter()
+    for _ in range(scale):
+        game = PvP()
+        while game.status:
+            game.play(rng.choice(game._empty_positions))
+    pvp = scale / (perf_counter() - start)
+
+    start = perf_counter()
+    for i in range(scale):
+        game = PvC(i % 2 == 0)
+        while game.status:
+            game.play(rng.choice(game._empty_positions))
+    pvc = scale / (perf_counter() - start)
+    return {'pvp_games_per_s': pvp, 'pvc_games_per_s': pvc}
+
+
+def _import_time(statement: str) -> float:
+    """Times a statement in a fresh interpreter
+
+    :param statement: The statement
+    :type statement: str
+    :return: The time taken by the statement in microseconds
+    :rtype: float
+    """
+
+    code = f"from time import perf_counter_ns as t; s = t(); {statement}; print((t() - s) / 1000)"
+    return float(subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE).stdout)
+
+
+def bench_import(scale: int) -> Dict[str, float]:
+    """Cold import times of the package, the best of several fresh interpreters"""
+
+    runs = max(3, scale // 400)
+    return {metric: min(_import_time(statement) for _ in range(runs)) for metric, statement in _IMPORT_STATEMENTS}
+
+
+BENCHMARKS: Dict[str, Callable[[int], Dict[str, float]]] = {
+    'pvp_play': bench_pvp_play,
+    'pvc_construct': bench_pvc_construct,
+    'engine_first_latency': bench_engine_first_latency,
+    'player_first_latency': bench_player_first_latency,
+    'board_render': bench_board_render,
+    'full_games': bench_full_games,
+    'import': bench_import,
+}
+
+
+def run(names: List[str], scale: int, repeat: int) -> Dict[str, Any]:
+    """Runs the benchmarks, keeping the best of the repeats
+
+    :param names: The names of the benchmarks to run
+    :type names: List[str]
+    :param scale: The number of games (or objects) per benchmark
+    :type scale: int
+    :param repeat: The number of times each benchmark is repeated
+    :type repeat: int
+    :return: The results which are written as JSON
+    :rtype: Dict[str, Any]
+    """
+
+    results = {}
+    for name in names:
+        best = None
+        for _ in range(repeat):
+            metrics = BENCHMARKS[name](scale)
+            if best is None:
+                best = metrics
+                continue
+            for metric, value in metrics.items():
+                better = min if metric in LOWER_IS_BETTER else max
+                best[metric] = better(best[metric], value)
+        results[name] = best
+
+    return {
+        'zttt': zttt.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'scale': scale,
+        'benchmarks': results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Compares the primary metric of every benchmark against a baseline
+
+    :param results: The current results
+    :type results: Dict[str, Any]
+    :param baseline: The baseline results
+    :type baseline: Dict[str, Any]
+    :param threshold: The relative slowdown that is flagged as a regression
+    :type threshold: float
+    :return: The list of regressions, empty if there are none
+    :rtype: List[str]
+    """
+
+    regressions = []
+    for name, metrics in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        metric = next(iter(metrics))
+        old, new = baseline['benchmarks'][name][metric], metrics[metric]
+        change = (old - new) / old if metric in LOWER_IS_BETTER else (new - old) / old
+        print(f"{name:<24} {metric:<20} {old:>14.2f} -> {new:>14.2f} ({change:+.1%})")
+        if change < -threshold:
+            regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    """The command line entry point"""
+
+    parser = ArgumentParser(prog='python -m benchmarks', description="Benchmarks for the zttt package")
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (all by default): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--scale', type=int, default=2000, help="games or objects per benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="repeats per benchmark, the best is kept")
+    parser.add_argument('--out', help="file to write the JSON results to")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="relative slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name!r}")
+
+    results = run(args.names or list(BENCHMARKS), args.scale, args.repeat)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    startup = results['benchmarks'].get('import', {}).get('import_zttt_us')
+    if startup is not None and startup > IMPORT_BUDGET_US:
+        print(f"import zttt took {startup:.0f} us, over the budget of {IMPORT_BUDGET_US} us")
+        sys.exit(1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions:", ', '.join(regressions))
+            sys.exit(1)
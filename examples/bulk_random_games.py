@@ -0,0 +1,21 @@
+"""examples/bulk_random_games.py"""
+
+
+def main():
+    from zttt.simulate import simulate_random_games
+
+    # Play a million random games at once
+    results = simulate_random_games(1_000_000, seed=0)
+    counts = results.counts()
+
+    print(f"Player 1 won {counts[1]} games")
+    print(f"Player 2 won {counts[2]} games")
+    print(f"{counts[0]} games were drawn")
+
+    # Each game can be inspected individually
+    print("Moves of the first game", results.history(0))
+    print("Positions to be highlighted", results.highlighted_positions(0))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,24 @@
 
 from .basic_tests import *
+from .solver_tests import *
+from .symmetry_tests import *
+from .simulate_tests import *
+from .batch_tests import *
+from .tournament_tests import *
+from .store_tests import *
+from .snapshot_tests import *
+from .gamelog_tests import *
+from .undo_tests import *
+from .mnk_tests import *
+from .search_tests import *
+from .mcts_tests import *
+from .server_tests import *
+from .events_tests import *
+from .render_tests import *
+from .replay_tests import *
+from .analysis_tests import *
+from .profile_tests import *
+from .book_tests import *
+from .import_tests import *
+from .random_tests import *
+from .thread_tests import *
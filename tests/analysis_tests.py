@@ -0,0 +1,69 @@
+def test_analyse_matches_games():
+    from random import Random
+    from zttt import PvP, PvC
+    from zttt.analysis import analyse, analyse_history, summarise
+    from zttt._zt_core import solver_lookup
+    rng = Random(20)
+    games = []
+    for i in range(200):
+        b = PvP() if i % 2 else PvC(True, _solver=True)
+        while b.status:
+            b.play(rng.choice(b.empty_positions))
+        games.append(b)
+
+    histories = [b.history for b in games[::2]]
+    for workers in (None, 2):
+        results = list(analyse(histories, engine=1, workers=workers, chunk_size=7))
+        assert len(results) == len(histories)
+        for b, r in zip(games[::2], results):
+            assert (r.winner, r.length, list(r.highlighted)) == (b.winner, len(b.history), b.highlighted)
+            # The solver engine never loses value
+            assert r.deviations == 0 and r.first_deviation is None
+
+    r = next(analyse(iter([[0, 1, 4]]), engine=2))
+    assert r.winner is None and r.highlighted == () and (r.deviations, r.first_deviation) == (1, 1)
+    assert next(analyse([[1, 0]])).deviations is None
+
+    from zttt.zt_errors import ZTBadFunctionCall
+    for call in (lambda: analyse_history([0, 1], engine=3), lambda: analyse_history([0], engine=0),
+                 lambda: summarise([[0, 1]], engine=3)):
+        try:
+            call()
+        except ZTBadFunctionCall:
+            pass
+        else:
+            assert False, "The engine is player 1 or 2"
+
+    summary = summarise(iter(b.history for b in games[1::2]), workers=2, chunk_size=9)
+    assert summary.games == 100 and sum(summary.outcomes) == 100 and summary.checked_games == 0
+    assert summary.outcomes[1:3] == [sum(b.winner == p for b in games[1::2]) for p in (1, 2)]
+    assert sum(summary.lengths) == 100 and sum(summary.lines) >= summary.outcomes[1] + summary.outcomes[2]
+    assert summary.to_dict()['outcomes']['draw'] == summary.outcomes[0]
+
+
+def test_analysis_sources(tmp_path):
+    from io import StringIO
+    from zttt import PvC
+    from zttt.analysis import read_histories, summarise_log, analyse_history
+    from zttt.gamelog import GameLogWriter, GameLog
+    from zttt.zt_errors import ZTInvalidInput, ZTGameException
+
+    assert list(read_histories(StringIO("048\n\n0, 4 ,8\n1 2\n"))) == [[0, 4, 8], [0, 4, 8], [1, 2]]
+    for history, error in (([0, 0], ZTInvalidInput), ([9], ZTInvalidInput), ([0, 3, 1, 4, 2, 5], ZTGameException)):
+        try:
+            analyse_history(history)
+        except error:
+            pass
+        else:
+            assert False, f"{history} is not valid"
+
+    path = str(tmp_path / 'games.ztgl')
+    with GameLogWriter(path) as writer:
+        for engine_first in (True, False, True):
+            b = PvC(engine_first, _solver=True)
+            while b.status:
+                b.play(b.empty_positions[0])
+            writer.write(b)
+    with GameLog(path) as log:
+        summary = summarise_log(log)
+    assert summary.games == summary.checked_games == 3 and summary.deviations == 0
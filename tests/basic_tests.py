@@ -69,3 +69,36 @@ def test_draw():
     assert b.status is False
     assert b.winner is 0
     assert out[0] == "Draw"
+
+
+def test_invalid_positions():
+    from zttt import PvP
+    from zttt.zt_errors import ZTInvalidInput
+    b = PvP()
+    b.play(4)
+    for pos in (4, -1, 9, 'a'):
+        try:
+            b.play(pos)
+        except ZTInvalidInput:
+            pass
+        else:
+            assert False, f"{pos!r} was accepted"
+    assert b.empty_corners == [0, 2, 6, 8]
+    assert b.empty_edges == [1, 3, 5, 7]
+    assert b.history == [4]
+
+
+def test_double_line_highlight():
+    from zttt import PvP
+    b = PvP()
+    for pos in (0, 1, 2, 3, 6, 5, 8, 7, 4):
+        b.play(pos)
+    assert b.winner == 1
+    assert b.highlighted == [4, 0, 8, 2, 6]
+
+
+def test_no_instance_dict():
+    from zttt import PvP, PvC
+    for b in (PvP(), PvC(True), PvC(False), PvC(True, True)):
+        assert not hasattr(b, '__dict__')
+    assert PvP().on_move is PvP().on_move  # The default triggers are shared
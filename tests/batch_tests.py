@@ -0,0 +1,35 @@
+from random import Random
+
+
+class _FirstChoice(Random):
+    def choice(self, seq):
+        return seq[0]
+
+
+def test_batch_bot_moves():
+    from zttt import PvP, batch_bot_moves
+    from zttt._zt_core import zt_base_engine
+
+    # Take the first candidate everywhere so that the engine and the batch can be compared exactly
+    first = _FirstChoice()
+
+    rng = Random(3)
+    engines, positions = [], []
+    for i in range(300):
+        b = PvP()
+        for _ in range(rng.randrange(1, 7)):
+            b.play(rng.choice(b.empty_positions))
+            if not b.status:
+                break
+        if not b.status:
+            continue
+        engine = zt_base_engine.ZTBaseEngine(b.turn == 1, first)
+        for pos in b.history:
+            engine._play_player_one_move(pos) if engine.turn == 1 else engine._play_player_two_move(pos)
+        engines.append(engine)
+        positions.append((b.board_list, b.turn == 1))
+
+    moves = batch_bot_moves(positions, first)
+    assert len(moves) == len(engines) > 200
+    for engine, move in zip(engines, moves):
+        assert engine._get_bot_move() == ([] if move is None else [move])
@@ -0,0 +1,58 @@
+def test_book_matches_solver_and_heuristics():
+    from itertools import product
+    from zttt import PvC
+    from zttt.book import generate_book
+    from zttt._zt_core import get_book, solver_lookup
+
+    book = get_book(3, 3, 3)
+    assert book is get_book(3, 3, 3) and book.search_depth is None and len(book) == 1090
+    for mask1, mask2 in book.positions():
+        value, moves = solver_lookup(mask1, mask2)
+        assert book.lookup(mask1, mask2) == (value, sorted(moves))
+
+    # The book can be regenerated
+    generated = generate_book(3, 3, 3, 3)
+    assert len(generated) == 1 + 9 + 72
+    for mask1, mask2 in generated.positions():
+        assert generated.lookup(mask1, mask2) == book.lookup(mask1, mask2)
+
+    # The opening tables of the heuristic engines only play moves of the book
+    for engine_first in (True, False):
+        for replies in product(range(9), repeat=2):
+            for _ in range(4):
+                game = PvC(engine_first)
+                for pos in replies:
+                    if pos not in game.empty_positions:
+                        break
+                    game.play(pos)
+                history = game.history
+                for ply in range(0 if engine_first else 1, min(len(history), book.depth), 2):
+                    played = PvC.from_history(history[:ply])
+                    assert history[ply] in book.lookup(played._masks[1], played._masks[2])[1], history
+
+
+def test_book_persistence_and_engines(tmp_path):
+    from zttt import MNKPvC
+    from zttt._zt_core import ZTBook, get_book
+    from zttt.zt_errors import ZTInvalidInput
+
+    book = get_book(4, 4, 4)
+    assert book.depth == 3 and get_book(5, 5, 5) is None
+    path = str(tmp_path / 'book.ztob')
+    book.save(path)
+    assert ZTBook.load(path) == book and ZTBook.from_bytes(book.to_bytes()) == book
+    for data in (b'', b'ZTXX' + book.to_bytes()[4:], book.to_bytes()[:-1]):
+        try:
+            ZTBook.from_bytes(data)
+        except ZTInvalidInput:
+            pass
+        else:
+            assert False, "The data is not a book"
+
+    # The engine plays the book moves without searching
+    b = MNKPvC(4, 4, 4, True, time_limit=0.1)
+    assert b.last_search is None and b.history[0] in book.lookup(0, 0)[1]
+    b.play(b.empty_positions[0])
+    assert b.last_search is None and len(b.history) == 3
+    b.play(b.empty_positions[0])
+    assert b.last_search is not None
@@ -0,0 +1,55 @@
+def test_event_bus_subscribers():
+    from zttt import PvP
+    b = PvP()
+    assert b._events is None  # Nothing is published until a bus is attached
+    seen, kinds = [], []
+    b.events.subscribe(lambda event: seen.append((event.player, event.pos, event.game.move)), 'move')
+    unsubscribe = b.events.subscribe(lambda event: kinds.append(event.kind))
+    b.on_move = lambda player, pos: kinds.append('trigger')
+    for pos in (0, 1, 3, 2):
+        b.play(pos)
+    unsubscribe()
+    b.play(6)
+    assert seen == [(1, 0, 2), (2, 1, 3), (1, 3, 4), (2, 2, 5), (1, 6, 6)]  # The board is updated first
+    assert kinds == ['trigger', 'move'] * 4 + ['trigger']
+    assert b.clone()._events is None
+
+
+def test_event_bus_batches_and_store():
+    from zttt import ZTEventBus
+    from zttt.store import GameStore
+    bus = ZTEventBus(batch_size=3)
+    batches = []
+    bus.subscribe_batch(batches.append)
+    store = GameStore(events=bus)
+    _, game1 = store.create()
+    _, game2 = store.create(pvc=True)
+    game1.play(4)
+    game2.play(4)
+    # The engine reply of game2 is published too, its first move was played before the store attached the bus
+    assert [len(batch) for batch in batches] == [3]
+    assert [event.game for event in batches[0]] == [game1, game2, game2]
+    game1.play(0)
+    bus.flush()
+    assert len(batches) == 2 and batches[1][0].game is game1
+
+
+def test_event_bus_async_subscriber():
+    import asyncio
+    from zttt import PvP
+
+    async def scenario():
+        b = PvP()
+        received = []
+
+        async def subscriber(event):
+            received.append(event.winner)
+
+        b.events.subscribe(subscriber, 'finish')
+        for pos in (0, 1, 3, 2, 6):
+            b.play(pos)
+        assert received == []  # Delivered off the move path
+        await asyncio.sleep(0.01)
+        assert received == [1]
+
+    asyncio.run(scenario())
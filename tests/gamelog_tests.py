@@ -0,0 +1,36 @@
+def test_game_log(tmp_path):
+    from random import Random
+    from zttt import PvP, PvC
+    from zttt.gamelog import GameLog, GameLogWriter
+    rng = Random(2)
+    path = str(tmp_path / 'games.ztgl')
+    finished = []
+    with GameLogWriter(path) as writer:
+        for i in range(200):
+            game = PvP() if i % 3 == 0 else PvC(i % 3 == 1)
+            game.on_finish = lambda winner, game=game: finished.append(game)
+            writer.attach(game)
+            while game.status:
+                game.play(rng.choice(game.empty_positions))
+
+    with GameLog(path) as log:
+        assert len(log) == len(finished) == 200
+        for i, game in enumerate(finished):
+            record = log[i]
+            assert record.history == game.history
+            assert record.winner == game.winner
+            assert record.highlighted == sorted(set(game.highlighted))
+        assert log[-1] == log[199] and log[10:13] == list(log.iter(10, 13))
+        counts = log.outcome_counts()
+        assert counts == {w: sum(g.winner == w for g in finished) for w in (0, 1, 2)}
+
+        game = log.rebuild(1)
+        assert isinstance(game, PvC) and game.history == finished[1].history and not game.status
+        game = log.rebuild(2, ply=2)
+        assert game.history == finished[2].history[:2] and game.status
+        game.play(game.empty_positions[0])  # The rebuilt engine plays on
+
+    with GameLogWriter(path) as writer:
+        writer.write(finished[0])
+    with GameLog(path) as log:
+        assert len(log) == 201 and log[200] == log[0]
@@ -0,0 +1,45 @@
+def _loaded_after(statement):
+    import subprocess
+    import sys
+    code = f"import sys; before = set(sys.modules); {statement}; print(' '.join(sorted(set(sys.modules) - before)))"
+    return set(subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                              universal_newlines=True).stdout.split())
+
+
+def test_lazy_imports():
+    # import zttt loads nothing else, a PvP game does not load the engines or the slow standard modules
+    assert _loaded_after("import zttt") == {'zttt'}
+    loaded = _loaded_after("from zttt import PvP; PvP().play(4)")
+    for module in ('zttt.pvc', 'zttt._zt_core.zt_search', 'zttt._zt_core.zt_mcts', 'zttt._zt_core.zt_profile',
+                   'asyncio', 'concurrent.futures', 'json', 'importlib'):
+        assert module not in loaded, module
+    loaded = _loaded_after("import zttt; zttt.PvC(True).play(4)")
+    for module in ('zttt.mnkpvc', 'zttt._zt_core.zt_search', 'zttt._zt_core.zt_mcts', 'zttt._zt_core.zt_mnk_engine',
+                   'zttt._zt_core.zt_book', 'copy', 'asyncio', 'concurrent.futures'):
+        assert module not in loaded, module
+
+    # The m, n, k games are still found under zttt.pvc, where they were before
+    from zttt import MNKPvC, MCTSPvC, pvc
+    assert pvc.MNKPvC is MNKPvC and pvc.MCTSPvC is MCTSPvC
+
+    import zttt
+    from zttt import _zt_core
+    from zttt.zt_errors import ZTError
+    for name in zttt.__all__:
+        assert hasattr(zttt, name) and name in dir(zttt)
+    for name in _zt_core.__all__:
+        assert hasattr(_zt_core, name)
+    assert zttt.zt_errors.ZTError is ZTError
+    try:
+        zttt.PvX
+    except AttributeError:
+        pass
+    else:
+        assert False, "zttt has no PvX"
+
+
+def test_deferred_tables():
+    from zttt._zt_core import zt_symmetry, zt_batch, canonical_masks, bot_move_from_masks
+    assert canonical_masks(1 << 2, 0) == (1, 0, canonical_masks(1 << 2, 0)[2])
+    assert zt_symmetry._MASK_TRANSFORMS is zt_symmetry._mask_transforms()
+    assert bot_move_from_masks(0b11, 0) == 2 and zt_batch._OPEN_CELLS is zt_batch._open_cells()
@@ -0,0 +1,29 @@
+def test_mcts_budgets():
+    from time import perf_counter
+    from zttt._zt_core import mcts_move
+    start = perf_counter()
+    result = mcts_move(7, 7, 5, 0, 0, time_limit=0.2)
+    assert perf_counter() - start < 0.4 and result.playouts > 0
+    result = mcts_move(4, 4, 4, 0, 0, None, playouts=300, seed=15)
+    assert result.playouts == 300 and result == mcts_move(4, 4, 4, 0, 0, None, playouts=300, seed=15)
+    result = mcts_move(4, 4, 4, 0, 0, None, playouts=300, workers=2, seed=15)
+    assert result.playouts == 300
+
+
+def test_mcts_engine():
+    from zttt import MCTSPvC, PvC
+    from zttt._zt_core import mcts_move
+    b = MCTSPvC(4, 4, 4, False, None, playouts=2000, rng=0)
+    for pos in (0, 1, 2):
+        b.play(pos)
+    assert 3 in b.history  # The engine blocks the row
+    b.undo()
+    assert len(b.history) == 4 and b.turn == 1
+
+    # Against the solver on 3x3 the tree search does not lose, both seeded so the games are always the same
+    for i in range(4):
+        game = PvC(i % 2 == 0, True, rng=i)
+        while game.status:
+            turn = game.turn
+            game.play(mcts_move(3, 3, 3, game._masks[turn], game._masks[3 - turn], None, 3000, seed=i).move)
+        assert game.winner == 0
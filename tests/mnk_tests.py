@@ -0,0 +1,53 @@
+def test_mnk_gomoku_win():
+    from zttt import MNKPvP
+    b = MNKPvP(15, 15, 5)
+    # Player 1 plays a diagonal from (3, 3), player 2 plays along the first row
+    for i in range(4):
+        b.play((3 + i) * 15 + 3 + i)
+        b.play(i)
+    assert b.status
+    b.play(7 * 15 + 7)
+    assert not b.status and b.winner == 1
+    assert sorted(b.highlighted) == [(3 + i) * 15 + 3 + i for i in range(5)]
+
+
+def test_mnk_draw_by_player_two():
+    from zttt import MNKPvP
+    b = MNKPvP(4, 4, 4)
+    # Rows alternate XXOO and OOXX so that no row, column or diagonal is complete
+    for pos in (0, 2, 1, 3, 6, 4, 7, 5, 8, 10, 9, 11, 14, 12, 15, 13):
+        b.play(pos)
+    assert not b.status and b.winner == 0 and b.move == 17
+
+
+def test_mnk_matches_pvp():
+    from random import Random
+    from zttt import PvP, MNKPvP
+    rng = Random(13)
+    for _ in range(500):
+        b, m = PvP(), MNKPvP()
+        while b.status:
+            pos = rng.choice(b.empty_positions)
+            b.play(pos)
+            m.play(pos)
+            assert m.status == b.status
+        assert (m.winner, sorted(m.highlighted)) == (b.winner, sorted(b.highlighted))
+        assert m.board == b.board
+
+
+def test_mnk_invalid():
+    from zttt import MNKPvP
+    from zttt.zt_errors import ZTBadFunctionCall, ZTInvalidInput
+    try:
+        MNKPvP(3, 3, 4)
+    except ZTBadFunctionCall:
+        pass
+    else:
+        assert False, "k larger than the board"
+    b = MNKPvP(2, 5, 2)
+    try:
+        b.play(10)
+    except ZTInvalidInput:
+        pass
+    else:
+        assert False, "Position outside the board"
@@ -0,0 +1,41 @@
+def test_profiling():
+    import json
+    from random import Random
+    from zttt import PvC, PvP, profiling
+    from zttt._zt_core import ZTBaseBoard, ZTEngineFirst, profiling_stats
+    from zttt.zt_errors import ZTInvalidInput
+
+    verify_pos = ZTBaseBoard._verify_pos
+    rng = Random(21)
+    with profiling() as stats:
+        for i in range(100):
+            b = PvC(i % 2 == 0)
+            while b.status:
+                b.play(rng.choice(b.empty_positions))
+        b = PvP()
+        b.on_move = lambda player, pos: None
+        b.play(4)
+        try:
+            b.play(4)
+        except ZTInvalidInput:
+            pass
+        assert profiling_stats() is stats
+
+    # The original methods are back
+    assert ZTBaseBoard._verify_pos is verify_pos and profiling_stats() is None
+    assert not hasattr(ZTEngineFirst.__dict__['_ZTEngineFirst__choose_move'], '__wrapped__')
+
+    data = json.loads(stats.to_json())
+    steps = data['steps']
+    assert steps['verify_pos']['count'] == steps['move']['count']
+    assert steps['on_move']['count'] == 1 and steps['check_win']['count'] == steps['move']['count'] - 1
+    assert sum(hits for _, hits in steps['move']['histogram']) == steps['move']['count']
+    engine_moves = steps['engine_first']['count'] + steps['player_first']['count']
+    assert sum(data['branches'].values()) == engine_moves
+    assert data['branches']['engine_first.opening'] == 50 and data['branches']['player_first.opening'] > 0
+    assert 0 < stats.percentile('move', 50) <= stats.percentile('move', 100) == stats.max_ns['move']
+
+    stats.reset()
+    b = PvC(True)
+    b.play(b.empty_positions[0])
+    assert stats.to_dict() == {'steps': {}, 'branches': {}}
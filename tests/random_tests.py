@@ -0,0 +1,58 @@
+def _play_out(game):
+    # Plays the first empty position for the player until the game is over
+    while game.status:
+        game.play(game._empty_positions[0])
+    return game._history
+
+
+def test_seeded_engines():
+    from zttt import PvC, ZTRandom
+    for engine_first in (True, False):
+        for solver in (False, True):
+            histories = [_play_out(PvC(engine_first, solver, rng=seed)) for seed in (7, 7)]
+            assert histories[0] == histories[1]
+            stream = ZTRandom(7)
+            assert _play_out(PvC(engine_first, solver, stream)) == histories[0]
+
+    # The global generator is left alone by seeded games
+    import random
+    random.seed(3)
+    expected = random.random()
+    random.seed(3)
+    _play_out(PvC(True, rng=1))
+    assert random.random() == expected
+
+    # A clone continues from a copy of the stream of its game, drawing on it leaves the game alone
+    game = PvC(False, rng=5)
+    game.play(0)
+    expected = game.clone().rng.random()
+    clone = game.clone()
+    assert clone.rng is not game.rng and clone.rng.random() == expected
+    _play_out(clone)
+    assert game.rng.random() == expected
+    assert PvC(False).clone().rng is random.choice.__self__
+
+
+def test_spawned_streams():
+    import pickle
+    from zttt import ZTRandom
+    parent = ZTRandom(11)
+    first = parent.spawn(4)
+    assert len({stream.random() for stream in first}) == 4
+    # The children depend on the seed and on how many were spawned before, not on the draws of the parent
+    parent.random()
+    assert [stream.entropy for stream in parent.spawn(2)] == \
+        [stream.entropy for stream in ZTRandom(11).spawn(6)[4:]]
+    assert [s.random() for s in ZTRandom(11).spawn(4)] == [s.random() for s in ZTRandom(11).spawn(4)]
+
+    stream = pickle.loads(pickle.dumps(first[0]))
+    assert stream.entropy == first[0].entropy and stream.random() == first[0].random()
+    assert all(ZTRandom(0).choice('abc') in 'abc' for _ in range(100))
+
+    from zttt.zt_errors import ZTBadFunctionCall
+    try:
+        ZTRandom('seed')
+    except ZTBadFunctionCall:
+        pass
+    else:
+        assert False, "The seed must be an integer"
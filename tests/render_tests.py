@@ -0,0 +1,33 @@
+def test_render_formats():
+    import json
+    from zttt import PvP
+    from zttt.zt_errors import ZTBadFunctionCall
+    b = PvP()
+    for pos in (0, 4, 8):
+        b.play(pos)
+    assert b.render('compact') == 'X  | O |  X'
+    assert json.loads(b.render('json')) == [['X', ' ', ' '], [' ', 'O', ' '], [' ', ' ', 'X']]
+    assert b.board.split('\n')[5] == '|     |  O  |     |' and b.board is b.render('boxed')
+    try:
+        b.render('html')
+    except ZTBadFunctionCall:
+        pass
+    else:
+        assert False, "Unknown format"
+
+
+def test_render_indicator_sets_and_bulk():
+    from zttt import PvP, MNKPvP, render_boards
+    b = PvP()
+    b.play(0)
+    PvP.set_indicators('A', 'B', '.')
+    try:
+        assert b.render('compact') == 'A..|...|...'
+    finally:
+        PvP.set_indicators()
+    assert b.render('compact') == 'X  |   |   '
+
+    m = MNKPvP(2, 4, 3)
+    m.play(7)
+    assert m.render('compact') == '    |   X' and m.board.count('\n') == 7
+    assert render_boards([b, m, b], 'compact', ';') == 'X  |   |   ;    |   X;X  |   |   '
@@ -0,0 +1,59 @@
+def test_replay_matches_play():
+    from random import Random
+    from zttt import PvP, PvC, MNKPvP
+    rng = Random(19)
+    for i in range(300):
+        if i % 3 == 2:
+            b = MNKPvP(4, 4, 3)
+        else:
+            b = PvP() if i % 3 == 0 else PvC(i % 2 == 0)
+        while b.status:
+            b.play(rng.choice(b.empty_positions))
+
+        if isinstance(b, PvC):
+            r = PvC.from_history(b.history, b.engine_first)
+            assert r._ZTBaseEngine__active_lines == PvC._restore(b.history, b.engine_first)._ZTBaseEngine__active_lines
+        elif isinstance(b, MNKPvP):
+            r = MNKPvP.from_history(b.history, 4, 4, 3)
+        else:
+            r = PvP.from_history(b.history)
+        assert (r.status, r.winner, r.highlighted, r.history, r.board_list, r.move) == \
+            (b.status, b.winner, b.highlighted, b.history, b.board_list, b.move)
+
+
+def test_replay_validation_and_triggers():
+    from zttt import PvP, PvC
+    from zttt.zt_errors import ZTGameException, ZTInvalidInput
+    b = PvP()
+    b.play(4)
+    for history, error in (([0, 0], ZTInvalidInput), ([0, 9], ZTInvalidInput), (['a'], ZTInvalidInput),
+                           ([0, 1, 8, 7, 2], ZTGameException)):
+        try:
+            b.replay(history)
+        except error:
+            assert b.history == [4] and b.board_list == PvP.from_history([4]).board_list and b.status
+        else:
+            assert False, f"{history} is not valid"
+
+    # The winning move of a rejected sequence leaves no highlight behind
+    fresh = PvP()
+    try:
+        fresh.replay([0, 3, 1, 4, 2, 5])
+    except ZTGameException:
+        assert fresh.status and fresh.history == [] and fresh.highlighted == [] and fresh.winner is None
+    else:
+        assert False, "A move is played after the win"
+
+    moves, finished = [], []
+    b.on_move = lambda player, pos: moves.append((player, pos, b.status))
+    b.on_finish = finished.append
+    b.replay([0, 1])
+    assert moves == []
+    b.replay([8, 7], triggers=True)
+    assert moves == [(2, 8, False), (1, 7, False)] and finished == [1]  # Called after the replay
+
+    # The engine plays on from the replayed position
+    game = PvC.from_history([4, 0], _engine_first=False)
+    assert game.center and game.turn == 1
+    game.play(8)
+    assert len(game.history) == 4
@@ -0,0 +1,58 @@
+def test_search_matches_solver():
+    from random import Random
+    from zttt import PvP
+    from zttt._zt_core import search_move, solver_lookup
+    rng = Random(14)
+    for _ in range(100):
+        b = PvP()
+        for _ in range(rng.randrange(7)):
+            if b.status:
+                b.play(rng.choice(b.empty_positions))
+        if not b.status:
+            continue
+        turn = b.turn
+        result = search_move(3, 3, 3, b._masks[turn], b._masks[3 - turn], turn, None)
+        value, moves = solver_lookup(b._masks[1], b._masks[2])
+        assert result.move in moves
+        assert (result.score > 999000) - (result.score < -999000) == value
+
+
+def test_search_engine_wins_and_blocks():
+    from zttt import MNKPvC
+    b = MNKPvC(4, 4, 4, False, time_limit=0.2)
+    for pos in (0, 1, 2):
+        b.play(pos)
+        assert b.status
+    assert 3 in b.history  # The engine blocks the row
+    assert b.last_search.depth >= 1
+
+    b = MNKPvC(5, 5, 4, True, time_limit=0.2)
+    while b.status:
+        b.play(b.empty_positions[-1])
+    assert b.winner == 1  # A player only taking the last empty position loses
+
+
+def test_search_engine_undo_and_workers():
+    from zttt import MNKPvC
+    b = MNKPvC(4, 4, 4, True, time_limit=0.1, workers=2)
+    assert len(b.history) == 1
+    b.play(b.empty_positions[0])
+    assert len(b.history) == 3 and b.turn == 2
+    b.undo()
+    assert len(b.history) == 1 and b.turn == 2
+    b.redo()
+    assert len(b.history) == 3
+    c = b.clone()
+    assert c.dimensions == (4, 4, 4) and c.workers == 2 and c.history == b.history
+
+
+def test_search_time_limit():
+    from time import perf_counter
+    from zttt._zt_core import search_move
+    search_move(15, 15, 5, 0, 0, 1, 0.01)  # Builds the tables
+    for time_limit in (0.0, 0.05):
+        start = perf_counter()
+        result = search_move(15, 15, 5, 1 << 112, 1 << 113, 1, time_limit)
+        assert perf_counter() - start < time_limit + 0.05 and result.depth >= 1
+    # The first iteration keeps the best move at depth 1, the win, even without time
+    assert search_move(4, 4, 4, 0b0111, 0b0111 << 4, 1, 0.0).move == 3
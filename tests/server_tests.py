@@ -0,0 +1,94 @@
+def test_server_sessions():
+    import asyncio
+    import json
+    from zttt.server import GameServer
+
+    async def request(reader, writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        while True:
+            line = json.loads(await reader.readline())
+            if 'event' not in line:
+                return line
+
+    async def scenario():
+        server = await GameServer().serve('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader1, writer1 = await asyncio.open_connection('127.0.0.1', port)
+        reader2, writer2 = await asyncio.open_connection('127.0.0.1', port)
+
+        created = await request(reader1, writer1, {'op': 'new', 'type': 'pvp', 'id': 1})
+        assert created['ok'] and created['id'] == 1
+        game_id = created['game']
+        assert (await request(reader2, writer2, {'op': 'join', 'game': game_id}))['state']['turn'] == 1
+
+        played = await request(reader1, writer1, {'op': 'play', 'game': game_id, 'pos': 4})
+        assert played['state']['board'][4] == 4
+        event = json.loads(await reader2.readline())
+        assert event == {'event': 'move', 'game': game_id, 'player': 1, 'pos': 4}
+
+        error = await request(reader2, writer2, {'op': 'play', 'game': game_id, 'pos': 4})
+        assert not error['ok'] and error['error']
+        assert not (await request(reader2, writer2, {'op': 'state', 'game': 'missing'}))['ok']
+        writer2.write(b'not json\n')
+        assert json.loads(await reader2.readline())['error'] == "Invalid JSON"
+
+        created = await request(reader1, writer1, {'op': 'new', 'type': 'mnk', 'm': 4, 'n': 4, 'k': 4,
+                                                   'engine': 'mcts', 'engine_first': False, 'time_limit': 0.05})
+        played = await request(reader1, writer1, {'op': 'play', 'game': created['game'], 'pos': 0})
+        assert len(played['state']['history']) == 2  # The engine replied
+
+        for writer in (writer1, writer2):
+            writer.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_server_limits_and_eviction():
+    import asyncio
+    import json
+    from time import perf_counter
+    from zttt.server import GameServer
+    from zttt.store import GameStore
+
+    async def request(reader, writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        while True:
+            line = json.loads(await reader.readline())
+            if 'event' not in line:
+                return line
+
+    async def scenario():
+        dropped = []
+        game_server = GameServer(GameStore(max_games=1, on_drop=dropped.append), max_side=8, max_time_limit=0.05)
+        server = await game_server.serve('127.0.0.1', 0)
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+
+        start = perf_counter()
+        created = await request(reader, writer, {'op': 'new', 'type': 'mnk', 'm': 10000, 'n': 10000, 'k': 5,
+                                                 'engine': 'search', 'time_limit': 1e9})
+        assert created['ok'] and len(created['state']['board']) == 64 and perf_counter() - start < 1
+        first = created['game']
+        played = await request(reader, writer, {'op': 'play', 'game': first, 'pos': 0})
+        assert played['ok'] and first in game_server._subscribers
+        assert not (await request(reader, writer, {'op': 'new', 'type': 'mnk', 'time_limit': 'inf'}))['ok']
+
+        # The first game is evicted by the second, its lock and subscribers go with it
+        second = (await request(reader, writer, {'op': 'new', 'type': 'pvp'}))['game']
+        assert first not in game_server._subscribers and first not in game_server._locks
+        assert second in game_server._subscribers and dropped == [first]
+
+        # Malformed requests are answered and the connection stays open
+        for message in ({'op': [1]}, {'op': 'leave', 'game': [1]}, {'op': 'state', 'game': {}}):
+            response = await request(reader, writer, message)
+            assert not response['ok'] and response['error']
+        assert (await request(reader, writer, {'op': 'state', 'game': second}))['ok']
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
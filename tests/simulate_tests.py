@@ -0,0 +1,18 @@
+def test_simulated_games_replay():
+    from zttt import PvP
+    from zttt.simulate import simulate_random_games
+    results = simulate_random_games(500, seed=1)
+    assert len(results) == 500
+    for game in range(len(results)):
+        b = PvP()
+        for pos in results.history(game):
+            b.play(pos)
+        assert b.status is False
+        assert b.winner == results.winners[game]
+        assert sorted(set(b.highlighted)) == results.highlighted_positions(game)
+
+
+def test_simulation_seed():
+    from zttt.simulate import simulate_random_games
+    assert simulate_random_games(100, seed=7).histories == simulate_random_games(100, seed=7).histories
+    assert sum(simulate_random_games(100).counts().values()) == 100
@@ -0,0 +1,69 @@
+def _random_games():
+    from random import Random
+    from zttt import PvP, PvC
+    rng = Random(5)
+    games = []
+    for i in range(300):
+        game = PvP() if i % 4 == 0 else PvC(i % 4 == 1, i % 4 == 3)
+        for _ in range(rng.randrange(6)):
+            if game.status:
+                game.play(rng.choice(game.empty_positions))
+        games.append(game)
+    return games
+
+
+def _state(game):
+    from zttt import PvC
+    state = [type(game), game.history, game.status, game.winner, game.highlighted, game.move]
+    if isinstance(game, PvC):
+        state += [game.engine_first, game.solver]
+        if not game.engine_first and not game.solver:
+            state += [game.center, game.liberty_move3]
+    return state
+
+
+def test_snapshot_round_trip():
+    from zttt.snapshot import dumps, loads
+    for game in _random_games():
+        data = dumps(game)
+        assert len(data) <= 6
+        restored = loads(data)
+        assert _state(restored) == _state(game)
+        if restored.status:
+            restored.play(restored.empty_positions[0])
+
+
+def test_snapshot_many():
+    from zttt.snapshot import dumps_many, loads_many
+    from zttt.zt_errors import ZTInvalidInput
+    games = _random_games()
+    data = dumps_many(games)
+    assert [_state(game) for game in loads_many(data)] == [_state(game) for game in games]
+    for bad in (data[:-1], b'\x00\x00', b'\x20\x0a'):
+        try:
+            loads_many(bad)
+        except ZTInvalidInput:
+            pass
+        else:
+            assert False, f"{bytes(bad[-4:])!r} was decoded"
+
+
+def test_snapshot_rejects_mnk_games():
+    from zttt import MNKPvP, PvP
+    from zttt.snapshot import dumps, dumps_many
+    from zttt.gamelog import encode_record
+    from zttt.zt_errors import ZTBadFunctionCall
+    for m, n, k in ((5, 5, 4), (4, 4, 4), (3, 3, 3)):
+        game = MNKPvP(m, n, k)
+        for pos in range(k):
+            game.play(pos)
+            if game.status:
+                game.play(pos + n)
+        assert not game.status
+        for encode in (dumps, lambda game: dumps_many([PvP(), game]), encode_record):
+            try:
+                encode(game)
+            except ZTBadFunctionCall:
+                pass
+            else:
+                assert False, f"A {m} x {n} game was encoded"
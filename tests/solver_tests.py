@@ -0,0 +1,25 @@
+def test_solver_table():
+    from zttt._zt_core import solver_lookup
+    assert solver_lookup(0, 0) == (0, list(range(9)))
+    assert solver_lookup(0b000000001, 0) == (0, [4])  # Only the center holds a corner opening
+    assert solver_lookup(0b000000011, 0b000010000) == (0, [2])  # Player 2 must block
+    assert solver_lookup(0b000010001, 0b000000010) == (-1, [8])  # Player 2 loses to a fork, blocking delays it
+    try:
+        solver_lookup(0b000000111, 0b000111000)  # Both players have a line
+    except KeyError:
+        pass
+    else:
+        assert False, "Unreachable position was solved"
+
+
+def test_solver_never_loses():
+    from random import choice, seed
+    from zttt import PvC
+    seed(0)
+    for i in range(400):
+        b = PvC(i % 2 == 0, True)
+        assert b.solver
+        while b.status:
+            assert b.position_value <= 0  # The player is to move
+            b.play(choice(b.empty_positions))
+        assert b.winner != (2 if b.engine_first else 1)
@@ -0,0 +1,75 @@
+def test_store_lru_spill(tmp_path):
+    from zttt import PvC
+    from zttt.store import GameStore
+    store = GameStore(max_games=2, spill_path=str(tmp_path / 'spill'))
+    ids = [store.create(pvc=True, _engine_first=i % 2 == 0)[0] for i in range(5)]
+    games = {}
+    for game_id in ids:
+        game = store.get(game_id)
+        if game.status:
+            game.play(game.empty_positions[0])
+        games[game_id] = (game.history, game.engine_first, game.status)
+    assert len(store) == 5 and store.in_memory == 2
+
+    for game_id in reversed(ids):
+        game = store.get(game_id)
+        assert isinstance(game, PvC)
+        assert (game.history, game.engine_first, game.status) == games[game_id]
+        if game.status:
+            game.play(game.empty_positions[0])  # The rehydrated engine keeps playing
+    store.remove(ids[0])
+    assert ids[0] not in store and len(store) == 4
+    store.close()
+
+
+def test_store_ttl(tmp_path):
+    from zttt.store import GameStore
+    now = [0.0]
+    store = GameStore(max_games=1, ttl=10, spill_path=str(tmp_path / 'spill'), clock=lambda: now[0])
+    first, _ = store.create()
+    now[0] = 5
+    second, _ = store.create()  # Spills the first game
+    now[0] = 12
+    assert store.expire() == 1
+    assert first not in store
+    store.get(second)
+    now[0] = 30
+    try:
+        store.get(second)
+    except KeyError:
+        pass
+    else:
+        assert False, "Expired game was returned"
+    assert len(store) == 0
+
+
+def test_store_keeps_undecodable_spill(tmp_path):
+    from zttt.store import GameStore
+    from zttt.snapshot import dumps
+    from zttt.zt_errors import ZTInvalidInput
+    store = GameStore(max_games=1, spill_path=str(tmp_path / 'spill'))
+    first, game = store.create(pvc=True)
+    store.create()  # Spills the first game
+    store._disk[first] = b'\xff'
+    try:
+        store.get(first)
+    except ZTInvalidInput:
+        pass
+    else:
+        assert False, "A corrupt snapshot was decoded"
+    assert first in store and len(store) == 2
+    store._disk[first] = dumps(game)
+    assert store.get(first).history == game.history and store.in_memory == 1
+    store.close()
+
+
+def test_store_drops_mnk_games(tmp_path):
+    from zttt import MNKPvP
+    from zttt.store import GameStore
+    store = GameStore(max_games=1, spill_path=str(tmp_path / 'spill'))
+    game = MNKPvP(4, 4, 4)
+    game.play(5)
+    first = store.add(game)
+    second, _ = store.create()  # Evicts the m, n, k game, which cannot be spilled
+    assert first not in store and len(store) == 1 and store.get(second).history == []
+    store.close()
@@ -0,0 +1,30 @@
+def test_canonical_form():
+    from zttt import PvP
+    from zttt._zt_core import inverse_transform_pos
+    canonical_forms = set()
+    for corner in (0, 2, 6, 8):
+        b = PvP()
+        b.play(corner)
+        b.play(4)
+        board_list, transform = b.canonical
+        canonical_forms.add(tuple(board_list))
+        assert inverse_transform_pos(board_list.index(4), transform) == corner
+    assert len(canonical_forms) == 1
+
+
+def test_canonicalize_round_trip():
+    from zttt._zt_core import canonicalize, transform_pos, inverse_transform_pos
+    board_list = [4, 1, 0, 0, 4, 0, 0, 0, 1]
+    canonical, transform = canonicalize(board_list)
+    for pos in range(9):
+        assert canonical[transform_pos(pos, transform)] == board_list[pos]
+        assert inverse_transform_pos(transform_pos(pos, transform), transform) == pos
+
+
+def test_engine_first_opening():
+    from zttt import PvC
+    for _ in range(50):
+        b = PvC(True)
+        b.play(4)
+        # Opposite edges of the corner played by the engine (Example: 5, 7 for the corner 0)
+        assert b.history[2] in {0: (5, 7), 2: (3, 7), 6: (1, 5), 8: (1, 3)}[b.move1]
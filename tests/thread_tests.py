@@ -0,0 +1,114 @@
+def test_instance_indicators():
+    from zttt import PvP, MNKPvP, render_boards
+    b, c = PvP(), PvP()
+    b.play(0)
+    c.play(0)
+    b.indicators = ('A', 'B', '.')
+    assert b.render('compact') == 'A..|...|...' and c.render('compact') == 'X  |   |   '
+    assert b.clone().indicators == ('A', 'B', '.')
+    PvP.set_indicators('O', 'X', '_')
+    try:
+        assert b.render('compact') == 'A..|...|...' and c.render('compact') == 'O__|___|___'
+    finally:
+        PvP.set_indicators()
+    b.indicators = None
+    m = MNKPvP(2, 2, 2)
+    m.indicators = 'XO-'
+    assert render_boards([b, m], 'compact', ';') == 'X  |   |   ;--|--'
+
+    from zttt.zt_errors import ZTBadFunctionCall
+    try:
+        b.indicators = ('X', 'O')
+    except ZTBadFunctionCall:
+        pass
+    else:
+        assert False, "There are 3 indicators"
+
+
+def _race(game, seed):
+    # Plays random moves on a game shared with other threads until it is over
+    from random import Random
+    rng = Random(seed)
+    while True:
+        with game.lock:
+            if not game.status:
+                return
+            game.play(rng.choice(game.empty_positions))
+
+
+def _race_unlocked(game, seed):
+    # Plays random moves on a shared game without the outer lock, a move may lose to another thread
+    from random import Random
+    from zttt.zt_errors import ZTError
+    rng = Random(seed)
+    while game.status:
+        positions = game.empty_positions
+        if not positions:
+            continue
+        try:
+            game.play(rng.choice(positions))
+        except ZTError:
+            pass
+
+
+def _stress(race):
+    # Races 4 threads on each of many locking games and returns the games, all over
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from zttt import PvP, PvC
+
+    games = []
+    for i in range(1000):
+        game = PvP() if i % 3 == 0 else PvC(i % 3 == 1, i % 2 == 0, rng=i)
+        game.set_locking()
+        assert game.lock is not None and isinstance(game, PvP if i % 3 == 0 else PvC)
+        games.append(game)
+
+    # Switch threads as often as possible so that the moves of the games interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            futures = [executor.submit(race, game, 4 * i + j) for i, game in enumerate(games) for j in range(4)]
+            for future in futures:
+                future.result()
+    finally:
+        sys.setswitchinterval(interval)
+
+    for game in games:
+        history = game.history
+        replayed = PvP.from_history(history)
+        assert len(set(history)) == len(history) and game.move == len(history) + 1
+        assert game.board_list == replayed.board_list and game.winner == replayed.winner
+        assert game.empty_positions == replayed.empty_positions and not game.status
+
+    return games
+
+
+def test_locking_stress():
+    from zttt import PvC
+    game = _stress(_race)[1]
+    game.set_locking(False)
+    assert game.lock is None and type(game) is PvC and game.clone().lock is None
+
+
+def test_locking_stress_unlocked():
+    _stress(_race_unlocked)
+
+
+def test_locking_pickle():
+    import copy
+    import pickle
+    from zttt import PvC, MNKPvP
+
+    for game in (PvC(False, rng=3), MNKPvP(4, 4, 3)):
+        game.play(0)
+        game.indicators = 'XO.'
+        game.set_locking()
+        for loaded in (pickle.loads(pickle.dumps(game)), copy.deepcopy(game), copy.copy(game)):
+            assert type(loaded) is type(game) and loaded.lock is not None and loaded.lock is not game.lock
+            assert loaded.history == game.history and loaded.render('compact') == game.render('compact')
+            loaded.play(loaded.empty_positions[0])
+            assert len(loaded.history) > len(game.history)
+            loaded.set_locking(False)
+            assert type(loaded) is type(game).__mro__[1] and loaded.lock is None
@@ -0,0 +1,19 @@
+def first_empty(board_list, player):
+    return board_list.index(0)
+
+
+def test_tournament_in_process():
+    from zttt.tournament import run_tournament
+    result = run_tournament('solver', first_empty, 50, workers=1, chunk_size=20, seed=0)
+    assert result.games == 50
+    assert result.losses == 0
+    assert sum(sum(counts) for counts in result.openings.values()) == 50
+    assert run_tournament('solver', first_empty, 50, 1, 20, seed=0).to_dict()['openings'] == \
+        result.to_dict()['openings']
+
+
+def test_tournament_process_pool():
+    from zttt.tournament import run_tournament
+    result = run_tournament('engine', 'random', 200, workers=2, chunk_size=50, seed=1)
+    assert result.games == result.wins + result.draws == 200
+    assert result.throughput > 0
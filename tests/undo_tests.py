@@ -0,0 +1,54 @@
+def test_undo_redo_pvp():
+    from zttt import PvP
+    from zttt.zt_errors import ZTGameException
+    b = PvP()
+    for pos in (0, 1, 3, 2, 6):
+        b.play(pos)
+    assert b.winner == 1 and b.highlighted == [6, 3, 0]
+    b.undo()
+    assert b.status and b.winner is None and b.highlighted == [] and b.move == 5 and b.turn == 1
+    assert b.board_list[6] == 0 and 6 in b.empty_positions
+    b.redo()
+    assert not b.status and b.winner == 1 and b.highlighted == [6, 3, 0]
+    b.undo()
+    b.undo()
+    b.play(8)  # A new move discards the undone moves
+    try:
+        b.redo()
+    except ZTGameException:
+        pass
+    else:
+        assert False, "Redo after a new move"
+    assert b.history == [0, 1, 3, 8]
+
+
+def test_undo_engine_state():
+    from random import Random
+    from zttt import PvC
+    rng = Random(4)
+    for i in range(300):
+        b = PvC(i % 2 == 0)
+        while b.status:
+            b.play(rng.choice(b.empty_positions))
+        b.undo()
+        assert b.status and b.turn == (2 if b.engine_first else 1)
+        restored = PvC._restore(b.history, b.engine_first)
+        assert b._ZTBaseEngine__active_lines == restored._ZTBaseEngine__active_lines
+        if not b.engine_first:
+            b2 = PvC._restore(b.history, False)
+            b2._sync_state()
+            assert (b.center, b.liberty_move3) == (b2.center, b2.liberty_move3)
+        b.play(b.empty_positions[0])
+
+
+def test_clone():
+    from zttt import PvC
+    b = PvC(False)
+    moves = []
+    b.on_move = lambda player, pos: moves.append(pos)
+    b.play(0)
+    c = b.clone()
+    assert type(c) is PvC and c.history == b.history and c.parent is b.parent
+    c.play(c.empty_positions[0])
+    assert len(c.history) == 4 and len(b.history) == 2
+    assert moves == b.history  # The clone does not call the triggers of the game
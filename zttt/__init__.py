@@ -10,6 +10,15 @@ Both the classes inherit from the ZTBaseBoard class.
 1. PvP: The class for the PvP game
 2. PvC: The class for the PvC game
 
+MNKPvP and MNKPvC are the games on a board of m rows and n columns where k in a row wins.
+The engine of MNKPvC searches within a time budget per move, MCTSPvC plays by Monte Carlo tree search.
+
+The function batch_bot_moves computes the engine move of many PvC positions in a single call.
+The function render_boards renders many games into a single string.
+ZTEventBus delivers the move and finish events of one or many games to any number of subscribers.
+The context manager profiling times the steps of the moves and counts the branches taken by the engines.
+ZTRandom is a seedable random stream for the engines (PvC(rng=seed)) which spawns independent streams for workers.
+
 
 The module also contains the submodule zt_errors which contain the following errors
 
@@ -18,12 +27,51 @@ The module also contains the submodule zt_errors which contain the following err
 3. ZTGameException: The error raised when a function call crashes the game
 4. ZTWrongInput: The error raised when the input provided is not valid
 
-"""
+The names are imported on first access (PEP 562), so importing zttt alone loads no game or engine.
 
-from .pvc import PvC
-from .pvp import PvP
-from . import zt_errors
+"""
 
 __version__ = '1.0.2'
 
-__all__ = ['__version__', 'PvP', 'PvC', 'zt_errors']
+# Name -> the module defining it, relative to the package
+_LAZY = {
+    'PvP': 'pvp', 'MNKPvP': 'pvp',
+    'PvC': 'pvc', 'MNKPvC': 'mnkpvc', 'MCTSPvC': 'mnkpvc',
+    'batch_bot_moves': '_zt_core', 'render_boards': '_zt_core', 'ZTEventBus': '_zt_core', 'profiling': '_zt_core',
+    'ZTRandom': '_zt_core',
+}
+
+__all__ = ['__version__', 'PvP', 'MNKPvP', 'PvC', 'MNKPvC', 'MCTSPvC', 'batch_bot_moves', 'render_boards', 'ZTEventBus', 'profiling', 'ZTRandom', 'zt_errors']
+
+# Type checkers see the names, nothing is imported at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .pvc import PvC
+    from .mnkpvc import MNKPvC, MCTSPvC
+    from .pvp import PvP, MNKPvP
+    from ._zt_core import batch_bot_moves, render_boards, ZTEventBus, profiling, ZTRandom
+    from . import zt_errors
+
+
+def __getattr__(name: str):
+    """Imports a name from its module on first access and keeps it in the package
+
+    :param name: The name
+    :type name: str
+    :return: The object
+    :raise: AttributeError if the package has no such name
+    """
+
+    if name == 'zt_errors':
+        return __import__(f'{__name__}.zt_errors', fromlist=['ZTError'])
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # importlib.import_module would import importlib and warnings, __import__ is built in
+    value = getattr(__import__(f'{__name__}.{module}', fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | {'zt_errors'})
@@ -4,9 +4,74 @@ _zt_core module
 -----------------
 
 The module contains the core base classes for the zttt package.
+
+The names are imported from their modules on first access (PEP 562), so importing the package
+loads nothing and every module is only loaded by the games and tools that use it.
 """
 
 
-from .zt_base_board import ZTBaseBoard
-from .zt_engine_first import ZTEngineFirst
-from .zt_player_first import ZTPlayerFirst
+# Name -> the module defining it
+_LAZY = {
+    'ZTEventBus': 'zt_events', 'ZTEvent': 'zt_events',
+    'ZTRenderer': 'zt_render', 'get_renderer': 'zt_render', 'render_boards': 'zt_render',
+    'ZTBaseBoard': 'zt_base_board',
+    'ZTMNKBoard': 'zt_mnk_board',
+    'ZTBook': 'zt_book', 'get_book': 'zt_book',
+    'ZTBaseEngine': 'zt_base_engine',
+    'ZTEngineFirst': 'zt_engine_first',
+    'ZTPlayerFirst': 'zt_player_first',
+    'ZTSolver': 'zt_solver', 'solver_lookup': 'zt_solver',
+    'ZTMNKEngine': 'zt_mnk_engine',
+    'ZTSearchEngine': 'zt_search', 'SearchResult': 'zt_search', 'search_move': 'zt_search',
+    'ZTMCTSEngine': 'zt_mcts', 'MCTSResult': 'zt_mcts', 'mcts_move': 'zt_mcts',
+    'ZTStats': 'zt_profile', 'enable_profiling': 'zt_profile', 'disable_profiling': 'zt_profile',
+    'profiling_stats': 'zt_profile', 'profiling': 'zt_profile',
+    'batch_bot_moves': 'zt_batch', 'bot_move_from_masks': 'zt_batch',
+    'canonicalize': 'zt_symmetry', 'canonical_masks': 'zt_symmetry', 'transform_pos': 'zt_symmetry',
+    'inverse_transform_pos': 'zt_symmetry',
+    'ZTRandom': 'zt_random',
+}
+
+__all__ = list(_LAZY)
+
+# Type checkers see the names, nothing is imported at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .zt_events import ZTEventBus, ZTEvent
+    from .zt_render import ZTRenderer, get_renderer, render_boards
+    from .zt_base_board import ZTBaseBoard
+    from .zt_mnk_board import ZTMNKBoard
+    from .zt_book import ZTBook, get_book
+    from .zt_base_engine import ZTBaseEngine
+    from .zt_engine_first import ZTEngineFirst
+    from .zt_player_first import ZTPlayerFirst
+    from .zt_solver import ZTSolver, solver_lookup
+    from .zt_mnk_engine import ZTMNKEngine
+    from .zt_search import ZTSearchEngine, SearchResult, search_move
+    from .zt_mcts import ZTMCTSEngine, MCTSResult, mcts_move
+    from .zt_profile import ZTStats, enable_profiling, disable_profiling, profiling_stats, profiling
+    from .zt_batch import batch_bot_moves, bot_move_from_masks
+    from .zt_symmetry import canonicalize, canonical_masks, transform_pos, inverse_transform_pos
+    from .zt_random import ZTRandom
+
+
+def __getattr__(name: str):
+    """Imports a name from its module on first access and keeps it in the package
+
+    :param name: The name
+    :type name: str
+    :return: The object
+    :raise: AttributeError if the package has no such name
+    """
+
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # importlib.import_module would import importlib and warnings, __import__ is built in
+    value = getattr(__import__(f'{__name__}.{module}', fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
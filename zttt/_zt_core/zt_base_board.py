@@ -1,10 +1,41 @@
 from typing import List, Tuple, Dict, Callable, Iterable, Any, Union
-from ..zt_errors import ZTGameException, ZTInvalidInput
+from ..zt_errors import ZTGameException, ZTInvalidInput, ZTBadFunctionCall
+from .zt_symmetry import canonical_masks, transform_board
+from .zt_events import ZTEventBus
+from .zt_render import get_renderer
+
+
+def _positions_of(mask: int) -> Tuple[int, ...]:
+    """Returns the positions (in row major order) of the set bits of a 9-bit mask
+
+    :param mask: The 9-bit mask
+    :type mask: int
+    :return: Tuple of the positions whose bits are set
+    :rtype: Tuple[int, ...]
+    """
+    return tuple(pos for pos in range(9) if mask >> pos & 1)
+
+
+# Default event triggers, shared by all the boards
+def _no_move_trigger(player: int, pos: int) -> None:
+    pass
+
+
+def _no_finish_trigger(player: int) -> None:
+    pass
 
 
 class ZTBaseBoard:
     """This is the base class which is inherited by all the classes which are used in the module"""
 
+    # No per-instance __dict__, a game only holds the following state
+    __slots__ = (
+        '_board_list', '_masks', '_empty_mask', '_history', '_redo_stack',
+        '__status', '__winner', '__move', '__highlight_list',
+        '_on_move', '_on_finish', '_events',
+        '_indicators', '_lock'
+    )
+
     # The following variables are not to be changed
     _VAL_PLAYER1 = 4  # Value for player 1 in the board_list
     _VAL_PLAYER2 = 1  # Value for player 2 in the board_list
@@ -36,10 +67,35 @@ class ZTBaseBoard:
     # The center is present in Position 4
     _CENTER = 4
 
+    # Bitboard tables, a position pos corresponds to the bit (1 << pos)
+    _FULL_MASK = 0b111111111
+    _CORNER_MASK = 0b101000101  # Positions 0, 2, 6, 8
+    _EDGE_MASK = 0b010101010  # Positions 1, 3, 5, 7
+
+    # The masks of the 8 lines
+    _LINE_MASKS: Tuple[int, ...] = (
+        0b000000111, 0b000111000, 0b111000000,
+        0b001001001, 0b010010010, 0b100100100,
+        0b100010001, 0b001010100
+    )
+
+    # For every position, the masks of the lines through it along with the other two positions of the line
+    # The order follows _LINES so that the highlighted list is built in the same order
+    _POS_LINE_MASKS: Dict[int, Tuple[Tuple[int, Tuple[int, int]], ...]] = {
+        pos: tuple(((1 << pos) | (1 << line[0]) | (1 << line[1]), line) for line in lines)
+        for pos, lines in _LINES.items()
+    }
+
+    # The positions of the set bits for every 9-bit mask
+    _MASK_POSITIONS: Tuple[Tuple[int, ...], ...] = tuple(_positions_of(mask) for mask in range(1 << 9))
+
     @classmethod
     def set_indicators(cls, _player1: str = 'X', _player2: str = 'O', _space: str = ' ') -> None:
         """Sets the indicators, a class method
 
+        The indicators are shared by every board of the class without indicators of its own
+        (see the indicators property), boards rendered in other threads included.
+
         :param _player1: Indicator for player 1
         :type _player1: str
         :param _player2: Indicator for player 2
@@ -58,17 +114,24 @@ class ZTBaseBoard:
     def __init__(self) -> None:
         """Initializes the board and the state variables"""
 
-        # Main list containing the _empty_positions from top left in row major order
+        # Main list containing the values of the positions from top left in row major order
         # Protected since inherited classes will be able to quickly access it
         self._board_list: List[int] = [0 for _ in range(9)]
 
-        # List containing the _empty_positions empty edges and empty corners
+        # 9-bit masks of the positions played by each player, indexed by the player number (index 0 is unused)
         # Protected since inherited classes will be able to quickly access it
-        self._empty_positions: List[int] = [i for i in range(9)]
+        self._masks: List[int] = [0, 0, 0]
+
+        # 9-bit mask of the empty positions
+        self._empty_mask: int = ZTBaseBoard._FULL_MASK
 
         # History
         self._history: List[int] = []
 
+        # The undone moves, last undone at the end
+        # The empty tuple is shared until a move is undone
+        self._redo_stack: Union[List[int], Tuple[()]] = ()
+
         # Determines whether the game is ongoing or not
         self.__status: bool = True
 
@@ -80,14 +143,21 @@ class ZTBaseBoard:
         self.__move: int = 1
 
         # Stores the values that are to be highlighted after the game
-        self.__highlight_list: List[int] = list()
+        # The empty tuple is shared until there is a winner
+        self.__highlight_list: Union[List[int], Tuple[()]] = ()
 
-        # Event triggers
-        self._on_move: Callable[[int, int], None] = lambda player, pos: None
-        self._on_finish: Callable[[int], None] = lambda player: None
+        # Event triggers, None when not set so that nothing is called on the move path
+        self._on_move: Union[Callable[[int, int], None], None] = None
+        self._on_finish: Union[Callable[[int], None], None] = None
 
-        # Used for function calls
-        self._data: Dict[str, Any] = {'args': list(), 'kwargs': dict(), 'output': None}
+        # The event bus, None until one is attached
+        self._events: Union[ZTEventBus, None] = None
+
+        # The indicators of this board, None to use the indicators of the class
+        self._indicators: Union[Tuple[str, str, str], None] = None
+
+        # The lock of the locking mode, None while the game does not lock (see set_locking)
+        self._lock = None
 
     # Useful properties
 
@@ -155,7 +225,16 @@ class ZTBaseBoard:
         :return: A (duplicate) list (in row major order from 0) of the empty positions
         :rtype: List[int]
         """
-        return self._empty_positions[:]
+        return list(self._MASK_POSITIONS[self._empty_mask])
+
+    @property
+    def _empty_positions(self) -> Tuple[int, ...]:
+        """The empty positions read straight from the bitboard table, must not be modified
+
+        :return: A (shared) tuple (in row major order from 0) of the empty positions
+        :rtype: Tuple[int, ...]
+        """
+        return self._MASK_POSITIONS[self._empty_mask]
 
     @property
     def empty_corners(self) -> List[int]:
@@ -164,7 +243,7 @@ class ZTBaseBoard:
         :return: List of the empty corners
         :rtype: List[int]
         """
-        return [i for i in self._empty_positions if i is not self._CENTER and i % 2 == 0]
+        return list(self._MASK_POSITIONS[self._empty_mask & self._CORNER_MASK])
 
     @property
     def empty_edges(self) -> List[int]:
@@ -173,7 +252,7 @@ class ZTBaseBoard:
         :return: List of the empty edges
         :rtype: List[int]
         """
-        return [i for i in self._empty_positions if i % 2 == 1]
+        return list(self._MASK_POSITIONS[self._empty_mask & self._EDGE_MASK])
 
     @property
     def highlighted(self) -> List[int]:
@@ -182,7 +261,21 @@ class ZTBaseBoard:
         :return: A (duplicate) list of highlighted positions
         :rtype: List[int]
         """
-        return self.__highlight_list[:]
+        return list(self.__highlight_list)
+
+    @property
+    def canonical(self) -> Tuple[List[int], int]:
+        """Returns the canonical form of the board under the rotations and reflections of the square
+
+        Symmetric positions share the same canonical form. A move on the canonical board is mapped
+        back to this board with zt_symmetry.inverse_transform_pos.
+
+        :return: The canonical board list and the transform (0 - 7) which produced it
+        :rtype: Tuple[List[int], int]
+        """
+
+        transform = canonical_masks(self._masks[1], self._masks[2])[2]
+        return transform_board(self._board_list, transform), transform
 
     @property
     def board(self) -> str:
@@ -191,15 +284,58 @@ class ZTBaseBoard:
         :return: board string
         :rtype: str
         """
+        return self.render()
+
+    @property
+    def indicators(self) -> Tuple[str, str, str]:
+        """The indicators the board is rendered with, its own or else the indicators of the class
+
+        :return: The indicators of player 1, player 2 and the empty positions
+        :rtype: Tuple[str, str, str]
+        """
+
+        if self._indicators is not None:
+            return self._indicators
+        indicator = self.__class__._INDICATOR
+        return indicator[self._VAL_PLAYER1], indicator[self._VAL_PLAYER2], indicator[self._VAL_EMPTY]
+
+    @indicators.setter
+    def indicators(self, _indicators: Union[Tuple[str, str, str], None]) -> None:
+        """Sets the indicators of this board only, unlike set_indicators
+
+        :param _indicators: The indicators of player 1, player 2 and the empty positions,
+            None to use the indicators of the class again
+        :type _indicators: Union[Tuple[str, str, str], None]
+        :return: None
+        :raise: ZTBadFunctionCall if there are not 3 indicators
+        """
 
-        pr_str = ' _____ _____ _____\n'
-        for i in range(3):
-            pr_str += '|     |     |     |\n|'
-            for j in range(3):
-                pos_val = self._board_list[i * 3 + j]
-                pr_str += f'  {self.__class__._INDICATOR[pos_val]}  |'
-            pr_str += '\n|_____|_____|_____|\n'
-        return pr_str
+        if _indicators is None:
+            self._indicators = None
+            return
+        _indicators = tuple(str(indicator) for indicator in _indicators)
+        if len(_indicators) != 3:
+            raise ZTBadFunctionCall("The indicators are those of player 1, player 2 and the empty positions")
+        self._indicators = _indicators
+
+    def _renderer_key(self) -> Tuple[Tuple[str, str, str], int, int]:
+        """The indicators and the shape the board is rendered with
+
+        :return: The indicators of player 1, player 2 and the empty positions, the rows and the columns
+        :rtype: Tuple[Tuple[str, str, str], int, int]
+        """
+        return self.indicators, 3, 3
+
+    def render(self, fmt: str = 'boxed') -> str:
+        """Renders the board, the rendered rows and boards are cached for every set of indicators
+
+        :param fmt: The format, 'boxed' (as board), 'compact' (a single line) or 'json'
+        :type fmt: str
+        :return: The rendered board
+        :rtype: str
+        :raise: ZTBadFunctionCall if the format is not known
+        """
+        return get_renderer(*self._renderer_key()).render(self._masks[1], self._masks[2], fmt)
 
     # Triggers Setup
 
@@ -210,7 +346,7 @@ class ZTBaseBoard:
         :return: on_move event trigger
         :rtype: Callable[[int, int], None]
         """
-        return self._on_move
+        return _no_move_trigger if self._on_move is None else self._on_move
 
     @on_move.setter
     def on_move(self, _on_move: Callable[[int, int], None]) -> None:
@@ -223,7 +359,7 @@ class ZTBaseBoard:
 
         if not callable(_on_move):
             raise TypeError('on_move must be a function')
-        self._on_move = _on_move
+        self._on_move = None if _on_move is _no_move_trigger else _on_move
 
     @property
     def on_finish(self) -> Callable[[int], None]:
@@ -232,7 +368,7 @@ class ZTBaseBoard:
         :return: _on_finish event trigger
         :rtype: Callable[[int], None]
         """
-        return self._on_finish
+        return _no_finish_trigger if self._on_finish is None else self._on_finish
 
     @on_finish.setter
     def on_finish(self, _on_finish: Callable[[int], None]) -> None:
@@ -245,7 +381,32 @@ class ZTBaseBoard:
 
         if not callable(_on_finish):
             raise TypeError('on_move must be a function')
-        self._on_finish = _on_finish
+        self._on_finish = None if _on_finish is _no_finish_trigger else _on_finish
+
+    @property
+    def events(self) -> ZTEventBus:
+        """Returns the event bus of the game, attaching a new one if there is none
+
+        :return: The event bus
+        :rtype: ZTEventBus
+        """
+
+        if self._events is None:
+            self._events = ZTEventBus()
+        return self._events
+
+    @events.setter
+    def events(self, _events: Union[ZTEventBus, None]) -> None:
+        """Attaches an event bus, which may be shared with other games, None detaches the bus
+
+        :param _events: The event bus
+        :type _events: Union[ZTEventBus, None]
+        :raise: TypeError if _events is not an event bus
+        """
+
+        if _events is not None and not isinstance(_events, ZTEventBus):
+            raise TypeError('events must be a ZTEventBus')
+        self._events = _events
 
     # Helper Functions
 
@@ -273,47 +434,45 @@ class ZTBaseBoard:
             print(f"Unknown Error while verifying the position {pos}. Please raise an issue.")
             raise ZTInvalidInput(e)
 
-        if pos not in self._empty_positions:
+        # The empty mask has no bits past the last position
+        if pos < 0 or not self._empty_mask >> pos & 1:
             raise ZTInvalidInput("Invalid Position Entered")
 
-        if not self._board_list[pos] == 0:
-            raise ZTInvalidInput("Position Already Taken")
+    def _find_win(self, pos: int, mask: int) -> Union[List[int], None]:
+        """Finds the lines completed by the current move
 
-    def __is_fully_played(self, _line: Tuple[int, int, int]) -> bool:
-        """Checks if the given line is fully played
-
-        :param _line: A tuple of three positions
-        :type _line: Tuple[int, int, int]
-        :return: True if the tuple of positions is fully played, False otherwise
-        :rtype: bool
+        :param pos: The position that was just played
+        :type pos: int
+        :param mask: The mask of the player who just played
+        :type mask: int
+        :return: The positions to be highlighted (pos followed by the rest of the lines), None if there is no win
+        :rtype: Union[List[int], None]
         """
 
-        for pos in _line:
-            if self._board_list[pos] == 0:
-                return False
-        return True
+        if self.__move < 5:
+            return None
+
+        winning_set_list = None
+        for line_mask, line in ZTBaseBoard._POS_LINE_MASKS[pos]:
+            if mask & line_mask == line_mask:
+                if winning_set_list is None:
+                    winning_set_list = [pos]
+                winning_set_list.extend(line)
+        return winning_set_list
 
-    def __check_win(self, pos: int) -> bool:
+    def __check_win(self, pos: int, mask: int) -> bool:
         """Checks if a player won after the current move
 
         :param pos: The position that was just played
         :type pos: int
+        :param mask: The mask of the player who just played
+        :type mask: int
         :return: True if the player won, False otherwise
         :rtype: bool
         """
 
-        if self.__move < 5:
-            return False
-
-        winning_set_list = [pos]
-        for line in ZTBaseBoard._LINES[pos]:
-            line_val = self._board_list[pos] + \
-                       self._board_list[line[0]] + self._board_list[line[1]]
-
-            if line_val in (3 * ZTBaseBoard._VAL_PLAYER1, 3 * ZTBaseBoard._VAL_PLAYER2):
-                winning_set_list.extend(line)
-
-        if len(winning_set_list) > 1:
+        winning_set_list = self._find_win(pos, mask)
+        if winning_set_list is not None:
             self.__highlight_list = winning_set_list
             return True
 
@@ -329,7 +488,30 @@ class ZTBaseBoard:
 
         self.__winner = winner
         self.__status = False
-        self.on_finish(winner)
+        if self._on_finish is not None:
+            self._trigger_finish(winner)
+        if self._events is not None:
+            self._events._finish(self, winner)
+
+    def _trigger_move(self, player: int, pos: int) -> None:
+        """Calls the on_move trigger, only called when one is set
+
+        :param player: The player who moved
+        :type player: int
+        :param pos: The position played
+        :type pos: int
+        :return: None
+        """
+        self._on_move(player, pos)
+
+    def _trigger_finish(self, winner: int) -> None:
+        """Calls the on_finish trigger, only called when one is set
+
+        :param winner: The winner of the game
+        :type winner: int
+        :return: None
+        """
+        self._on_finish(winner)
 
     # Player Moves
 
@@ -353,15 +535,23 @@ class ZTBaseBoard:
         if self.__move % 2 != player % 2:
             raise ZTGameException("It is currently not the player's move")
 
+        bit = 1 << pos
         self._board_list[pos] = ZTBaseBoard._VAL_PLAYER1 if player == 1 else ZTBaseBoard._VAL_PLAYER2
-        self._empty_positions.remove(pos)
+        self._masks[player] |= bit
+        self._empty_mask ^= bit
         self._history.append(pos)
+        if self._redo_stack:
+            self._redo_stack = ()  # A new move discards the undone moves
 
-        # self._data['out'] = self.on_move(player, pos, *self._data['args'], **self._data['kwargs'])
-        self.on_move(player, pos)
+        if self._on_move is not None:
+            self._trigger_move(player, pos)
 
-        win = self.__check_win(pos)
+        win = self.__check_win(pos, self._masks[player])
         self.__move += 1  # Increasing the move by 1
+
+        # The bus sees the board after the move, the finish event follows
+        if self._events is not None:
+            self._events._move(self, player, pos)
         return win
 
     def _play_player_one_move(self, pos: int) -> None:
@@ -378,7 +568,7 @@ class ZTBaseBoard:
 
         if win:
             self.__finisher(1)  # Player 1 wins
-        elif self.__move == 10:
+        elif self.__move > len(self._board_list):
             self.__finisher(0)  # No one Wins and 0 is a draw
 
     def _play_player_two_move(self, pos: int) -> None:
@@ -395,3 +585,250 @@ class ZTBaseBoard:
 
         if win:
             self.__finisher(2)
+        elif self.__move > len(self._board_list):
+            self.__finisher(0)  # Boards with an even number of positions are filled by player 2
+
+    # Replay
+
+    def _sync_state(self) -> None:
+        """Brings the state of the subclasses in line with the history after moves are undone, redone or replayed
+
+        :return: None
+        """
+        pass
+
+    def replay(self, history: Iterable[int], triggers: bool = False) -> None:
+        """Plays a sequence of moves for both players in one call, for rebuilding and analysing games
+
+        The positions are validated in a single pass and the moves are applied straight to the bitboards.
+        The game is left unchanged if the sequence is invalid. Engines do not reply to the moves.
+        With triggers, on_move, on_finish and the event bus are called for every move once the whole
+        sequence is applied, otherwise they are not called at all.
+
+        :param history: The moves, starting with the player whose turn it is
+        :type history: Iterable[int]
+        :param triggers: Whether the triggers and the event bus are called
+        :type triggers: bool
+        :return: None
+        :raise: ZTGameException if a move is played after the game is over
+        :raise: ZTInvalidInput if a move is invalid
+        """
+
+        try:
+            moves = [int(pos) for pos in history]
+        except (TypeError, ValueError):
+            raise ZTInvalidInput("Position entered must be an integer")
+        if not moves:
+            return
+        self._verify_status()
+
+        empty = self._empty_mask
+        for pos in moves:
+            if pos < 0 or not empty >> pos & 1:
+                raise ZTInvalidInput(f"Invalid Position {pos} in the history")
+            empty ^= 1 << pos
+
+        saved = (self._board_list[:], self._masks[:], self._empty_mask, len(self._history), self._redo_stack,
+                 self.__move, self.__highlight_list)
+        board_list, masks, history_list = self._board_list, self._masks, self._history
+        cells = len(board_list)
+        finished_at = None
+        for i, pos in enumerate(moves):
+            if finished_at is not None:
+                # Rolls back, the game was not finished before the replay
+                (self._board_list, self._masks, self._empty_mask, length, self._redo_stack, self.__move,
+                 self.__highlight_list) = saved
+                del self._history[length:]
+                raise ZTGameException("A move is played after the game is over")
+
+            player = 1 if self.__move % 2 == 1 else 2
+            bit = 1 << pos
+            board_list[pos] = ZTBaseBoard._VAL_PLAYER1 if player == 1 else ZTBaseBoard._VAL_PLAYER2
+            masks[player] |= bit
+            self._empty_mask ^= bit
+            history_list.append(pos)
+
+            winning_set_list = self._find_win(pos, masks[player])
+            self.__move += 1
+            if winning_set_list is not None:
+                self.__highlight_list = winning_set_list
+                finished_at, winner = i, player
+            elif self.__move > cells:
+                finished_at, winner = i, 0
+
+        if self._redo_stack:
+            self._redo_stack = ()  # New moves discard the undone moves
+        if finished_at is not None:
+            self.__winner = winner
+            self.__status = False
+        self._sync_state()
+
+        if triggers:
+            on_move, events = self._on_move, self._events
+            move = self.__move - len(moves)
+            for pos in moves:
+                player = 1 if move % 2 == 1 else 2
+                move += 1
+                if on_move is not None:
+                    self._trigger_move(player, pos)
+                if events is not None:
+                    events._move(self, player, pos)
+            if finished_at is not None:
+                if self._on_finish is not None:
+                    self._trigger_finish(winner)
+                if events is not None:
+                    events._finish(self, winner)
+
+    def _undo_move(self) -> int:
+        """Takes back the last move
+
+        :return: The position of the move taken back
+        :rtype: int
+        :raise: ZTGameException if there is no move to undo
+        """
+
+        if not self._history:
+            raise ZTGameException("There is no move to undo")
+
+        pos = self._history.pop()
+        bit = 1 << pos
+        self.__move -= 1
+        self._board_list[pos] = ZTBaseBoard._VAL_EMPTY
+        self._masks[1 if self.__move % 2 == 1 else 2] ^= bit
+        self._empty_mask |= bit
+
+        # The positions before the last one are never finished
+        self.__status = True
+        self.__winner = None
+        self.__highlight_list = ()
+
+        if not self._redo_stack:
+            self._redo_stack = []
+        self._redo_stack.append(pos)
+        return pos
+
+    def _redo_move(self) -> int:
+        """Plays the last undone move again, calling the triggers as for any move
+
+        :return: The position of the move played
+        :rtype: int
+        :raise: ZTGameException if there is no move to redo
+        """
+
+        if not self._redo_stack:
+            raise ZTGameException("There is no move to redo")
+
+        redo_stack = self._redo_stack
+        pos = redo_stack.pop()
+        self._replay_move(pos)
+        self._redo_stack = redo_stack
+        return pos
+
+    def _replay_move(self, pos: int) -> None:
+        """Plays a move of the history for the player whose turn it is
+
+        :param pos: The position to be played
+        :type pos: int
+        :return: None
+        """
+
+        if self.__move % 2 == 1:
+            self._play_player_one_move(pos)
+        else:
+            self._play_player_two_move(pos)
+
+    def undo(self) -> None:
+        """Takes back the last move, restoring the status, winner, highlighted positions and move
+
+        :return: None
+        :raise: ZTGameException if there is no move to undo
+        """
+        self._undo_move()
+
+    def redo(self) -> None:
+        """Plays the last undone move again, any new move discards the undone moves
+
+        :return: None
+        :raise: ZTGameException if there is no move to redo
+        """
+        self._redo_move()
+
+    def _clone_into(self, game: 'ZTBaseBoard') -> None:
+        """Copies the state of the board into a new object
+
+        :param game: The new object
+        :type game: ZTBaseBoard
+        :return: None
+        """
+
+        game._board_list = self._board_list[:]
+        game._masks = self._masks[:]
+        game._empty_mask = self._empty_mask
+        game._history = self._history[:]
+        game._redo_stack = self._redo_stack[:]
+        game.__status = self.__status
+        game.__winner = self.__winner
+        game.__move = self.__move
+        game.__highlight_list = self.__highlight_list[:]
+        game._on_move = None
+        game._on_finish = None
+        game._events = None
+        game._indicators = self._indicators
+        # A clone of a locking game locks too, with its own lock
+        if self._lock is None:
+            game._lock = None
+        else:
+            from .zt_sync import _new_lock
+            game._lock = _new_lock()
+
+    def clone(self) -> 'ZTBaseBoard':
+        """Returns an independent copy of the game for analysis
+
+        Only the few small lists of the state are copied. The clone does not have the triggers or the event bus
+        of the game, it keeps the indicators and the locking mode.
+
+        :return: The copy of the game
+        :rtype: ZTBaseBoard
+        """
+
+        game = self.__class__.__new__(self.__class__)
+        self._clone_into(game)
+        return game
+
+    # Locking
+
+    @property
+    def lock(self):
+        """The reentrant lock of the game, None while it does not lock
+
+        Hold it to make several calls atomic together, like reading the empty positions and playing one.
+
+        :return: The lock
+        :rtype: Union[RLock, None]
+        """
+        return self._lock
+
+    def set_locking(self, enabled: bool = True) -> None:
+        """Turns the locking mode of the game on or off, it is off by default
+
+        While it is on, every call of play, undo, redo, replay, clone and render is atomic (the engine's reply
+        included) and the properties derived from the state never see a move half played, so the game can be
+        shared between threads, also on free-threaded Python. Games which do not lock are not slowed down.
+        The class of a locking game is a subclass of its class with the same name (see zt_sync).
+
+        The mode should be set before the game is shared.
+
+        :param enabled: Whether the game locks
+        :type enabled: bool
+        :return: None
+        """
+
+        from .zt_sync import _locking_class, _new_lock
+
+        if enabled and self._lock is None:
+            self._lock = _new_lock()
+            self.__class__ = _locking_class(self.__class__)
+        elif not enabled and self._lock is not None:
+            with self._lock:
+                self.__class__ = self.__class__._unlocked_class
+                self._lock = None
@@ -1,19 +1,50 @@
-from typing import Tuple, List
-from random import choice
+from typing import Tuple, List, Union
+from random import Random
 
 from .zt_base_board import ZTBaseBoard
+from .zt_random import _resolve_rng, _clone_rng
 from ..zt_errors import *
 
 
+# All the lines, bit i of an active lines mask stands for _ENGINE_LINES[i]
+_ENGINE_LINES: Tuple[Tuple[int, int, int], ...] = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+)
+
+# _ACTIVE_LINES[mask] is the tuple of the lines of an active lines mask, shared by all the engines
+_ACTIVE_LINES: Tuple[Tuple[Tuple[int, int, int], ...], ...] = tuple(
+    tuple(line for i, line in enumerate(_ENGINE_LINES) if mask >> i & 1) for mask in range(1 << 8)
+)
+
+# The indices of the lines through each position
+_POS_LINE_INDICES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(i for i, line in enumerate(_ENGINE_LINES) if pos in line) for pos in range(9)
+)
+
+
 class ZTBaseEngine(ZTBaseBoard):
     """Base Class for the Engine"""
 
-    def __init__(self, _engine_first: bool) -> None:
+    # The state of the engine subclasses is declared here since PvC inherits from all of them
+    # and only one base class of PvC can add slots
+    __slots__ = (
+        '__engine_first', '__active_lines', '_rng',
+        'move1',  # ZTEngineFirst
+        'center', 'liberty_move3'  # ZTPlayerFirst
+    )
+
+    def __init__(self, _engine_first: bool, rng: Union[Random, int, None] = None) -> None:
         """Initialize the State Variables in an Engine
 
         :param _engine_first: Specifies if the engine starts first
         :type _engine_first: bool
+        :param rng: The generator of the random choices, a seed of a new ZTRandom,
+            or None for the module level generator of random
+        :type rng: Union[Random, int, None]
         :return: None
+        :raise: ZTBadFunctionCall if the seed is not an integer
         """
 
         super().__init__()
@@ -21,12 +52,11 @@ class ZTBaseEngine(ZTBaseBoard):
         # Private since we don't want people to change it
         self.__engine_first: bool = _engine_first
 
-        # List of all the lines that contain at least one empty position
-        self.__active_lines: List[Tuple[int, int, int]] = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),
-            (0, 4, 8), (2, 4, 6)
-        ]
+        # Mask of all the lines that contain at least one empty position
+        self.__active_lines: int = 0xFF
+
+        # Every random choice of the engine is drawn from it
+        self._rng: Random = _resolve_rng(rng)
 
     # Properties
 
@@ -39,6 +69,15 @@ class ZTBaseEngine(ZTBaseBoard):
         """
         return self.__engine_first
 
+    @property
+    def rng(self) -> Random:
+        """Returns the generator the engine draws its random choices from
+
+        :return: The generator
+        :rtype: Random
+        """
+        return self._rng
+
     @property
     def _engine_value(self) -> int:
         """Returns the value of the engine and is mainly for development purpose
@@ -91,7 +130,7 @@ class ZTBaseEngine(ZTBaseBoard):
         """
 
         winnable_moves = []
-        for line in self.__active_lines:
+        for line in _ACTIVE_LINES[self.__active_lines]:
             line_weight = self._calc_line_weight(line)
             if line_weight == 2 * self._engine_value:
                 if self._board_list[line[0]] == self._VAL_EMPTY:
@@ -110,7 +149,7 @@ class ZTBaseEngine(ZTBaseBoard):
         :rtype: List[int]
         """
 
-        for line in self.__active_lines:
+        for line in _ACTIVE_LINES[self.__active_lines]:
             line_weight = self._calc_line_weight(line)
             if line_weight == 2 * self._player_value:
                 if self._board_list[line[0]] == self._VAL_EMPTY:
@@ -131,38 +170,49 @@ class ZTBaseEngine(ZTBaseBoard):
         double_danger_moves = []
         for corner in self.empty_corners:
             count = 0
-            new_board_list = self.board_list
-            new_board_list[corner] = self._engine_value
-            for line in self.__active_lines:
-                line_weight = self._calc_line_weight(line, new_board_list)
+            # The corner is probed in place and emptied again, instead of copying the board
+            self._board_list[corner] = self._engine_value
+            for line in _ACTIVE_LINES[self.__active_lines]:
+                line_weight = self._calc_line_weight(line)
                 if line_weight == 2 * self._engine_value:
                     count += 1
                 if count == 2:
                     break
+            self._board_list[corner] = self._VAL_EMPTY
             if count == 2:
                 double_danger_moves.append(corner)
         return double_danger_moves
 
-    def _get_bot_move(self) -> List[int]:
-        """Returns the best move to play using the above functions
+    def _choose_bot_move(self) -> Union[Tuple[str, int], None]:
+        """Returns the best move to play using the above functions along with the branch which found it
 
-        :return: The singleton list with the only move to play, empty list otherwise
-        :rtype: List[int]
+        :return: The branch ('winnable', 'danger' or 'double_danger') and the move, None if there is no such move
+        :rtype: Union[Tuple[str, int], None]
         """
 
         temp = self._get_winnable_moves()
         if temp:
-            return [choice(temp)]
+            return 'winnable', self._rng.choice(temp)
 
         temp = self._get_danger_move()
         if temp:
-            return [choice(temp)]
+            return 'danger', self._rng.choice(temp)
 
         temp = self.__get_double_danger_moves()
         if temp:
-            return [choice(temp)]
+            return 'double_danger', self._rng.choice(temp)
 
-        return []
+        return None
+
+    def _get_bot_move(self) -> List[int]:
+        """Returns the best move to play using the above functions
+
+        :return: The singleton list with the only move to play, empty list otherwise
+        :rtype: List[int]
+        """
+
+        found = self._choose_bot_move()
+        return [found[1]] if found is not None else []
 
     def __clean(self, pos: int) -> None:
         """Clean the active lines list maintained by the engine
@@ -174,10 +224,9 @@ class ZTBaseEngine(ZTBaseBoard):
 
         if self.move < 5:
             return
-        for (pos1, pos2) in self._LINES[pos]:
-            if sorted([pos, pos1, pos2]) in self.__active_lines and self._board_list[pos1] != self._VAL_EMPTY \
-                    and self._board_list[pos2] != self._VAL_EMPTY:
-                self.__active_lines.remove(sorted([pos, pos1, pos2]))
+        for i in _POS_LINE_INDICES[pos]:
+            if not self._empty_mask & self._LINE_MASKS[i]:
+                self.__active_lines &= ~(1 << i)
 
     # Functions to play
 
@@ -214,3 +263,92 @@ class ZTBaseEngine(ZTBaseBoard):
             self._play_player_two_move(pos)
         pos = int(pos)
         self.__clean(pos)
+
+    # Undo, Redo and Clone
+
+    def _sync_state(self) -> None:
+        """Brings the active lines in line with the board after moves are undone, redone or replayed
+
+        The subclasses extend it for their own state.
+
+        :return: None
+        """
+
+        empty = self._empty_mask
+        active_lines = 0
+        for i, line_mask in enumerate(self._LINE_MASKS):
+            if line_mask & empty:
+                active_lines |= 1 << i
+        self.__active_lines = active_lines
+
+    def _undo_move(self) -> int:
+        """Takes back the last move, also restoring the lines through it to the active lines
+
+        :return: The position of the move taken back
+        :rtype: int
+        :raise: ZTGameException if there is no move to undo
+        """
+
+        pos = super()._undo_move()
+        for i in _POS_LINE_INDICES[pos]:
+            self.__active_lines |= 1 << i
+        return pos
+
+    def _replay_move(self, pos: int) -> None:
+        """Plays a move of the history for the engine or the player, whoever's turn it is
+
+        :param pos: The position to be played
+        :type pos: int
+        :return: None
+        """
+
+        if (self.turn == 1) == self.__engine_first:
+            self._play_engine(pos)
+        else:
+            self._play_player(pos)
+
+    def undo(self) -> None:
+        """Takes back the moves back to the player's previous move, so that it is the player's turn again
+
+        :return: None
+        :raise: ZTGameException if the player has no move to undo
+        """
+
+        player_turn = 2 if self.__engine_first else 1
+        if len(self._history) < player_turn:
+            raise ZTGameException("There is no move to undo")
+
+        self._undo_move()
+        while self.turn != player_turn:
+            self._undo_move()
+        self._sync_state()
+
+    def redo(self) -> None:
+        """Plays the undone moves again up to the player's next turn
+
+        :return: None
+        :raise: ZTGameException if there is no move to redo
+        """
+
+        player_turn = 2 if self.__engine_first else 1
+        self._redo_move()
+        while self._redo_stack and self.status and self.turn != player_turn:
+            self._redo_move()
+        self._sync_state()
+
+    def _clone_into(self, game: 'ZTBaseEngine') -> None:
+        """Copies the state of the engine into a new object
+
+        :param game: The new object
+        :type game: ZTBaseEngine
+        :return: None
+        """
+
+        super()._clone_into(game)
+        game.__engine_first = self.__engine_first
+        game.__active_lines = self.__active_lines
+        # The clone continues from a copy of the stream
+        game._rng = _clone_rng(self._rng)
+        for name in ('move1', 'center', 'liberty_move3'):
+            if hasattr(self, name):
+                setattr(game, name, getattr(self, name))
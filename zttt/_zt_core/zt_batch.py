@@ -0,0 +1,137 @@
+"""
+Batched engine moves
+---------------------
+
+Computes the move of ZTBaseEngine._get_bot_move for many positions in a single call.
+The lines are never walked per position, every check is a lookup into tables indexed by 9-bit masks.
+"""
+
+from typing import List, Tuple, Iterable, Sequence, Union
+from random import Random
+
+from .zt_base_board import ZTBaseBoard
+from .zt_random import _resolve_rng
+from ..zt_errors import ZTBadFunctionCall
+
+
+# _OPEN_CELLS[mask] holds, for every line (in the order of the engine's lines) with exactly two positions
+# in the mask, the bit of the remaining position of the line. Built on the first use by _open_cells
+_OPEN_CELLS: Tuple[Tuple[int, ...], ...] = None
+
+# The bit of each position
+_BITS: Tuple[int, ...] = tuple(1 << pos for pos in range(9))
+
+
+def _open_cells() -> Tuple[Tuple[int, ...], ...]:
+    """Returns the open cells table, building it on the first call
+
+    :return: The open cells of every 9-bit mask
+    :rtype: Tuple[Tuple[int, ...], ...]
+    """
+
+    global _OPEN_CELLS
+    if _OPEN_CELLS is None:
+        _OPEN_CELLS = tuple(
+            tuple(line_mask & ~mask for line_mask in ZTBaseBoard._LINE_MASKS
+                  if mask & line_mask != line_mask and bin(mask & line_mask).count('1') == 2)
+            for mask in range(1 << 9)
+        )
+    return _OPEN_CELLS
+
+
+def _board_masks(board_list: Sequence[int]) -> Tuple[int, int]:
+    """Converts a board list to the masks of player 1 and player 2
+
+    :param board_list: The board list (Row Major Order)
+    :type board_list: Sequence[int]
+    :return: The masks of player 1 and player 2
+    :rtype: Tuple[int, int]
+    :raise: ZTBadFunctionCall if the board list is not in proper format
+    """
+
+    if len(board_list) != 9:
+        raise ZTBadFunctionCall("The Board List length must be 9")
+
+    mask1 = mask2 = 0
+    for pos in range(9):
+        pos_val = board_list[pos]
+        if pos_val == ZTBaseBoard._VAL_PLAYER1:
+            mask1 |= _BITS[pos]
+        elif pos_val == ZTBaseBoard._VAL_PLAYER2:
+            mask2 |= _BITS[pos]
+        elif pos_val != ZTBaseBoard._VAL_EMPTY:
+            raise ZTBadFunctionCall(f"Board List not in the correct format, {pos_val} invalid")
+    return mask1, mask2
+
+
+def bot_move_from_masks(engine_mask: int, player_mask: int,
+                        rng: Union[Random, None] = None) -> Union[int, None]:
+    """The move of ZTBaseEngine._get_bot_move for a position given by masks
+
+    :param engine_mask: The 9-bit mask of the positions played by the engine
+    :type engine_mask: int
+    :param player_mask: The 9-bit mask of the positions played by the player
+    :type player_mask: int
+    :param rng: The generator of the random choices, the module level generator of random if None
+    :type rng: Union[Random, None]
+    :return: The move to play, None if there is no winnable, danger or double danger move
+    :rtype: Union[int, None]
+    """
+
+    choice = _resolve_rng(rng).choice
+    empty = ZTBaseBoard._FULL_MASK & ~(engine_mask | player_mask)
+    mask_positions = ZTBaseBoard._MASK_POSITIONS
+    open_cells = _open_cells()
+
+    # Winnable moves, one entry per line so that a position completing two lines is twice as likely
+    winnable = [cell for cell in open_cells[engine_mask] if cell & empty]
+    if winnable:
+        return mask_positions[choice(winnable)][0]
+
+    # Danger move, the first line the player can complete
+    for cell in open_cells[player_mask]:
+        if cell & empty:
+            return mask_positions[cell][0]
+
+    # Double danger moves, the corners which open two lines at once
+    double_danger = []
+    for corner in mask_positions[empty & ZTBaseBoard._CORNER_MASK]:
+        bit = _BITS[corner]
+        remaining = empty ^ bit
+        count = 0
+        for cell in open_cells[engine_mask | bit]:
+            if cell & remaining:
+                count += 1
+        if count >= 2:
+            double_danger.append(corner)
+    if double_danger:
+        return choice(double_danger)
+
+    return None
+
+
+def batch_bot_moves(positions: Iterable[Tuple[Sequence[int], bool]],
+                    rng: Union[Random, int, None] = None) -> List[Union[int, None]]:
+    """Computes the engine move for many positions at once
+
+    The moves follow the same decision order as ZTBaseEngine._get_bot_move:
+    a winnable move, then the danger move, then a double danger move.
+
+    :param positions: Pairs of a board list and whether the engine plays first (plays the value of player 1)
+    :type positions: Iterable[Tuple[Sequence[int], bool]]
+    :param rng: The generator of the random choices or its seed, the module level generator of random if None
+    :type rng: Union[Random, int, None]
+    :return: The move for each position, None where _get_bot_move finds no move
+    :rtype: List[Union[int, None]]
+    :raise: ZTBadFunctionCall if a board list is not in proper format or the seed is not an integer
+    """
+
+    rng = _resolve_rng(rng)
+    moves = []
+    for board_list, engine_first in positions:
+        mask1, mask2 = _board_masks(board_list)
+        if engine_first:
+            moves.append(bot_move_from_masks(mask1, mask2, rng))
+        else:
+            moves.append(bot_move_from_masks(mask2, mask1, rng))
+    return moves
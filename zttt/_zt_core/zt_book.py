@@ -0,0 +1,245 @@
+import os
+from struct import Struct
+from typing import List, Tuple, Dict, Iterator, Union
+
+from ..zt_errors import ZTInvalidInput
+
+
+MAGIC = b'ZTOB'
+VERSION = 1
+
+# Magic, version, m, n, k, depth, search depth (0 for an exhaustive search), padding, number of positions
+_HEADER = Struct('<4sBBBBBB2xI')
+
+# The books shipped with the package, named after their shape like 3x3x3.ztob
+BOOKS_DIR = os.path.join(os.path.dirname(__file__), 'books')
+
+
+class ZTBook:
+    """An opening book of an m, n, k board, the best moves of every position up to a number of moves
+
+    A position is keyed by the masks of the two players, mask1 | mask2 << (m * n), so a lookup is a single
+    dictionary access. Every entry holds the mask of the best moves and the value of the position for the
+    side to move. The values are exact when the book was generated by an exhaustive search, otherwise
+    only the forced wins and losses found within the search depth are known and the rest are 0.
+
+    Every position is stored in a record of the key followed by the moves and the value + 1 above them,
+    each in the fewest bytes the shape allows (5 bytes a position on 3 x 3).
+    """
+
+    __slots__ = ('m', 'n', 'k', 'depth', 'search_depth', '_entries')
+
+    def __init__(self, m: int, n: int, k: int, depth: int, search_depth: Union[int, None] = None) -> None:
+        """Initialize the empty book
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :param depth: The positions with fewer moves played are in the book
+        :type depth: int
+        :param search_depth: The depth the moves were searched to, None for an exhaustive search
+        :type search_depth: Union[int, None]
+        :return: None
+        """
+
+        self.m: int = m
+        self.n: int = n
+        self.k: int = k
+        self.depth: int = depth
+        self.search_depth: Union[int, None] = search_depth
+
+        # Key -> the moves mask | (value + 1) << (m * n)
+        self._entries: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ZTBook):
+            return NotImplemented
+        return (self.m, self.n, self.k, self.depth, self.search_depth, self._entries) == \
+            (other.m, other.n, other.k, other.depth, other.search_depth, other._entries)
+
+    def _add(self, mask1: int, mask2: int, value: int, moves: int) -> None:
+        """Adds a position
+
+        :param mask1: The mask of the positions played by player 1
+        :type mask1: int
+        :param mask2: The mask of the positions played by player 2
+        :type mask2: int
+        :param value: The value for the side to move (1 win, 0 draw or not known, -1 loss)
+        :type value: int
+        :param moves: The mask of the best moves
+        :type moves: int
+        :return: None
+        """
+
+        cells = self.m * self.n
+        self._entries[mask1 | mask2 << cells] = moves | value + 1 << cells
+
+    def moves_mask(self, mask1: int, mask2: int) -> Union[int, None]:
+        """Returns the mask of the best moves of a position
+
+        :param mask1: The mask of the positions played by player 1
+        :type mask1: int
+        :param mask2: The mask of the positions played by player 2
+        :type mask2: int
+        :return: The mask of the best moves, None if the position is not in the book
+        :rtype: Union[int, None]
+        """
+
+        cells = self.m * self.n
+        entry = self._entries.get(mask1 | mask2 << cells)
+        if entry is None:
+            return None
+        return entry & (1 << cells) - 1
+
+    def lookup(self, mask1: int, mask2: int) -> Union[Tuple[int, List[int]], None]:
+        """Looks up the value and the best moves of a position
+
+        :param mask1: The mask of the positions played by player 1
+        :type mask1: int
+        :param mask2: The mask of the positions played by player 2
+        :type mask2: int
+        :return: The value for the side to move (1 win, 0 draw or not known, -1 loss) and the list of the best
+            moves, None if the position is not in the book
+        :rtype: Union[Tuple[int, List[int]], None]
+        """
+
+        cells = self.m * self.n
+        entry = self._entries.get(mask1 | mask2 << cells)
+        if entry is None:
+            return None
+        return (entry >> cells) - 1, [pos for pos in range(cells) if entry >> pos & 1]
+
+    def positions(self) -> Iterator[Tuple[int, int]]:
+        """Iterates over the positions of the book
+
+        :return: Iterator over (mask of player 1, mask of player 2)
+        :rtype: Iterator[Tuple[int, int]]
+        """
+
+        cells = self.m * self.n
+        for key in self._entries:
+            yield key & (1 << cells) - 1, key >> cells
+
+    # Persistence
+
+    def to_bytes(self) -> bytes:
+        """Packs the book, the positions in the order of their keys so the same book always gives the same bytes
+
+        :return: The packed book
+        :rtype: bytes
+        """
+
+        cells = self.m * self.n
+        key_size, entry_size = (2 * cells + 7) // 8, (cells + 2 + 7) // 8
+        header = _HEADER.pack(MAGIC, VERSION, self.m, self.n, self.k, self.depth, self.search_depth or 0,
+                              len(self._entries))
+        return header + b''.join(
+            key.to_bytes(key_size, 'little') + self._entries[key].to_bytes(entry_size, 'little')
+            for key in sorted(self._entries)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ZTBook':
+        """Unpacks a book
+
+        :param data: The packed book
+        :type data: bytes
+        :return: The book
+        :rtype: ZTBook
+        :raise: ZTInvalidInput if the data is not a book of this version
+        """
+
+        if len(data) < _HEADER.size:
+            raise ZTInvalidInput("Not an opening book")
+        magic, version, m, n, k, depth, search_depth, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ZTInvalidInput("Not an opening book")
+        if version != VERSION:
+            raise ZTInvalidInput(f"Unsupported opening book version {version}")
+
+        book = cls(m, n, k, depth, search_depth or None)
+        cells = m * n
+        key_size, entry_size = (2 * cells + 7) // 8, (cells + 2 + 7) // 8
+        record_size = key_size + entry_size
+        if len(data) != _HEADER.size + count * record_size:
+            raise ZTInvalidInput("The opening book is truncated")
+
+        from_bytes = int.from_bytes
+        entries = book._entries
+        for offset in range(_HEADER.size, len(data), record_size):
+            entries[from_bytes(data[offset:offset + key_size], 'little')] = \
+                from_bytes(data[offset + key_size:offset + record_size], 'little')
+        return book
+
+    def save(self, path: str) -> None:
+        """Writes the book to a file
+
+        :param path: The path of the file
+        :type path: str
+        :return: None
+        """
+
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'ZTBook':
+        """Reads a book from a file
+
+        :param path: The path of the file
+        :type path: str
+        :return: The book
+        :rtype: ZTBook
+        :raise: ZTInvalidInput if the file is not a book of this version
+        """
+
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def book_path(m: int, n: int, k: int) -> str:
+    """Returns the path of the book of a shape shipped with the package
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :return: The path
+    :rtype: str
+    """
+    return os.path.join(BOOKS_DIR, f'{m}x{n}x{k}.ztob')
+
+
+# (m, n, k) -> the book shipped with the package, None if there is none
+_BOOKS: Dict[Tuple[int, int, int], Union[ZTBook, None]] = {}
+
+
+def get_book(m: int, n: int, k: int) -> Union[ZTBook, None]:
+    """Returns the book of a shape shipped with the package, loading it on the first call
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :return: The book, None if the package has no book of the shape
+    :rtype: Union[ZTBook, None]
+    """
+
+    shape = (m, n, k)
+    if shape in _BOOKS:
+        return _BOOKS[shape]
+
+    path = book_path(m, n, k)
+    book = ZTBook.load(path) if os.path.exists(path) else None
+    _BOOKS[shape] = book
+    return book
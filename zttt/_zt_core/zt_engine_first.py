@@ -1,7 +1,8 @@
-from typing import Dict, List
-from random import choice
+from typing import Dict, List, Tuple, Union
+from random import Random
 
 from .zt_base_engine import ZTBaseEngine
+from .zt_symmetry import transform_pos, inverse_transform_pos
 
 
 class ZTEngineFirst(ZTBaseEngine):
@@ -10,19 +11,61 @@ class ZTEngineFirst(ZTBaseEngine):
     The class is responsible for the logic when engine plays first
     """
 
-    __ENGINE_MOVE: Dict[int, Dict[int, List[int]]] = {
-        0: {1: [6, 4], 2: [6, 8], 3: [2, 4], 4: [5, 7], 5: [2, 4, 6], 6: [2, 8], 7: [2, 4, 6], 8: [2, 6]},
-        2: {0: [6, 8], 1: [8, 4], 3: [0, 4, 8], 4: [3, 7], 5: [0, 4], 6: [0, 8], 7: [0, 4, 8], 8: [0, 6]},
-        6: {0: [2, 8], 1: [0, 4, 8], 2: [0, 8], 3: [8, 4], 4: [1, 5], 5: [0, 4, 8], 7: [0, 4], 8: [0, 2]},
-        8: {0: [2, 6], 1: [2, 4, 6], 2: [0, 6], 3: [2, 4, 6], 4: [1, 3], 5: [6, 4], 6: [0, 2], 7: [2, 4]}
+    __slots__ = ()  # move1 is declared in ZTBaseEngine
+
+    # Engine Move for Move 3 when the engine has played the corner 0
+    # The other corners are mapped onto corner 0 by a symmetry of the board
+    __ENGINE_MOVE: Dict[int, List[int]] = {
+        1: [6, 4], 2: [6, 8], 3: [2, 4], 4: [5, 7], 5: [2, 4, 6], 6: [2, 8], 7: [2, 4, 6], 8: [2, 6]
     }
 
-    def __init__(self):
-        """Initialize the State Variables"""
-        ZTBaseEngine.__init__(self, True)
-        self.move1: int = choice([0, 2, 6, 8])
+    # The transform (rotation) which maps each corner onto the corner 0
+    __CORNER_TRANSFORM: Dict[int, int] = {0: 0, 2: 3, 8: 2, 6: 1}
+
+    def __init__(self, rng: Union[Random, int, None] = None):
+        """Initialize the State Variables
+
+        :param rng: The generator of the random choices (see ZTBaseEngine)
+        :type rng: Union[Random, int, None]
+        """
+        ZTBaseEngine.__init__(self, True, rng)
+        self.move1: int = self._rng.choice([0, 2, 6, 8])
         self._play_engine(self.move1)
 
+    def _sync_state(self) -> None:
+        """Takes move1 from the history after moves are undone, redone or replayed
+
+        :return: None
+        """
+
+        super()._sync_state()
+        if self.engine_first and self._history:
+            self.move1 = self._history[0]
+
+    def __choose_move(self, pos: int) -> Tuple[str, int]:
+        """Chooses the engine's reply to the player's move
+
+        :param pos: The position the player just played
+        :type pos: int
+        :return: The branch of the heuristics which chose the move and the move
+        :rtype: Tuple[str, int]
+        """
+
+        if self.move == 3:
+            transform = ZTEngineFirst.__CORNER_TRANSFORM[self.move1]
+            move = self._rng.choice(ZTEngineFirst.__ENGINE_MOVE[transform_pos(pos, transform)])
+            return 'opening', inverse_transform_pos(move, transform)
+
+        found = self._choose_bot_move()
+        if found is not None:
+            return found
+
+        if self.empty_corners:
+            return 'corner', self._rng.choice(self.empty_corners)
+
+        else:
+            return 'random', self._rng.choice(self._empty_positions)
+
     # A function which is called in the main method if play is True
     def play(self, pos: int) -> None:
         """Plays the player's move at the position specified
@@ -35,17 +78,4 @@ class ZTEngineFirst(ZTBaseEngine):
         """
 
         self._play_player(pos)
-        pos = int(pos)
-
-        if self.move == 3:
-            return self._play_engine(choice(ZTEngineFirst.__ENGINE_MOVE[self.move1][pos]))
-
-        move = self._get_bot_move()
-        if move:
-            return self._play_engine(move[0])
-
-        if self.empty_corners:
-            return self._play_engine(choice(self.empty_corners))
-
-        else:
-            return self._play_engine(choice(self._empty_positions))
+        self._play_engine(self.__choose_move(int(pos))[1])
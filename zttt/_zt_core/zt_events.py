@@ -0,0 +1,180 @@
+from typing import List, Callable, Union, Any, NamedTuple
+
+from ..zt_errors import ZTBadFunctionCall
+
+
+EVENTS = ('move', 'finish')
+
+
+class ZTEvent(NamedTuple):
+    """An event of a game, published once the game is updated"""
+
+    kind: str  # 'move' or 'finish'
+    game: Any  # The game
+    player: Union[int, None]  # The player who moved, None for 'finish'
+    pos: Union[int, None]  # The position played, None for 'finish'
+    winner: Union[int, None]  # The winner (0 is a draw) for 'finish', None for 'move'
+
+
+class ZTEventBus:
+    """Delivers the events of one or many games to any number of subscribers
+
+    A bus is attached to a game through game.events, and the same bus can be attached to many games
+    (every game of a GameStore for instance). The games only publish to their bus when one is attached.
+
+    1. Subscribers are called with the event as soon as it is published, in the order they subscribed
+    2. Coroutine function subscribers are scheduled on their event loop, off the move path
+    3. Batch subscribers are called with the list of the buffered events every batch_size events
+       and on flush
+    """
+
+    def __init__(self, batch_size: int = 256) -> None:
+        """Initialize the bus
+
+        :param batch_size: The number of events buffered for the batch subscribers
+        :type batch_size: int
+        :return: None
+        :raise: ZTBadFunctionCall if batch_size is not positive
+        """
+
+        if batch_size < 1:
+            raise ZTBadFunctionCall("batch_size must be at least 1")
+        self.batch_size: int = batch_size
+
+        # (events, callback) of the subscribers called at once
+        self._subscribers: List[tuple] = []
+        self._batch_subscribers: List[Callable[[List[ZTEvent]], Any]] = []
+        self._buffer: List[ZTEvent] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._subscribers or self._batch_subscribers)
+
+    def attach(self, game: Any) -> None:
+        """Attaches the bus to a game, replacing the bus attached before
+
+        :param game: The game
+        :type game: ZTBaseBoard
+        :return: None
+        """
+        game.events = self
+
+    def subscribe(self, callback: Callable[[ZTEvent], Any], events: Union[str, None] = None,
+                  loop: Union['asyncio.AbstractEventLoop', None] = None) -> Callable[[], None]:
+        """Subscribes a callable to the events
+
+        :param callback: The callable, called with the event. A coroutine function is scheduled on loop instead
+        :type callback: Callable[[ZTEvent], Any]
+        :param events: 'move' or 'finish' for one kind of event, both if None
+        :type events: Union[str, None]
+        :param loop: The event loop of a coroutine function, the running loop if None
+        :type loop: Union[asyncio.AbstractEventLoop, None]
+        :return: A function which unsubscribes the callable
+        :rtype: Callable[[], None]
+        :raise: ZTBadFunctionCall if the arguments are not valid
+        """
+
+        # asyncio is slow to import, so the games only import it once something subscribes
+        import asyncio
+
+        if not callable(callback):
+            raise ZTBadFunctionCall("The subscriber must be callable")
+        if events is not None and events not in EVENTS:
+            raise ZTBadFunctionCall(f"Unknown event {events!r}")
+        kinds = EVENTS if events is None else (events,)
+
+        if asyncio.iscoroutinefunction(callback):
+            if loop is None:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    raise ZTBadFunctionCall("A coroutine subscriber needs a loop outside of a running loop")
+            coroutine_function = callback
+
+            def callback(event: ZTEvent) -> None:
+                # Thread safe, so the games may be played in any thread
+                asyncio.run_coroutine_threadsafe(coroutine_function(event), loop)
+
+        subscriber = (kinds, callback)
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def subscribe_batch(self, callback: Callable[[List[ZTEvent]], Any]) -> Callable[[], None]:
+        """Subscribes a callable to the batches of events
+
+        :param callback: The callable, called with a list of events
+        :type callback: Callable[[List[ZTEvent]], Any]
+        :return: A function which unsubscribes the callable
+        :rtype: Callable[[], None]
+        :raise: ZTBadFunctionCall if callback is not callable
+        """
+
+        if not callable(callback):
+            raise ZTBadFunctionCall("The subscriber must be callable")
+        self._batch_subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._batch_subscribers:
+                self._batch_subscribers.remove(callback)
+
+        return unsubscribe
+
+    def flush(self) -> None:
+        """Delivers the buffered events to the batch subscribers
+
+        :return: None
+        """
+
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        for callback in self._batch_subscribers:
+            callback(batch)
+
+    def publish(self, event: ZTEvent) -> None:
+        """Delivers an event
+
+        :param event: The event
+        :type event: ZTEvent
+        :return: None
+        """
+
+        for kinds, callback in self._subscribers:
+            if event.kind in kinds:
+                callback(event)
+        if self._batch_subscribers:
+            self._buffer.append(event)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def _move(self, game: Any, player: int, pos: int) -> None:
+        """Publishes a move, called by the games
+
+        :param game: The game
+        :type game: ZTBaseBoard
+        :param player: The player who moved
+        :type player: int
+        :param pos: The position played
+        :type pos: int
+        :return: None
+        """
+
+        if self._subscribers or self._batch_subscribers:
+            self.publish(ZTEvent('move', game, player, pos, None))
+
+    def _finish(self, game: Any, winner: int) -> None:
+        """Publishes the end of a game, called by the games
+
+        :param game: The game
+        :type game: ZTBaseBoard
+        :param winner: The winner, 0 is a draw
+        :type winner: int
+        :return: None
+        """
+
+        if self._subscribers or self._batch_subscribers:
+            self.publish(ZTEvent('finish', game, None, None, winner))
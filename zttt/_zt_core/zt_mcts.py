@@ -0,0 +1,322 @@
+from math import log, sqrt
+from random import Random, getrandbits
+from time import perf_counter
+from typing import List, Tuple, Dict, Union, NamedTuple
+
+from .zt_mnk_board import _MNKShape
+from .zt_mnk_engine import ZTMNKEngine, _process_pool
+from .zt_random import _resolve_rng, _clone_rng, _GLOBAL_RNG
+from ..zt_errors import *
+
+
+_EXPLORATION = sqrt(2)  # The exploration constant of UCT
+
+# The results of a game for the player who made the move into a node
+_WON, _DRAWN, _LOST = 1.0, 0.5, 0.0
+
+# (m, n, k) -> shape of the fast board, built once per process
+_SHAPES: Dict[Tuple[int, int, int], _MNKShape] = {}
+
+
+class MCTSResult(NamedTuple):
+    """The result of a tree search"""
+
+    move: int
+    visits: int  # The playouts through the move
+    win_rate: float  # The average result of the move for the side to move, a draw counts 1 / 2
+    playouts: int  # The playouts of the search
+
+
+class _Node:
+    """A node of the tree, for the position after move"""
+
+    __slots__ = ('move', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move: int, untried: List[int], terminal: Union[float, None]) -> None:
+        """Initializes the node
+
+        :param move: The move into the node, -1 for the root
+        :type move: int
+        :param untried: The moves not yet expanded
+        :type untried: List[int]
+        :param terminal: The result for the player who moved into the node if the game is over, None otherwise
+        :type terminal: Union[float, None]
+        :return: None
+        """
+
+        self.move: int = move
+        self.children: List['_Node'] = []
+        self.untried: List[int] = untried
+        self.visits: int = 0
+        self.wins: float = 0.0  # The sum of the results for the player who moved into the node
+        self.terminal: Union[float, None] = terminal
+
+
+def _wins(rays: tuple, k: int, pos: int, mask: int) -> bool:
+    """Checks if the move at pos completes k in a row on the fast board
+
+    :param rays: The rays of the shape
+    :type rays: tuple
+    :param k: The number in a row needed to win
+    :type k: int
+    :param pos: The position just played
+    :type pos: int
+    :param mask: The mask of the player who played it, pos included
+    :type mask: int
+    :return: True if the move wins, False otherwise
+    :rtype: bool
+    """
+
+    for forward, backward in rays[pos]:
+        count = 1
+        for other in forward:
+            if not mask >> other & 1:
+                break
+            count += 1
+        for other in backward:
+            if not mask >> other & 1:
+                break
+            count += 1
+        if count >= k:
+            return True
+    return False
+
+
+def _run_tree(m: int, n: int, k: int, side: int, other: int, time_limit: Union[float, None],
+              playouts: Union[int, None], seed: int) -> Tuple[Dict[int, Tuple[int, float]], int]:
+    """Grows a UCT tree from the position within the budget
+
+    The playouts play random moves on a pair of masks, the first playout always completes.
+    The function is picklable for the process pool.
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param side: The mask of the side to move
+    :type side: int
+    :param other: The mask of the opponent
+    :type other: int
+    :param time_limit: The seconds to search for, no limit if None
+    :type time_limit: Union[float, None]
+    :param playouts: The number of playouts, no limit if None
+    :type playouts: Union[int, None]
+    :param seed: The seed of the random moves
+    :type seed: int
+    :return: Dictionary from the root moves to their (visits, wins) and the number of playouts
+    :rtype: Tuple[Dict[int, Tuple[int, float]], int]
+    """
+
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    shape = _SHAPES.get((m, n, k))
+    if shape is None:
+        shape = _SHAPES[(m, n, k)] = _MNKShape(m, n, k)
+    rays, full = shape.rays, shape.full_mask
+    rng = Random(seed)
+    randrange, shuffle = rng.randrange, rng.shuffle
+
+    def empty_positions(empty: int) -> List[int]:
+        return [pos for pos in range(shape.cells) if empty >> pos & 1]
+
+    root = _Node(-1, empty_positions(full & ~(side | other)), None)
+    count = 0
+    while True:
+        if count and (playouts is not None and count >= playouts or deadline is not None and perf_counter() >= deadline):
+            break
+        count += 1
+
+        # Selection, the masks follow the path with to_move the mask of the side to move
+        node, path = root, [root]
+        to_move, moved = side, other
+        while not node.untried and node.terminal is None:
+            factor = _EXPLORATION * sqrt(log(node.visits))
+            node = max(node.children, key=lambda child: child.wins / child.visits + factor / sqrt(child.visits))
+            path.append(node)
+            to_move, moved = moved, to_move | 1 << node.move
+
+        # Expansion
+        if node.terminal is None:
+            pos = node.untried.pop(randrange(len(node.untried)))
+            to_move, moved = moved, to_move | 1 << pos
+            empty = full & ~(to_move | moved)
+            if _wins(rays, k, pos, moved):
+                node = _Node(pos, [], _WON)
+            elif not empty:
+                node = _Node(pos, [], _DRAWN)
+            else:
+                node = _Node(pos, empty_positions(empty), None)
+            path[-1].children.append(node)
+            path.append(node)
+
+        # Playout, result is for the player who moved into the node
+        result = node.terminal
+        if result is None:
+            result = _DRAWN
+            moves = empty_positions(full & ~(to_move | moved))
+            shuffle(moves)
+            mover_is_last = False
+            for pos in moves:
+                to_move |= 1 << pos
+                if _wins(rays, k, pos, to_move):
+                    result = _WON if mover_is_last else _LOST
+                    break
+                to_move, moved = moved, to_move
+                mover_is_last = not mover_is_last
+
+        # Backpropagation
+        for node in reversed(path):
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+
+    return dict((child.move, (child.visits, child.wins)) for child in root.children), count
+
+
+def mcts_move(m: int, n: int, k: int, side: int, other: int, time_limit: Union[float, None] = 1.0,
+              playouts: Union[int, None] = None, workers: Union[int, None] = None,
+              seed: Union[int, None] = None) -> MCTSResult:
+    """Finds the best move of a position by Monte Carlo tree search within a time or playout budget
+
+    A winning move is played without any search. With workers, every process grows its own tree
+    from the position and the statistics of the root moves are merged, the most visited move is played.
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param side: The mask of the side to move
+    :type side: int
+    :param other: The mask of the opponent
+    :type other: int
+    :param time_limit: The seconds to search for, no limit if None
+    :type time_limit: Union[float, None]
+    :param playouts: The number of playouts (split between the workers), no limit if None
+    :type playouts: Union[int, None]
+    :param workers: The number of processes growing trees, the search runs in this process if None
+    :type workers: Union[int, None]
+    :param seed: The seed of the random moves, a random seed if None
+    :type seed: Union[int, None]
+    :return: The result of the search
+    :rtype: MCTSResult
+    :raise: ZTBadFunctionCall if there is neither a time nor a playout budget
+    :raise: ZTGameException if there is no empty position
+    """
+
+    if time_limit is None and playouts is None:
+        raise ZTBadFunctionCall("The search needs a time limit or a number of playouts")
+
+    shape = _SHAPES.get((m, n, k))
+    if shape is None:
+        shape = _SHAPES[(m, n, k)] = _MNKShape(m, n, k)
+    empty = shape.full_mask & ~(side | other)
+    if not empty:
+        raise ZTGameException("There is no move to search")
+
+    for pos in range(shape.cells):
+        if empty >> pos & 1 and _wins(shape.rays, k, pos, side | 1 << pos):
+            return MCTSResult(pos, 0, 1.0, 0)
+
+    if seed is None:
+        seed = getrandbits(64)
+
+    if workers is None or workers < 2:
+        trees = [_run_tree(m, n, k, side, other, time_limit, playouts, seed)]
+    else:
+        share = None if playouts is None else max(1, playouts // workers)
+        pool = _process_pool(workers)
+        futures = [pool.submit(_run_tree, m, n, k, side, other, time_limit, share, seed + i) for i in range(workers)]
+        trees = [future.result() for future in futures]
+
+    merged: Dict[int, List[float]] = {}
+    for stats, _ in trees:
+        for move, (visits, wins) in stats.items():
+            total = merged.setdefault(move, [0, 0.0])
+            total[0] += visits
+            total[1] += wins
+
+    move, (visits, wins) = max(merged.items(), key=lambda item: item[1][0])
+    return MCTSResult(move, visits, wins / visits, sum(count for _, count in trees))
+
+
+class ZTMCTSEngine(ZTMNKEngine):
+    """Class for the Monte Carlo Tree Search Engine
+
+    The engine plays on any m, n, k board and always moves within its time or playout budget
+    """
+
+    __slots__ = ('time_limit', 'playouts', 'workers', 'last_search', '_rng')
+
+    def __init__(self, m: int, n: int, k: int, _engine_first: bool, time_limit: Union[float, None] = 1.0,
+                 playouts: Union[int, None] = None, workers: Union[int, None] = None,
+                 rng: Union[Random, int, None] = None) -> None:
+        """Initialize the State Variables
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :param _engine_first: Specifies if the engine starts first
+        :type _engine_first: bool
+        :param time_limit: The seconds the engine searches for per move, no limit if None
+        :type time_limit: Union[float, None]
+        :param playouts: The number of playouts per move, no limit if None
+        :type playouts: Union[int, None]
+        :param workers: The number of processes growing trees, a single process if None
+        :type workers: Union[int, None]
+        :param rng: The generator the seed of every search is drawn from or its seed,
+            the module level generator of random if None
+        :type rng: Union[Random, int, None]
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid, there is no budget or the seed is not an integer
+        """
+
+        if time_limit is None and playouts is None:
+            raise ZTBadFunctionCall("The engine needs a time limit or a number of playouts")
+
+        self.time_limit: Union[float, None] = time_limit
+        self.playouts: Union[int, None] = playouts
+        self.workers: Union[int, None] = workers
+
+        # The result of the last search, None before the first engine move
+        self.last_search: Union[MCTSResult, None] = None
+
+        # The seeds of the searches are drawn from it
+        self._rng: Random = _resolve_rng(rng)
+
+        ZTMNKEngine.__init__(self, m, n, k, _engine_first)
+
+    def _engine_move(self) -> int:
+        """Searches the current position for the side to move
+
+        :return: The move to play
+        :rtype: int
+        """
+
+        turn = self.turn
+        m, n, k = self.dimensions
+        # mcts_move draws the seed from the module level generator itself, only when it searches
+        seed = None if self._rng is _GLOBAL_RNG else self._rng.getrandbits(64)
+        self.last_search = mcts_move(m, n, k, self._masks[turn], self._masks[3 - turn],
+                                     self.time_limit, self.playouts, self.workers, seed)
+        return self.last_search.move
+
+    def _clone_into(self, game: 'ZTMCTSEngine') -> None:
+        """Copies the state of the engine into a new object
+
+        :param game: The new object
+        :type game: ZTMCTSEngine
+        :return: None
+        """
+
+        super()._clone_into(game)
+        game.time_limit = self.time_limit
+        game.playouts = self.playouts
+        game.workers = self.workers
+        game.last_search = self.last_search
+        game._rng = _clone_rng(self._rng)
@@ -0,0 +1,223 @@
+from typing import List, Tuple, Dict, Union
+
+from .zt_base_board import ZTBaseBoard
+from ..zt_errors import ZTBadFunctionCall
+
+
+class _MNKShape:
+    """The precomputed geometry of an m x n board with k in a row, shared by all the boards of the shape"""
+
+    __slots__ = ('m', 'n', 'k', 'cells', 'full_mask', 'rays')
+
+    # The four directions (row step, column step), each scanned both ways from the last move
+    _DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, m: int, n: int, k: int) -> None:
+        """Computes the geometry
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :return: None
+        """
+
+        self.m: int = m
+        self.n: int = n
+        self.k: int = k
+        self.cells: int = m * n
+        self.full_mask: int = (1 << m * n) - 1
+
+        # rays[pos] holds, for every direction, the positions up to k - 1 steps forward and backward from pos
+        self.rays: Tuple[Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...], ...] = tuple(
+            tuple(
+                (self.__ray(pos, dr, dc), self.__ray(pos, -dr, -dc))
+                for dr, dc in _MNKShape._DIRECTIONS
+            )
+            for pos in range(m * n)
+        )
+
+    def __ray(self, pos: int, dr: int, dc: int) -> Tuple[int, ...]:
+        """Returns the positions up to k - 1 steps from pos in a direction, stopping at the edge
+
+        :param pos: The starting position
+        :type pos: int
+        :param dr: The row step
+        :type dr: int
+        :param dc: The column step
+        :type dc: int
+        :return: The positions in order of distance
+        :rtype: Tuple[int, ...]
+        """
+
+        row, col = divmod(pos, self.n)
+        ray = []
+        for _ in range(self.k - 1):
+            row, col = row + dr, col + dc
+            if not (0 <= row < self.m and 0 <= col < self.n):
+                break
+            ray.append(row * self.n + col)
+        return tuple(ray)
+
+
+class ZTMNKBoard(ZTBaseBoard):
+    """The base class for boards of m rows and n columns where k in a row wins
+
+    Positions are numbered in row major order from 0. The win check only scans the (up to) 4 (k - 1)
+    positions around the last move, counting the run of the player's positions in each direction.
+    """
+
+    __slots__ = ('_shape',)
+
+    # (m, n, k) -> shape, the geometry is computed once per shape
+    __SHAPES: Dict[Tuple[int, int, int], _MNKShape] = {}
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3) -> None:
+        """Initializes the board and the state variables
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid
+        """
+
+        if not (isinstance(m, int) and isinstance(n, int) and isinstance(k, int)):
+            raise ZTBadFunctionCall("m, n and k must be integers")
+        if m < 1 or n < 1 or not 1 <= k <= max(m, n):
+            raise ZTBadFunctionCall("The board must have at least one row and column and k can not exceed its size")
+
+        super().__init__()
+
+        shape = ZTMNKBoard.__SHAPES.get((m, n, k))
+        if shape is None:
+            shape = ZTMNKBoard.__SHAPES[(m, n, k)] = _MNKShape(m, n, k)
+        self._shape: _MNKShape = shape
+
+        self._board_list = [ZTBaseBoard._VAL_EMPTY] * shape.cells
+        self._empty_mask = shape.full_mask
+
+    # Properties
+
+    @property
+    def dimensions(self) -> Tuple[int, int, int]:
+        """The dimensions of the board
+
+        :return: The number of rows, the number of columns and the number in a row needed to win
+        :rtype: Tuple[int, int, int]
+        """
+        return self._shape.m, self._shape.n, self._shape.k
+
+    @property
+    def _empty_positions(self) -> Tuple[int, ...]:
+        """The empty positions, must not be modified
+
+        :return: A tuple (in row major order from 0) of the empty positions
+        :rtype: Tuple[int, ...]
+        """
+
+        empty = self._empty_mask
+        return tuple(pos for pos in range(self._shape.cells) if empty >> pos & 1)
+
+    @property
+    def empty_positions(self) -> List[int]:
+        """Returns the list of empty positions
+
+        :return: A list (in row major order from 0) of the empty positions
+        :rtype: List[int]
+        """
+        return list(self._empty_positions)
+
+    @property
+    def empty_corners(self) -> List[int]:
+        """Returns the list of empty corners
+
+        :return: List of the empty corners
+        :rtype: List[int]
+        """
+
+        shape = self._shape
+        corners = sorted({0, shape.n - 1, shape.cells - shape.n, shape.cells - 1})
+        return [pos for pos in corners if self._empty_mask >> pos & 1]
+
+    @property
+    def empty_edges(self) -> List[int]:
+        """Returns the list of empty positions on the border of the board which are not corners
+
+        :return: List of the empty edges
+        :rtype: List[int]
+        """
+
+        shape = self._shape
+        corners = self.empty_corners
+        edges = []
+        for pos in self._empty_positions:
+            row, col = divmod(pos, shape.n)
+            if (row in (0, shape.m - 1) or col in (0, shape.n - 1)) and pos not in corners:
+                edges.append(pos)
+        return edges
+
+    @property
+    def canonical(self) -> Tuple[List[int], int]:
+        """The canonical form is only available on the 3 x 3 board
+
+        :raise: ZTBadFunctionCall always
+        """
+        raise ZTBadFunctionCall("The canonical form is only available on the 3 x 3 board")
+
+    def _renderer_key(self) -> Tuple[Tuple[str, str, str], int, int]:
+        """The indicators and the shape the board is rendered with
+
+        :return: The indicators of player 1, player 2 and the empty positions, the rows and the columns
+        :rtype: Tuple[Tuple[str, str, str], int, int]
+        """
+
+        (indicators, _, _) = super()._renderer_key()
+        return indicators, self._shape.m, self._shape.n
+
+    # Helper Functions
+
+    def _find_win(self, pos: int, mask: int) -> Union[List[int], None]:
+        """Finds the runs of k or more completed by the current move
+
+        :param pos: The position that was just played
+        :type pos: int
+        :param mask: The mask of the player who just played
+        :type mask: int
+        :return: The positions to be highlighted (pos followed by the rest of the runs), None if there is no win
+        :rtype: Union[List[int], None]
+        """
+
+        k = self._shape.k
+        if self.move < 2 * k - 1:
+            return None
+
+        winning_set_list = None
+        for forward, backward in self._shape.rays[pos]:
+            run = []
+            for ray in (forward, backward):
+                for other in ray:
+                    if not mask >> other & 1:
+                        break
+                    run.append(other)
+            if len(run) + 1 >= k:
+                if winning_set_list is None:
+                    winning_set_list = [pos]
+                winning_set_list.extend(run)
+        return winning_set_list
+
+    def _clone_into(self, game: 'ZTMNKBoard') -> None:
+        """Copies the state of the board into a new object
+
+        :param game: The new object
+        :type game: ZTMNKBoard
+        :return: None
+        """
+
+        super()._clone_into(game)
+        game._shape = self._shape
@@ -0,0 +1,185 @@
+from typing import Dict, Union
+
+from .zt_book import get_book
+from .zt_mnk_board import ZTMNKBoard
+from ..zt_errors import *
+
+
+# workers -> process pool, kept for the later moves of every engine
+_POOLS: Dict[int, 'ProcessPoolExecutor'] = {}
+
+
+def _process_pool(workers: int) -> 'ProcessPoolExecutor':
+    """Returns the process pool with a number of workers, starting it on the first call
+
+    :param workers: The number of processes
+    :type workers: int
+    :return: The pool
+    :rtype: ProcessPoolExecutor
+    """
+
+    pool = _POOLS.get(workers)
+    if pool is None:
+        # Imported on the first pool, most engines never start one
+        from concurrent.futures import ProcessPoolExecutor
+        pool = _POOLS[workers] = ProcessPoolExecutor(workers)
+    return pool
+
+
+class ZTMNKEngine(ZTMNKBoard):
+    """Base Class for the engines of the m, n, k boards
+
+    The subclasses choose the engine moves in _engine_move, except in the positions of the opening book
+    shipped for the shape (see zt_book), where the engine plays the book move
+    """
+
+    __slots__ = ('__engine_first',)
+
+    def __init__(self, m: int, n: int, k: int, _engine_first: bool) -> None:
+        """Initialize the State Variables in an Engine
+
+        The subclasses set up their own state before calling this, since the engine may move first here.
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :param _engine_first: Specifies if the engine starts first
+        :type _engine_first: bool
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid
+        """
+
+        ZTMNKBoard.__init__(self, m, n, k)
+        self.__engine_first: bool = _engine_first
+
+        if _engine_first:
+            self._play_engine(self.__next_move())
+
+    @property
+    def engine_first(self) -> bool:
+        """Returns if the engine starts first
+
+        :return: True if the engine starts first, False otherwise
+        :rtype: bool
+        """
+        return self.__engine_first
+
+    def _engine_move(self) -> int:
+        """Returns the move of the engine in the current position
+
+        :return: The move to play
+        :rtype: int
+        :raise: ZTBadFunctionCall if the subclass does not choose moves
+        """
+        raise ZTBadFunctionCall("The engine does not choose moves")
+
+    def _book_move(self) -> Union[int, None]:
+        """Returns the first of the best moves of the opening book in the current position
+
+        :return: The move to play, None if there is no book of the shape or the position is not in it
+        :rtype: Union[int, None]
+        """
+
+        book = get_book(*self.dimensions)
+        if book is None:
+            return None
+        moves = book.moves_mask(self._masks[1], self._masks[2])
+        if not moves:
+            return None
+        return (moves & -moves).bit_length() - 1
+
+    def __next_move(self) -> int:
+        """Returns the move of the engine, from the opening book if the position is in it
+
+        :return: The move to play
+        :rtype: int
+        """
+
+        move = self._book_move()
+        return self._engine_move() if move is None else move
+
+    def _play_engine(self, pos: int) -> None:
+        """Play the engine move
+
+        :param pos: Position for engine to play
+        :type pos: int
+        :return: None
+        :raise: ZTGameException if the game is not in progress
+        :raise: ZTInvalidInput if the move is invalid
+        """
+
+        if self.__engine_first:
+            self._play_player_one_move(pos)
+        else:
+            self._play_player_two_move(pos)
+
+    def _play_player(self, pos: int) -> None:
+        """Play the player move
+
+        :param pos: Position for player to play
+        :type pos: int
+        :return: None
+        :raise: ZTGameException if the game is not in progress
+        :raise: ZTInvalidInput if the move is invalid
+        """
+
+        if not self.__engine_first:
+            self._play_player_one_move(pos)
+        else:
+            self._play_player_two_move(pos)
+
+    def undo(self) -> None:
+        """Takes back the moves back to the player's previous move, so that it is the player's turn again
+
+        :return: None
+        :raise: ZTGameException if the player has no move to undo
+        """
+
+        player_turn = 2 if self.__engine_first else 1
+        if len(self._history) < player_turn:
+            raise ZTGameException("There is no move to undo")
+
+        self._undo_move()
+        while self.turn != player_turn:
+            self._undo_move()
+
+    def redo(self) -> None:
+        """Plays the undone moves again up to the player's next turn
+
+        :return: None
+        :raise: ZTGameException if there is no move to redo
+        """
+
+        player_turn = 2 if self.__engine_first else 1
+        self._redo_move()
+        while self._redo_stack and self.status and self.turn != player_turn:
+            self._redo_move()
+
+    def _clone_into(self, game: 'ZTMNKEngine') -> None:
+        """Copies the state of the engine into a new object
+
+        :param game: The new object
+        :type game: ZTMNKEngine
+        :return: None
+        """
+
+        super()._clone_into(game)
+        game.__engine_first = self.__engine_first
+
+    def play(self, pos: int) -> None:
+        """Plays the player's move at the position specified and replies with the engine's move
+
+        :param pos: The position to play the player's move
+        :type pos: int
+        :return: None
+        :raise: ZTGameException if the game is not in progress
+        :raise: ZTInvalidInput if the move is invalid
+        """
+
+        self._play_player(pos)
+
+        if self.status:
+            self._play_engine(self.__next_move())
@@ -1,7 +1,7 @@
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Union
+from random import Random
 
 from .zt_base_engine import ZTBaseEngine
-from random import choice
 
 
 class ZTPlayerFirst (ZTBaseEngine):
@@ -10,6 +10,8 @@ class ZTPlayerFirst (ZTBaseEngine):
     The class is responsible for the logic when player plays first
     """
 
+    __slots__ = ()  # center and liberty_move3 are declared in ZTBaseEngine
+
     # Engine Move for Move 2
     __ENGINE_MOVE: Dict[Tuple[int, int], List[int]] = {
         (0, 8): [1, 3, 5, 7], (2, 6): [1, 3, 5, 7],  # Opposite corner cases
@@ -17,9 +19,16 @@ class ZTPlayerFirst (ZTBaseEngine):
         (1, 3): [0], (1, 5): [2], (7, 3): [6], (7, 5): [8],  # Non-opposite edge cases
     }
 
-    def __init__(self) -> None:
-        """Initialize the State Variables"""
-        ZTBaseEngine.__init__(self, False)
+    # Pairs of corners on the same side, the player playing one of them in moves 1 and 3 sets liberty_move3
+    __SIDE_CORNERS: Tuple[Tuple[int, int], ...] = ((0, 2), (2, 8), (6, 8), (0, 6))
+
+    def __init__(self, rng: Union[Random, int, None] = None) -> None:
+        """Initialize the State Variables
+
+        :param rng: The generator of the random choices (see ZTBaseEngine)
+        :type rng: Union[Random, int, None]
+        """
+        ZTBaseEngine.__init__(self, False, rng)
         self.center: bool = False  # This variable is True when the opponent plays center in move 1
         self.liberty_move3: bool = False  # This means choice of the third move is corners
 
@@ -32,7 +41,7 @@ class ZTPlayerFirst (ZTBaseEngine):
 
         for (pos1, pos2) in ZTPlayerFirst.__ENGINE_MOVE:
             if self._board_list[pos1] == self._player_value and self._board_list[pos2] == self._player_value:
-                return choice(ZTPlayerFirst.__ENGINE_MOVE[(pos1, pos2)])
+                return self._rng.choice(ZTPlayerFirst.__ENGINE_MOVE[(pos1, pos2)])
 
         non_center_lines: List[Tuple[int, int, int]] = [(0, 1, 2), (2, 5, 8), (6, 7, 8), (0, 3, 6)]
         for line in non_center_lines:
@@ -61,47 +70,69 @@ class ZTPlayerFirst (ZTBaseEngine):
         if self._board_list[8] == self._player_value:
             return 0
 
-    def play(self, pos: int) -> None:
-        """Plays the player's move at the position specified
+    def _sync_state(self) -> None:
+        """Recomputes center and liberty_move3 from the history after moves are undone, redone or replayed
 
-        :param pos: The position to play the player's move
-        :type pos: int
         :return: None
-        :raise: ZTGameException if the game is not in progress
-        :raise: ZTInvalidInput if the position is invalid
         """
 
-        self._play_player(pos)
-        pos = int(pos)
-
-        if not self.status:
+        super()._sync_state()
+        if self.engine_first:
             return
+        history = self._history
+        self.center = len(history) >= 2 and history[0] == 4
+        self.liberty_move3 = len(history) >= 4 and not self.center and \
+            tuple(sorted(history[0:3:2])) in ZTPlayerFirst.__SIDE_CORNERS
+
+    def __choose_move(self, pos: int) -> Tuple[str, int]:
+        """Chooses the engine's reply to the player's move
+
+        :param pos: The position the player just played
+        :type pos: int
+        :return: The branch of the heuristics which chose the move and the move
+        :rtype: Tuple[str, int]
+        """
 
         if self.move == 2:
             if pos == 4:
                 self.center = True  # The player played the center so the best move is a corner
-                return self._play_engine(choice(self.empty_corners))
-            return self._play_engine(4)  # If the player does not start with center, the engine will
+                return 'corner', self._rng.choice(self.empty_corners)
+            return 'opening', 4  # If the player does not start with center, the engine will
 
         if self.move == 4 and not self.center:
-            return self._play_engine(self.__get_non_center_move2())
+            return 'opening', self.__get_non_center_move2()
 
         if self.move == 4 and self.center:
             move = self._get_danger_move()
             if move:
-                return self._play_engine(move[0])
-            return self._play_engine(choice(self.empty_corners))
+                return 'danger', move[0]
+            return 'corner', self._rng.choice(self.empty_corners)
 
         # Special Cases Over
-        move = self._get_bot_move()
-        if move:
-            return self._play_engine(move[0])
+        found = self._choose_bot_move()
+        if found is not None:
+            return found
 
         if self.move == 6:
             if self.liberty_move3:
-                return self._play_engine(choice(self.empty_edges))
+                return 'edge', self._rng.choice(self.empty_edges)
             else:
-                return self._play_engine(choice(self.empty_corners))
+                return 'corner', self._rng.choice(self.empty_corners)
+
+        # The engine plays the moves 2, 4, 6 and 8, so this is the move 8
+        return 'random', self._rng.choice(self._empty_positions)
+
+    def play(self, pos: int) -> None:
+        """Plays the player's move at the position specified
+
+        :param pos: The position to play the player's move
+        :type pos: int
+        :return: None
+        :raise: ZTGameException if the game is not in progress
+        :raise: ZTInvalidInput if the position is invalid
+        """
+
+        self._play_player(pos)
 
-        if self.move == 8:
-            return self._play_engine(choice(self._empty_positions))
+        if self.status:
+            self._play_engine(self.__choose_move(int(pos))[1])
@@ -0,0 +1,276 @@
+"""
+Hot path profiling
+-------------------
+
+Opt-in instrumentation of the steps of a move and of the decisions of the engines.
+
+enable_profiling wraps the methods of the steps on their classes and disable_profiling puts the
+original methods back, so while profiling is disabled the move path is exactly the uninstrumented one.
+
+1. Steps: Every call is counted and timed into a latency histogram
+2. Branches: The engines also count the branch of the heuristics (or the search) which chose each move
+"""
+
+import json
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter_ns
+from typing import List, Tuple, Dict, Iterator, Callable, Union, Any
+
+from .zt_base_board import ZTBaseBoard
+from .zt_events import ZTEventBus
+from .zt_engine_first import ZTEngineFirst
+from .zt_player_first import ZTPlayerFirst
+from .zt_solver import ZTSolver
+from .zt_mnk_engine import ZTMNKEngine
+from .zt_search import ZTSearchEngine
+from .zt_mcts import ZTMCTSEngine
+
+
+_BUCKETS = 40  # Bucket i of a histogram counts the calls taking [2 ** (i - 1), 2 ** i) ns, the last one the rest
+
+# (step, class, attribute) of every instrumented method, the attribute is defined on the class itself
+_STEPS: Tuple[Tuple[str, type, str], ...] = (
+    ('move', ZTBaseBoard, '_ZTBaseBoard__play_player_move'),
+    ('verify_pos', ZTBaseBoard, '_verify_pos'),
+    ('check_win', ZTBaseBoard, '_ZTBaseBoard__check_win'),
+    ('on_move', ZTBaseBoard, '_trigger_move'),
+    ('on_finish', ZTBaseBoard, '_trigger_finish'),
+    ('events', ZTEventBus, '_move'),
+    ('events', ZTEventBus, '_finish'),
+)
+
+# (engine, class, attribute) of the methods choosing the engine moves
+# They return (branch, move) for the heuristic engines and the move (None for a book miss) for the others
+_ENGINES: Tuple[Tuple[str, type, str], ...] = (
+    ('engine_first', ZTEngineFirst, '_ZTEngineFirst__choose_move'),
+    ('player_first', ZTPlayerFirst, '_ZTPlayerFirst__choose_move'),
+    ('solver', ZTSolver, '_ZTSolver__get_solver_move'),
+    ('book', ZTMNKEngine, '_book_move'),
+    ('search', ZTSearchEngine, '_engine_move'),
+    ('mcts', ZTMCTSEngine, '_engine_move'),
+)
+
+
+class ZTStats:
+    """The counts, latency histograms and engine branch counts collected while profiling"""
+
+    __slots__ = ('counts', 'total_ns', 'max_ns', 'histograms', 'branches', '_lock')
+
+    def __init__(self) -> None:
+        """Initialize the empty stats"""
+
+        self.counts: Dict[str, int] = {}
+        self.total_ns: Dict[str, int] = {}
+        self.max_ns: Dict[str, int] = {}
+        self.histograms: Dict[str, List[int]] = {}
+        # 'engine.branch' -> moves, like 'player_first.double_danger'
+        self.branches: Dict[str, int] = {}
+        # The games may be played in many threads
+        self._lock: Lock = Lock()
+
+    def _record(self, step: str, elapsed: int, branch: Union[str, None] = None) -> None:
+        """Records a call
+
+        :param step: The step
+        :type step: str
+        :param elapsed: The duration of the call in nanoseconds
+        :type elapsed: int
+        :param branch: The branch taken, if any
+        :type branch: Union[str, None]
+        :return: None
+        """
+
+        with self._lock:
+            if step not in self.counts:
+                self.counts[step] = self.total_ns[step] = self.max_ns[step] = 0
+                self.histograms[step] = [0] * _BUCKETS
+            self.counts[step] += 1
+            self.total_ns[step] += elapsed
+            if elapsed > self.max_ns[step]:
+                self.max_ns[step] = elapsed
+            self.histograms[step][min(elapsed.bit_length(), _BUCKETS - 1)] += 1
+            if branch is not None:
+                self.branches[branch] = self.branches.get(branch, 0) + 1
+
+    def reset(self) -> None:
+        """Clears the stats
+
+        :return: None
+        """
+
+        with self._lock:
+            for stats in (self.counts, self.total_ns, self.max_ns, self.histograms, self.branches):
+                stats.clear()
+
+    def percentile(self, step: str, q: float) -> int:
+        """Returns an upper bound of a percentile of the latency of a step, from its histogram
+
+        :param step: The step
+        :type step: str
+        :param q: The percentile, between 0 and 100
+        :type q: float
+        :return: The upper bound in nanoseconds, 0 if the step was never called
+        :rtype: int
+        """
+
+        count = self.counts.get(step, 0)
+        if not count:
+            return 0
+        target, seen = count * q / 100, 0
+        for i, hits in enumerate(self.histograms[step]):
+            seen += hits
+            if seen >= target and hits:
+                return min(1 << i, self.max_ns[step])
+        return self.max_ns[step]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the stats to a JSON serializable dictionary
+
+        The histograms are lists of [upper bound in ns, calls] of their non empty buckets.
+
+        :return: The stats
+        :rtype: Dict[str, Any]
+        """
+
+        with self._lock:
+            steps = {}
+            for step, count in self.counts.items():
+                steps[step] = {
+                    'count': count,
+                    'total_ns': self.total_ns[step],
+                    'mean_ns': self.total_ns[step] / count,
+                    'max_ns': self.max_ns[step],
+                    'histogram': [[1 << i, hits] for i, hits in enumerate(self.histograms[step]) if hits],
+                }
+            return {'steps': steps, 'branches': dict(self.branches)}
+
+    def to_json(self, **kwargs) -> str:
+        """Converts the stats to JSON
+
+        :param kwargs: The keyword arguments of json.dumps
+        :return: The stats as JSON
+        :rtype: str
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+# The stats of the running profiling and the original methods, None while disabled
+_STATS: Union[ZTStats, None] = None
+_ORIGINALS: List[Tuple[type, str, Callable]] = []
+
+
+def _timed(function: Callable, step: str, stats: ZTStats) -> Callable:
+    """Wraps a method of a step
+
+    :param function: The method
+    :type function: Callable
+    :param step: The step
+    :type step: str
+    :param stats: The stats recording the calls
+    :type stats: ZTStats
+    :return: The wrapped method
+    :rtype: Callable
+    """
+
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats._record(step, perf_counter_ns() - start)
+
+    timed.__wrapped__ = function
+    return timed
+
+
+def _timed_engine(function: Callable, engine: str, stats: ZTStats) -> Callable:
+    """Wraps a method choosing the engine moves, also counting the branches
+
+    :param function: The method
+    :type function: Callable
+    :param engine: The engine
+    :type engine: str
+    :param stats: The stats recording the calls
+    :type stats: ZTStats
+    :return: The wrapped method
+    :rtype: Callable
+    """
+
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        result = function(*args, **kwargs)
+        if isinstance(result, tuple):
+            branch = f'{engine}.{result[0]}'
+        else:
+            branch = engine if result is not None else f'{engine}.miss'
+        stats._record(engine, perf_counter_ns() - start, branch)
+        return result
+
+    timed.__wrapped__ = function
+    return timed
+
+
+def enable_profiling(stats: Union[ZTStats, None] = None) -> ZTStats:
+    """Starts profiling every game, the stats of the running profiling are kept if it is already enabled
+
+    :param stats: The stats to record into, new stats if None
+    :type stats: Union[ZTStats, None]
+    :return: The stats being recorded
+    :rtype: ZTStats
+    """
+
+    global _STATS
+    if _STATS is not None:
+        return _STATS
+
+    _STATS = ZTStats() if stats is None else stats
+    for wrapper, methods in ((_timed, _STEPS), (_timed_engine, _ENGINES)):
+        for step, cls, attribute in methods:
+            function = cls.__dict__[attribute]
+            _ORIGINALS.append((cls, attribute, function))
+            setattr(cls, attribute, wrapper(function, step, _STATS))
+    return _STATS
+
+
+def disable_profiling() -> Union[ZTStats, None]:
+    """Stops profiling and restores the uninstrumented methods
+
+    :return: The recorded stats, None if profiling was not enabled
+    :rtype: Union[ZTStats, None]
+    """
+
+    global _STATS
+    stats, _STATS = _STATS, None
+    while _ORIGINALS:
+        cls, attribute, function = _ORIGINALS.pop()
+        setattr(cls, attribute, function)
+    return stats
+
+
+def profiling_stats() -> Union[ZTStats, None]:
+    """Returns the stats of the running profiling
+
+    :return: The stats being recorded, None if profiling is disabled
+    :rtype: Union[ZTStats, None]
+    """
+    return _STATS
+
+
+@contextmanager
+def profiling(stats: Union[ZTStats, None] = None) -> Iterator[ZTStats]:
+    """Profiles the games played inside a with block
+
+    :param stats: The stats to record into, new stats if None
+    :type stats: Union[ZTStats, None]
+    :return: The stats being recorded
+    :rtype: Iterator[ZTStats]
+    """
+
+    enabled = _STATS is not None
+    stats = enable_profiling(stats)
+    try:
+        yield stats
+    finally:
+        if not enabled:
+            disable_profiling()
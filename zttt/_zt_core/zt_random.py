@@ -0,0 +1,118 @@
+"""
+Random streams
+---------------
+
+The generators the engines draw their random choices from.
+
+An engine given no generator draws from the module level generator of random, exactly as before.
+Given a seed or a ZTRandom, its games are reproducible and independent of every other game.
+A ZTRandom spawns child streams for parallel workers, derived from its seed by hashing
+so the streams are neither correlated nor depend on the draws made by the parent.
+A cloned game continues from a copy of the stream of its game, so playing either leaves the other alone.
+"""
+
+import os
+from random import Random, choice
+from typing import List, Union
+
+from ..zt_errors import ZTBadFunctionCall
+
+
+# The module level generator of random, random.choice is its bound method
+_GLOBAL_RNG: Random = choice.__self__
+
+
+class ZTRandom(Random):
+    """A seedable random stream which spawns independent child streams"""
+
+    def __init__(self, seed: Union[int, None] = None) -> None:
+        """Initialize the stream
+
+        :param seed: The seed, 128 bits from the OS if None
+        :type seed: Union[int, None]
+        :return: None
+        :raise: ZTBadFunctionCall if the seed is not an integer
+        """
+
+        if seed is None:
+            seed = int.from_bytes(os.urandom(16), 'little')
+        elif not isinstance(seed, int):
+            raise ZTBadFunctionCall(f"The seed must be an integer, not {type(seed).__name__}")
+
+        # The seed the child streams are derived from and the number spawned so far
+        self.entropy: int = seed
+        self.spawned: int = 0
+        super().__init__(seed)
+
+    def choice(self, seq):
+        """Chooses an element of a non empty sequence
+
+        The candidate lists of the engines hold at most 9 positions, so the index is scaled from a single
+        random() call instead of the rejection sampling of Random.choice
+
+        :param seq: The sequence
+        :return: An element
+        :raise: IndexError if the sequence is empty
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def spawn(self, n: int) -> List['ZTRandom']:
+        """Creates independent child streams
+
+        The i-th child ever spawned from a seed is always the same, whatever was drawn from the parent.
+
+        :param n: The number of streams
+        :type n: int
+        :return: The list of streams
+        :rtype: List[ZTRandom]
+        """
+
+        from hashlib import sha256
+
+        children = []
+        for index in range(self.spawned, self.spawned + n):
+            digest = sha256(f'{self.entropy}/{index}'.encode()).digest()
+            children.append(ZTRandom(int.from_bytes(digest, 'little')))
+        self.spawned += n
+        return children
+
+    # Pickling, the streams are sent to worker processes
+
+    def __reduce__(self):
+        return self.__class__, (self.entropy,), (self.getstate(), self.spawned)
+
+    def __setstate__(self, state) -> None:
+        self.setstate(state[0])
+        self.spawned = state[1]
+
+
+def _resolve_rng(rng: Union[Random, int, None]) -> Random:
+    """Returns the generator of an engine
+
+    :param rng: A generator, a seed of a new ZTRandom, or None for the module level generator of random
+    :type rng: Union[Random, int, None]
+    :return: The generator
+    :rtype: Random
+    :raise: ZTBadFunctionCall if rng is neither
+    """
+
+    if rng is None:
+        return _GLOBAL_RNG
+    if isinstance(rng, Random):
+        return rng
+    return ZTRandom(rng)
+
+
+def _clone_rng(rng: Random) -> Random:
+    """Returns the generator of a cloned engine
+
+    :param rng: The generator of the engine
+    :type rng: Random
+    :return: A copy of the generator in its current state, or the module level generator of random itself
+    :rtype: Random
+    """
+
+    if rng is _GLOBAL_RNG:
+        return rng
+    from copy import copy
+    return copy(rng)
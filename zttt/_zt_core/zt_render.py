@@ -0,0 +1,168 @@
+from typing import List, Tuple, Dict, Iterable, Any
+
+from ..zt_errors import ZTBadFunctionCall
+
+
+FORMATS = ('boxed', 'compact', 'json')
+
+_MAX_CACHED_BOARDS = 1 << 16  # The cache of the whole boards of a renderer is cleared when it grows past this
+
+
+class ZTRenderer:
+    """Renders boards of a shape with a set of indicators, caching the rendered rows and boards
+
+    The formats are
+
+    1. 'boxed': The classic multi-line ASCII board of ZTBaseBoard.board
+    2. 'compact': A single line with the rows of indicators separated by '|', like 'XO |   |  X'
+    3. 'json': A JSON array of the rows, each an array of indicators
+
+    A board is identified by the masks of the two players, so the renderer never looks at the board list.
+    """
+
+    __slots__ = ('indicators', 'rows', 'cols', '_row_cache', '_board_cache')
+
+    def __init__(self, indicators: Tuple[str, str, str], rows: int = 3, cols: int = 3) -> None:
+        """Initialize the renderer
+
+        :param indicators: The indicators of player 1, player 2 and the empty positions
+        :type indicators: Tuple[str, str, str]
+        :param rows: The number of rows
+        :type rows: int
+        :param cols: The number of columns
+        :type cols: int
+        :return: None
+        """
+
+        self.indicators: Tuple[str, str, str] = indicators
+        self.rows: int = rows
+        self.cols: int = cols
+
+        # Format -> (row mask of player 1, row mask of player 2) -> rendered row
+        self._row_cache: Dict[str, Dict[Tuple[int, int], str]] = {fmt: {} for fmt in FORMATS}
+        # Format -> (mask of player 1 | mask of player 2 << cells) -> rendered board
+        self._board_cache: Dict[str, Dict[int, str]] = {fmt: {} for fmt in FORMATS}
+
+    def __render_row(self, fmt: str, row1: int, row2: int) -> str:
+        """Renders a row
+
+        :param fmt: The format
+        :type fmt: str
+        :param row1: The mask of player 1 in the row
+        :type row1: int
+        :param row2: The mask of player 2 in the row
+        :type row2: int
+        :return: The rendered row
+        :rtype: str
+        """
+
+        player1, player2, space = self.indicators
+        cells = [player1 if row1 >> col & 1 else player2 if row2 >> col & 1 else space for col in range(self.cols)]
+        if fmt == 'boxed':
+            return (f"|{'|'.join(['     '] * self.cols)}|\n"
+                    f"|{'|'.join(f'  {cell}  ' for cell in cells)}|\n"
+                    f"|{'|'.join(['_____'] * self.cols)}|\n")
+        if fmt == 'compact':
+            return ''.join(cells)
+        # The rows are cached, so json is only imported when a board is first rendered to JSON
+        import json
+        return json.dumps(cells, separators=(',', ':'))
+
+    def render(self, mask1: int, mask2: int, fmt: str = 'boxed') -> str:
+        """Renders a board
+
+        :param mask1: The mask of the positions of player 1
+        :type mask1: int
+        :param mask2: The mask of the positions of player 2
+        :type mask2: int
+        :param fmt: The format, 'boxed', 'compact' or 'json'
+        :type fmt: str
+        :return: The rendered board
+        :rtype: str
+        :raise: ZTBadFunctionCall if the format is not known
+        """
+
+        try:
+            board_cache = self._board_cache[fmt]
+        except KeyError:
+            raise ZTBadFunctionCall(f"Unknown format {fmt!r}, the formats are {', '.join(FORMATS)}")
+
+        key = mask1 | mask2 << self.rows * self.cols
+        rendered = board_cache.get(key)
+        if rendered is not None:
+            return rendered
+
+        row_cache = self._row_cache[fmt]
+        cols, row_mask = self.cols, (1 << self.cols) - 1
+        rows = []
+        for i in range(self.rows):
+            row_key = (mask1 >> i * cols & row_mask, mask2 >> i * cols & row_mask)
+            row = row_cache.get(row_key)
+            if row is None:
+                row = row_cache[row_key] = self.__render_row(fmt, *row_key)
+            rows.append(row)
+
+        if fmt == 'boxed':
+            rendered = f" {' '.join(['_____'] * cols)}\n" + ''.join(rows)
+        elif fmt == 'compact':
+            rendered = '|'.join(rows)
+        else:
+            rendered = f"[{','.join(rows)}]"
+
+        if len(board_cache) >= _MAX_CACHED_BOARDS:
+            board_cache.clear()
+        board_cache[key] = rendered
+        return rendered
+
+
+# (indicators, rows, cols) -> renderer, shared by all the boards
+_RENDERERS: Dict[Tuple[Tuple[str, str, str], int, int], ZTRenderer] = {}
+
+
+def get_renderer(indicators: Tuple[str, str, str], rows: int = 3, cols: int = 3) -> ZTRenderer:
+    """Returns the shared renderer of a set of indicators and a shape
+
+    :param indicators: The indicators of player 1, player 2 and the empty positions
+    :type indicators: Tuple[str, str, str]
+    :param rows: The number of rows
+    :type rows: int
+    :param cols: The number of columns
+    :type cols: int
+    :return: The renderer
+    :rtype: ZTRenderer
+    """
+
+    key = (indicators, rows, cols)
+    renderer = _RENDERERS.get(key)
+    if renderer is None:
+        renderer = _RENDERERS[key] = ZTRenderer(indicators, rows, cols)
+    return renderer
+
+
+def render_boards(games: Iterable[Any], fmt: str = 'boxed', separator: str = '\n') -> str:
+    """Renders many games into a single string
+
+    :param games: The games
+    :type games: Iterable[ZTBaseBoard]
+    :param fmt: The format, 'boxed', 'compact' or 'json'
+    :type fmt: str
+    :param separator: The string between two rendered boards
+    :type separator: str
+    :return: The rendered boards
+    :rtype: str
+    :raise: ZTBadFunctionCall if the format is not known
+    """
+
+    if fmt not in FORMATS:
+        raise ZTBadFunctionCall(f"Unknown format {fmt!r}, the formats are {', '.join(FORMATS)}")
+
+    rendered: List[str] = []
+    renderer, renderer_of = None, None
+    for game in games:
+        # Consecutive games of the same class usually share the renderer
+        key = game._renderer_key()
+        if key != renderer_of:
+            renderer, renderer_of = get_renderer(*key), key
+        masks = game._masks
+        rendered.append(renderer.render(masks[1], masks[2], fmt))
+    return separator.join(rendered)
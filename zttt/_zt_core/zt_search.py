@@ -0,0 +1,511 @@
+from operator import itemgetter
+from random import Random
+from time import perf_counter
+from typing import List, Tuple, Dict, Union, NamedTuple
+
+from .zt_mnk_board import _MNKShape
+from .zt_mnk_engine import ZTMNKEngine, _process_pool
+from ..zt_errors import *
+
+
+# Scores of the search, from the point of view of the side to move
+_WIN = 1000000  # A win after p moves from the root scores _WIN - p
+_WIN_BOUND = _WIN - 1000  # Scores past the bound are wins or losses
+_TT_EXACT, _TT_LOWER, _TT_UPPER = 0, 1, 2
+_TT_MAX_ENTRIES = 1 << 20  # The table is cleared when it grows past this
+_TIME_CHECK_NODES = 8  # The clock is read once every this many nodes, and after every root move
+
+
+class SearchResult(NamedTuple):
+    """The result of a search"""
+
+    move: int
+    score: int  # For the side to move, past +-_WIN_BOUND for a forced win or loss
+    depth: int  # The deepest iteration completed
+    nodes: int
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out"""
+    pass
+
+
+class _SearchTables:
+    """The tables of the search for a shape, built once per (m, n, k) in every process"""
+
+    __slots__ = ('shape', 'windows', 'pos_windows', 'weights', 'zobrist', 'order')
+
+    # (m, n, k) -> tables
+    _CACHE: Dict[Tuple[int, int, int], '_SearchTables'] = {}
+
+    def __init__(self, shape: _MNKShape) -> None:
+        """Builds the tables
+
+        :param shape: The shape of the board
+        :type shape: _MNKShape
+        :return: None
+        """
+
+        self.shape: _MNKShape = shape
+        m, n, k = shape.m, shape.n, shape.k
+
+        # The masks of all the k long segments, the only places a line can be completed
+        windows = []
+        for row in range(m):
+            for col in range(n):
+                for dr, dc in _MNKShape._DIRECTIONS:
+                    end_row, end_col = row + dr * (k - 1), col + dc * (k - 1)
+                    if 0 <= end_row < m and 0 <= end_col < n:
+                        windows.append(sum(1 << (row + dr * i) * n + col + dc * i for i in range(k)))
+        self.windows: Tuple[int, ...] = tuple(windows)
+        self.pos_windows: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(window for window in windows if window >> pos & 1) for pos in range(shape.cells)
+        )
+
+        # The value of a window with i positions of a single player, 4 ** i for the open windows
+        self.weights: Tuple[int, ...] = (0,) + tuple(4 ** i for i in range(1, k + 1))
+
+        # The positions through the most windows first, the static move ordering
+        counts = [sum(1 for window in windows if window >> pos & 1) for pos in range(shape.cells)]
+        self.order: Tuple[int, ...] = tuple(sorted(range(shape.cells), key=lambda pos: -counts[pos]))
+
+        # The Zobrist keys of player 1 and player 2, seeded so that every process has the same keys
+        rng = Random(m * 10000 + n * 100 + k)
+        self.zobrist: Tuple[Tuple[int, ...], Tuple[int, ...]] = (
+            tuple(rng.getrandbits(64) for _ in range(shape.cells)),
+            tuple(rng.getrandbits(64) for _ in range(shape.cells)),
+        )
+
+    @classmethod
+    def get(cls, m: int, n: int, k: int) -> '_SearchTables':
+        """Returns the tables of a shape, building them on the first call
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :return: The tables
+        :rtype: _SearchTables
+        """
+
+        tables = cls._CACHE.get((m, n, k))
+        if tables is None:
+            tables = cls._CACHE[(m, n, k)] = _SearchTables(_MNKShape(m, n, k))
+        return tables
+
+
+class _Searcher:
+    """A negamax search with alpha-beta pruning and a transposition table over a pair of masks
+
+    The static evaluation is kept incrementally: every move adds its gain, computed from the windows
+    through it only, which also orders the moves and detects the wins.
+    """
+
+    __slots__ = ('tables', 'tt', 'nodes', 'deadline', 'best')
+
+    def __init__(self, tables: _SearchTables, deadline: Union[float, None]) -> None:
+        """Initializes the search
+
+        :param tables: The tables of the shape
+        :type tables: _SearchTables
+        :param deadline: The perf_counter time at which the search stops, never if None
+        :type deadline: Union[float, None]
+        :return: None
+        """
+
+        self.tables: _SearchTables = tables
+        # Position hash -> (depth, bound type, score, best move)
+        self.tt: Dict[int, Tuple[int, int, int, int]] = {}
+        self.nodes: int = 0
+        self.deadline: Union[float, None] = deadline
+        # The best (score, move) of the root moves completed by the running iteration
+        self.best: Union[Tuple[int, int], None] = None
+
+    def evaluate(self, side: int, other: int) -> int:
+        """The static evaluation, the weight of the positions taken in every window only one player has played in
+
+        :param side: The mask of the player to score for
+        :type side: int
+        :param other: The mask of the opponent
+        :type other: int
+        :return: The score for side
+        :rtype: int
+        """
+
+        weights = self.tables.weights
+        score = 0
+        for window in self.tables.windows:
+            if not window & other:
+                score += weights[bin(window & side).count('1')]
+            elif not window & side:
+                score -= weights[bin(window & other).count('1')]
+        return score
+
+    def _gains(self, side: int, other: int, empty: int, first: int) -> List[Tuple[int, int]]:
+        """Returns the moves of side with the change of the evaluation they make, best first
+
+        :param side: The mask of the side to move
+        :type side: int
+        :param other: The mask of the opponent
+        :type other: int
+        :param empty: The mask of the empty positions
+        :type empty: int
+        :param first: The move put first (the move of the transposition table), -1 if none
+        :type first: int
+        :return: List of (gain, move), _WIN as the gain of a winning move
+        :rtype: List[Tuple[int, int]]
+        """
+
+        tables = self.tables
+        weights, pos_windows, last = tables.weights, tables.pos_windows, tables.shape.k - 1
+        gains = []
+        for pos in tables.order:
+            if not empty >> pos & 1:
+                continue
+            gain = 0
+            for window in pos_windows[pos]:
+                if not window & other:
+                    count = bin(window & side).count('1')
+                    if count == last:
+                        gain = _WIN
+                        break
+                    gain += weights[count + 1] - weights[count]
+                elif not window & side:
+                    # The window of the opponent is blocked
+                    gain += weights[bin(window & other).count('1')]
+            gains.append((gain, pos))
+        gains.sort(key=itemgetter(0), reverse=True)
+
+        if first >= 0:
+            for i in range(1, len(gains)):
+                if gains[i][1] == first:
+                    gains.insert(0, gains.pop(i))
+                    break
+        return gains
+
+    def negamax(self, side: int, other: int, static: int, key: int, zobrist_side: Tuple[int, ...],
+                zobrist_other: Tuple[int, ...], depth: int, alpha: int, beta: int, ply: int) -> int:
+        """Searches the position where side is to move
+
+        :param side: The mask of the side to move
+        :type side: int
+        :param other: The mask of the opponent, who just moved without winning
+        :type other: int
+        :param static: The static evaluation for the side to move
+        :type static: int
+        :param key: The Zobrist hash of the position
+        :type key: int
+        :param zobrist_side: The Zobrist keys of the side to move
+        :type zobrist_side: Tuple[int, ...]
+        :param zobrist_other: The Zobrist keys of the opponent
+        :type zobrist_other: Tuple[int, ...]
+        :param depth: The remaining depth, at least 1
+        :type depth: int
+        :param alpha: The lower bound of the window
+        :type alpha: int
+        :param beta: The upper bound of the window
+        :type beta: int
+        :param ply: The number of moves from the root
+        :type ply: int
+        :return: The score for the side to move
+        :rtype: int
+        :raise: _SearchTimeout if the deadline passes
+        """
+
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % _TIME_CHECK_NODES == 0 and perf_counter() > self.deadline:
+            raise _SearchTimeout
+
+        alpha_start = alpha
+        first = -1
+        entry = self.tt.get(key)
+        if entry is not None:
+            entry_depth, bound, score, first = entry
+            # Win scores are stored relative to the position
+            if score > _WIN_BOUND:
+                score -= ply
+            elif score < -_WIN_BOUND:
+                score += ply
+            if entry_depth >= depth:
+                if bound == _TT_EXACT:
+                    return score
+                if bound == _TT_LOWER and score >= beta:
+                    return score
+                if bound == _TT_UPPER and score <= alpha:
+                    return score
+
+        empty = self.tables.shape.full_mask & ~(side | other)
+        best_score, best_move = -_WIN, -1
+        for gain, pos in self._gains(side, other, empty, first):
+            bit = 1 << pos
+            if gain == _WIN:
+                score = _WIN - ply - 1
+            elif empty == bit:
+                score = 0  # The board is full
+            elif depth == 1:
+                score = static + gain
+            else:
+                score = -self.negamax(other, side | bit, -static - gain, key ^ zobrist_side[pos],
+                                      zobrist_other, zobrist_side, depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best_move = score, pos
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if len(self.tt) >= _TT_MAX_ENTRIES:
+            self.tt.clear()
+        stored = best_score + ply if best_score > _WIN_BOUND else best_score - ply if best_score < -_WIN_BOUND \
+            else best_score
+        bound = _TT_UPPER if best_score <= alpha_start else _TT_LOWER if best_score >= beta else _TT_EXACT
+        self.tt[key] = (depth, bound, stored, best_move)
+        return best_score
+
+    def root(self, side: int, other: int, key: int, zobrist_side: Tuple[int, ...],
+             zobrist_other: Tuple[int, ...], moves: List[int], depth: int) -> Tuple[int, int]:
+        """Searches the root moves to a depth
+
+        :param side: The mask of the side to move
+        :type side: int
+        :param other: The mask of the opponent
+        :type other: int
+        :param key: The Zobrist hash of the position
+        :type key: int
+        :param zobrist_side: The Zobrist keys of the side to move
+        :type zobrist_side: Tuple[int, ...]
+        :param zobrist_other: The Zobrist keys of the opponent
+        :type zobrist_other: Tuple[int, ...]
+        :param moves: The root moves, searched in order
+        :type moves: List[int]
+        :param depth: The depth, at least 1
+        :type depth: int
+        :return: The best score and move
+        :rtype: Tuple[int, int]
+        :raise: _SearchTimeout if the deadline passes, the root moves completed are kept in best
+        """
+
+        empty = self.tables.shape.full_mask & ~(side | other)
+        static = self.evaluate(side, other)
+        gains = dict((pos, gain) for gain, pos in self._gains(side, other, empty, -1))
+        alpha, best_move = -_WIN - 1, moves[0]
+        self.best = None
+        for pos in moves:
+            bit = 1 << pos
+            gain = gains[pos]
+            if gain == _WIN:
+                score = _WIN - 1
+            elif empty == bit:
+                score = 0
+            elif depth == 1:
+                score = static + gain
+            else:
+                score = -self.negamax(other, side | bit, -static - gain, key ^ zobrist_side[pos], zobrist_other,
+                                      zobrist_side, depth - 1, -_WIN - 1, -alpha, 1)
+            if score > alpha:
+                alpha, best_move = score, pos
+            self.best = (alpha, best_move)
+            if self.deadline is not None and perf_counter() > self.deadline:
+                raise _SearchTimeout
+        return alpha, best_move
+
+
+def _iterative_deepening(m: int, n: int, k: int, side: int, other: int, side_player: int,
+                         moves: Union[List[int], None], time_limit: Union[float, None],
+                         max_depth: Union[int, None]) -> List[Tuple[int, int, int, int]]:
+    """Searches deeper and deeper until the time runs out, a forced result is found or the board is full
+
+    The deadline holds from the start. Only the first root move of the first iteration is always searched,
+    the root moves are ordered by their gain so that it is the best move at depth 1.
+    The function is picklable for the process pool.
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param side: The mask of the side to move
+    :type side: int
+    :param other: The mask of the opponent
+    :type other: int
+    :param side_player: The player number (1 or 2) of the side to move
+    :type side_player: int
+    :param moves: The root moves to search, all the empty positions if None
+    :type moves: Union[List[int], None]
+    :param time_limit: The seconds to search for, no limit if None
+    :type time_limit: Union[float, None]
+    :param max_depth: The deepest iteration, up to the number of empty positions if None
+    :type max_depth: Union[int, None]
+    :return: (depth, score, move, nodes) of every completed iteration
+    :rtype: List[Tuple[int, int, int, int]]
+    """
+
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    tables = _SearchTables.get(m, n, k)
+    searcher = _Searcher(tables, deadline)
+
+    zobrist_side, zobrist_other = tables.zobrist if side_player == 1 else tables.zobrist[::-1]
+    key = 0
+    for pos in range(tables.shape.cells):
+        if side >> pos & 1:
+            key ^= zobrist_side[pos]
+        elif other >> pos & 1:
+            key ^= zobrist_other[pos]
+
+    empty = tables.shape.full_mask & ~(side | other)
+    if moves is None:
+        moves = [pos for pos in tables.order if empty >> pos & 1]
+    else:
+        moves = list(moves)
+    gains = dict((pos, gain) for gain, pos in searcher._gains(side, other, empty, -1))
+    moves.sort(key=lambda pos: -gains[pos])
+    depth_limit = bin(empty).count('1')
+    if max_depth is not None:
+        depth_limit = min(depth_limit, max_depth)
+
+    results = []
+    for depth in range(1, depth_limit + 1):
+        try:
+            score, move = searcher.root(side, other, key, zobrist_side, zobrist_other, moves, depth)
+        except _SearchTimeout:
+            # The first iteration gives the best of the root moves it completed
+            if not results and searcher.best is not None:
+                results.append((depth,) + searcher.best + (searcher.nodes,))
+            break
+        results.append((depth, score, move, searcher.nodes))
+        if abs(score) > _WIN_BOUND:
+            break
+        # The best move is searched first in the next iteration
+        moves.remove(move)
+        moves.insert(0, move)
+    return results
+
+
+def search_move(m: int, n: int, k: int, side: int, other: int, side_player: int,
+                time_limit: Union[float, None] = 1.0, max_depth: Union[int, None] = None,
+                workers: Union[int, None] = None) -> SearchResult:
+    """Finds the best move of a position by an iterative deepening alpha-beta search
+
+    With workers, the root moves are split between that many processes, each searching its share
+    with its own transposition table, and the best move of the deepest iteration completed by all of
+    them is played.
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param side: The mask of the side to move
+    :type side: int
+    :param other: The mask of the opponent
+    :type other: int
+    :param side_player: The player number (1 or 2) of the side to move
+    :type side_player: int
+    :param time_limit: The seconds to search for, no limit if None
+    :type time_limit: Union[float, None]
+    :param max_depth: The deepest iteration, up to the number of empty positions if None
+    :type max_depth: Union[int, None]
+    :param workers: The number of processes to split the root moves between, the search runs in this process if None
+    :type workers: Union[int, None]
+    :return: The result of the search
+    :rtype: SearchResult
+    :raise: ZTGameException if there is no empty position
+    """
+
+    tables = _SearchTables.get(m, n, k)
+    empty = tables.shape.full_mask & ~(side | other)
+    if not empty:
+        raise ZTGameException("There is no move to search")
+
+    if workers is None or workers < 2:
+        results = _iterative_deepening(m, n, k, side, other, side_player, None, time_limit, max_depth)
+        depth, score, move, nodes = results[-1]
+        return SearchResult(move, score, depth, nodes)
+
+    moves = [pos for pos in tables.order if empty >> pos & 1]
+    shares = [moves[i::workers] for i in range(workers) if moves[i::workers]]
+    pool = _process_pool(workers)
+    futures = [pool.submit(_iterative_deepening, m, n, k, side, other, side_player, share, time_limit, max_depth)
+               for share in shares]
+    all_results = [future.result() for future in futures]
+
+    # A forced win found by any share at any depth is played, otherwise the deepest common iteration decides
+    nodes = sum(results[-1][3] for results in all_results)
+    wins = [results[-1] for results in all_results if results[-1][1] > _WIN_BOUND]
+    if wins:
+        depth, score, move, _ = max(wins, key=lambda result: result[1])
+        return SearchResult(move, score, depth, nodes)
+    depth = min(len(results) for results in all_results)
+    _, score, move, _ = max((results[depth - 1] for results in all_results), key=lambda result: result[1])
+    return SearchResult(move, score, depth, nodes)
+
+
+class ZTSearchEngine(ZTMNKEngine):
+    """Class for the Search Engine
+
+    The engine plays on any m, n, k board, choosing its moves by search_move within a time budget per move
+    """
+
+    __slots__ = ('time_limit', 'max_depth', 'workers', 'last_search')
+
+    def __init__(self, m: int, n: int, k: int, _engine_first: bool, time_limit: Union[float, None] = 1.0,
+                 max_depth: Union[int, None] = None, workers: Union[int, None] = None) -> None:
+        """Initialize the State Variables
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :param _engine_first: Specifies if the engine starts first
+        :type _engine_first: bool
+        :param time_limit: The seconds the engine searches for per move, no limit if None
+        :type time_limit: Union[float, None]
+        :param max_depth: The deepest iteration of the search, no limit if None
+        :type max_depth: Union[int, None]
+        :param workers: The number of processes the search is split between, a single process if None
+        :type workers: Union[int, None]
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid
+        """
+
+        self.time_limit: Union[float, None] = time_limit
+        self.max_depth: Union[int, None] = max_depth
+        self.workers: Union[int, None] = workers
+
+        # The result of the last search, None before the first engine move
+        self.last_search: Union[SearchResult, None] = None
+
+        ZTMNKEngine.__init__(self, m, n, k, _engine_first)
+
+    def _engine_move(self) -> int:
+        """Searches the current position for the side to move
+
+        :return: The move to play
+        :rtype: int
+        """
+
+        turn = self.turn
+        m, n, k = self.dimensions
+        self.last_search = search_move(m, n, k, self._masks[turn], self._masks[3 - turn], turn,
+                                       self.time_limit, self.max_depth, self.workers)
+        return self.last_search.move
+
+    def _clone_into(self, game: 'ZTSearchEngine') -> None:
+        """Copies the state of the engine into a new object
+
+        :param game: The new object
+        :type game: ZTSearchEngine
+        :return: None
+        """
+
+        super()._clone_into(game)
+        game.time_limit = self.time_limit
+        game.max_depth = self.max_depth
+        game.workers = self.workers
+        game.last_search = self.last_search
@@ -0,0 +1,191 @@
+from array import array
+from typing import List, Tuple, Union
+from random import Random
+
+from .zt_base_board import ZTBaseBoard
+from .zt_base_engine import ZTBaseEngine
+
+
+def _ternary_keys() -> Tuple[int, ...]:
+    """Computes the ternary keys of the 9-bit masks, each from the key of the mask without its lowest bit
+
+    :return: The ternary key of every 9-bit mask played by player 1
+    :rtype: Tuple[int, ...]
+    """
+
+    keys = [0] * (1 << 9)
+    for mask in range(1, 1 << 9):
+        low = mask & -mask
+        keys[mask] = keys[mask ^ low] + 3 ** (low.bit_length() - 1)
+    return tuple(keys)
+
+
+# Every position is indexed by its ternary key, sum of 3 ** pos for player 1 and 2 * 3 ** pos for player 2
+# _TERNARY[mask] is the ternary key of a 9-bit mask played by player 1
+_TERNARY: Tuple[int, ...] = _ternary_keys()
+
+# Layout of an entry of the solver table
+_MOVES_MASK = 0x1FF  # Bits 0 - 8: The mask of the optimal moves
+_VALUE_SHIFT = 9  # Bits 9 - 10: The minimax value + 1 for the side to move (0 loss, 1 draw, 2 win)
+_REACHABLE = 1 << 15  # Set for every position that can be reached in a game
+
+# Built on the first use by _solver_table
+_TABLE: array = None
+
+
+def _is_win(mask: int) -> bool:
+    """Checks if the mask contains a complete line
+
+    :param mask: The 9-bit mask of a player
+    :type mask: int
+    :return: True if the mask contains a line, False otherwise
+    :rtype: bool
+    """
+
+    for line_mask in ZTBaseBoard._LINE_MASKS:
+        if mask & line_mask == line_mask:
+            return True
+    return False
+
+
+def _build_table() -> array:
+    """Solves every reachable position by a memoized minimax search
+
+    Wins are preferred sooner and losses later, so the optimal moves are the ones reaching the best
+    score where a win scores 10 - (moves played) for the winner.
+
+    :return: The solver table indexed by the ternary key of the position
+    :rtype: array
+    """
+
+    table = array('H', bytes(2 * 3 ** 9))
+    scores = {}
+
+    def solve(side: int, other: int, key: int, moves: int) -> int:
+        # side is the mask of the player to move, other is the mask of the player who just moved
+        if key in scores:
+            return scores[key]
+
+        if _is_win(other):
+            score = moves - 10
+            table[key] = _REACHABLE | 0 << _VALUE_SHIFT
+        elif moves == 9:
+            score = 0
+            table[key] = _REACHABLE | 1 << _VALUE_SHIFT
+        else:
+            # The ternary weight of the side to move, player 1 moves on even counts
+            weight = 1 if moves % 2 == 0 else 2
+            score = -10
+            best = 0
+            empty = ZTBaseBoard._FULL_MASK & ~(side | other)
+            for pos in ZTBaseBoard._MASK_POSITIONS[empty]:
+                child = -solve(other, side | 1 << pos, key + weight * 3 ** pos, moves + 1)
+                if child > score:
+                    score, best = child, 1 << pos
+                elif child == score:
+                    best |= 1 << pos
+            value = 2 if score > 0 else 1 if score == 0 else 0
+            table[key] = _REACHABLE | value << _VALUE_SHIFT | best
+
+        scores[key] = score
+        return score
+
+    solve(0, 0, 0, 0)
+    return table
+
+
+def _solver_table() -> array:
+    """Returns the solver table, building it on the first call
+
+    :return: The solver table indexed by the ternary key of the position
+    :rtype: array
+    """
+
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = _build_table()
+    return _TABLE
+
+
+def solver_lookup(mask1: int, mask2: int) -> Tuple[int, List[int]]:
+    """Looks up the minimax value and the optimal moves of a position
+
+    :param mask1: The 9-bit mask of the positions played by player 1
+    :type mask1: int
+    :param mask2: The 9-bit mask of the positions played by player 2
+    :type mask2: int
+    :return: The value for the side to move (1 win, 0 draw, -1 loss) and the list of optimal moves
+    :rtype: Tuple[int, List[int]]
+    :raise: KeyError if the position can not be reached in a game
+    """
+
+    entry = _solver_table()[_TERNARY[mask1] + 2 * _TERNARY[mask2]]
+    if not entry & _REACHABLE:
+        raise KeyError("The position can not be reached in a game")
+    return (entry >> _VALUE_SHIFT & 3) - 1, list(ZTBaseBoard._MASK_POSITIONS[entry & _MOVES_MASK])
+
+
+class ZTSolver(ZTBaseEngine):
+    """Class for the Solver
+
+    The class plays perfectly using a precomputed table of every reachable position
+    """
+
+    __slots__ = ()
+
+    def __init__(self, _engine_first: bool, rng: Union[Random, int, None] = None) -> None:
+        """Initialize the State Variables
+
+        :param _engine_first: Specifies if the engine starts first
+        :type _engine_first: bool
+        :param rng: The generator of the random choices (see ZTBaseEngine)
+        :type rng: Union[Random, int, None]
+        :return: None
+        """
+
+        ZTBaseEngine.__init__(self, _engine_first, rng)
+        if _engine_first:
+            self._play_engine(self.__get_solver_move())
+
+    @property
+    def optimal_moves(self) -> List[int]:
+        """The optimal moves for the side to move, empty list if the game is over
+
+        :return: List of the optimal moves
+        :rtype: List[int]
+        """
+        return solver_lookup(self._masks[1], self._masks[2])[1]
+
+    @property
+    def position_value(self) -> int:
+        """The minimax value of the position for the side to move
+
+        :return: 1 if the side to move wins with perfect play, 0 if it is a draw, -1 if it loses
+        :rtype: int
+        """
+        return solver_lookup(self._masks[1], self._masks[2])[0]
+
+    def __get_solver_move(self) -> int:
+        """Returns one of the optimal moves of the current position
+
+        :return: The move to play
+        :rtype: int
+        """
+
+        entry = _solver_table()[_TERNARY[self._masks[1]] + 2 * _TERNARY[self._masks[2]]]
+        return self._rng.choice(self._MASK_POSITIONS[entry & _MOVES_MASK])
+
+    def play(self, pos: int) -> None:
+        """Plays the player's move at the position specified
+
+        :param pos: The position to play the player's move
+        :type pos: int
+        :return: None
+        :raise: ZTGameException if the game is not in progress
+        :raise: ZTInvalidInput if the move is invalid
+        """
+
+        self._play_player(pos)
+
+        if self.status:
+            self._play_engine(self.__get_solver_move())
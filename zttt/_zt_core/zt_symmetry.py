@@ -0,0 +1,157 @@
+"""
+Symmetries of the board
+-------------------------
+
+The 8 rotations and reflections of the square (the dihedral group D4) acting on the positions.
+A transform is an index into _TRANSFORMS, where _TRANSFORMS[t][pos] is the position pos is moved to.
+"""
+
+from typing import List, Tuple
+
+
+def _compose(first: Tuple[int, ...], second: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Returns the permutation which applies first and then second
+
+    :param first: The permutation applied first
+    :type first: Tuple[int, ...]
+    :param second: The permutation applied second
+    :type second: Tuple[int, ...]
+    :return: The composed permutation
+    :rtype: Tuple[int, ...]
+    """
+    return tuple(second[first[pos]] for pos in range(9))
+
+
+_IDENTITY = (0, 1, 2, 3, 4, 5, 6, 7, 8)
+_ROTATE = (2, 5, 8, 1, 4, 7, 0, 3, 6)  # Rotation by 90 degrees clockwise, (r, c) -> (c, 2 - r)
+_REFLECT = (2, 1, 0, 5, 4, 3, 8, 7, 6)  # Reflection about the middle column, (r, c) -> (r, 2 - c)
+
+# Transforms 0 - 3 are the rotations by 0, 90, 180 and 270 degrees
+# Transforms 4 - 7 are the reflection about the middle column followed by the same rotations
+_TRANSFORMS: Tuple[Tuple[int, ...], ...] = (
+    _IDENTITY,
+    _ROTATE,
+    _compose(_ROTATE, _ROTATE),
+    _compose(_compose(_ROTATE, _ROTATE), _ROTATE),
+    _REFLECT,
+    _compose(_REFLECT, _ROTATE),
+    _compose(_REFLECT, _compose(_ROTATE, _ROTATE)),
+    _compose(_REFLECT, _compose(_compose(_ROTATE, _ROTATE), _ROTATE)),
+)
+
+# _INVERSE[t] is the transform undoing t
+_INVERSE: Tuple[int, ...] = tuple(
+    next(u for u in range(8) if _compose(_TRANSFORMS[t], _TRANSFORMS[u]) == _IDENTITY) for t in range(8)
+)
+
+# _MASK_TRANSFORMS[t][mask] is the 9-bit mask transformed by t, built on the first use by _mask_transforms
+_MASK_TRANSFORMS: Tuple[Tuple[int, ...], ...] = None
+
+
+def _mask_transforms() -> Tuple[Tuple[int, ...], ...]:
+    """Returns the mask transforms, building them on the first call
+
+    :return: The mask transforms, _MASK_TRANSFORMS[t][mask] is the 9-bit mask transformed by t
+    :rtype: Tuple[Tuple[int, ...], ...]
+    """
+
+    global _MASK_TRANSFORMS
+    if _MASK_TRANSFORMS is None:
+        _MASK_TRANSFORMS = tuple(
+            tuple(sum(1 << perm[pos] for pos in range(9) if mask >> pos & 1) for mask in range(1 << 9))
+            for perm in _TRANSFORMS
+        )
+    return _MASK_TRANSFORMS
+
+
+def transform_pos(pos: int, transform: int) -> int:
+    """Maps a position of the original board to the transformed board
+
+    :param pos: The position on the original board
+    :type pos: int
+    :param transform: The transform (0 - 7)
+    :type transform: int
+    :return: The position on the transformed board
+    :rtype: int
+    """
+    return _TRANSFORMS[transform][pos]
+
+
+def inverse_transform_pos(pos: int, transform: int) -> int:
+    """Maps a position of the transformed board back to the original board
+
+    :param pos: The position on the transformed board
+    :type pos: int
+    :param transform: The transform (0 - 7) which produced the transformed board
+    :type transform: int
+    :return: The position on the original board
+    :rtype: int
+    """
+    return _TRANSFORMS[_INVERSE[transform]][pos]
+
+
+def transform_board(board_list: List[int], transform: int) -> List[int]:
+    """Applies a transform to a board list
+
+    :param board_list: The board list (Row Major Order)
+    :type board_list: List[int]
+    :param transform: The transform (0 - 7)
+    :type transform: int
+    :return: The transformed board list
+    :rtype: List[int]
+    """
+
+    perm = _TRANSFORMS[transform]
+    new_board_list = [0] * 9
+    for pos in range(9):
+        new_board_list[perm[pos]] = board_list[pos]
+    return new_board_list
+
+
+def canonical_masks(mask1: int, mask2: int) -> Tuple[int, int, int]:
+    """Returns the canonical form of a position given by the masks of the two players
+
+    The canonical form is the image with the smallest (mask1 << 9 | mask2) among the 8 transforms.
+
+    :param mask1: The 9-bit mask of the positions played by player 1
+    :type mask1: int
+    :param mask2: The 9-bit mask of the positions played by player 2
+    :type mask2: int
+    :return: The canonical masks of player 1 and player 2 and the transform used
+    :rtype: Tuple[int, int, int]
+    """
+
+    mask_transforms = _mask_transforms()
+    best_key = 1 << 18
+    best_transform = 0
+    for transform in range(8):
+        table = mask_transforms[transform]
+        key = table[mask1] << 9 | table[mask2]
+        if key < best_key:
+            best_key, best_transform = key, transform
+    return best_key >> 9, best_key & 0x1FF, best_transform
+
+
+def canonicalize(board_list: List[int]) -> Tuple[List[int], int]:
+    """Returns the canonical form of a board list
+
+    A move computed on the canonical board is mapped back with inverse_transform_pos.
+
+    :param board_list: The board list (Row Major Order)
+    :type board_list: List[int]
+    :return: The canonical board list and the transform used
+    :rtype: Tuple[List[int], int]
+    """
+
+    # Any two distinct non-empty values work as the two players
+    high = max(board_list)
+    mask1 = mask2 = 0
+    for pos in range(9):
+        if board_list[pos]:
+            if board_list[pos] == high:
+                mask1 |= 1 << pos
+            else:
+                mask2 |= 1 << pos
+
+    transform = canonical_masks(mask1, mask2)[2]
+    return transform_board(board_list, transform), transform
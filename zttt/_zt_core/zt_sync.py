@@ -0,0 +1,145 @@
+"""
+Per-game locking
+-----------------
+
+The locking mode of the games, turned on per game by ZTBaseBoard.set_locking.
+
+A locking game is moved to a subclass of its class whose public methods and derived properties
+hold the reentrant lock of the game, so the games which do not lock run exactly the unlocked methods.
+
+1. Every call of play, undo, redo, replay, clone and render is atomic, including the engine's reply
+2. The properties copying or deriving from the state (board_list, history, empty_positions, board, ...)
+   never see a move half played
+3. Several calls are atomic together inside a with game.lock block, the lock is reentrant
+
+A locking game is pickled (and copied) as a game of its original class, without the lock,
+and locks again once loaded.
+"""
+
+from functools import wraps
+from threading import Lock, RLock
+from typing import List, Dict, Tuple, Callable, Any
+
+# The public methods and the properties computed from more than one field of the state
+_METHODS = ('play', 'undo', 'redo', 'replay', 'clone', 'render')
+_PROPERTIES = (
+    'board_list', 'history', 'highlighted', 'board', 'canonical', 'indicators',
+    'empty_positions', 'empty_corners', 'empty_edges', 'optimal_moves', 'position_value'
+)
+
+# Class -> its locking subclass, built on first use
+_LOCKING_CLASSES: Dict[type, type] = {}
+_CLASSES_LOCK = Lock()
+
+
+def _locked(function: Callable) -> Callable:
+    """Wraps a method to run under the lock of the game
+
+    :param function: The method
+    :type function: Callable
+    :return: The wrapped method
+    :rtype: Callable
+    """
+
+    @wraps(function)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return function(self, *args, **kwargs)
+
+    return locked
+
+
+def _slot_names(cls: type) -> List[str]:
+    """Returns the names of the slots of a class and its bases, the private names mangled
+
+    :param cls: The class
+    :type cls: type
+    :return: The names of the slots
+    :rtype: List[str]
+    """
+
+    names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name.startswith('__') and not name.endswith('__'):
+                name = f"_{base.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return names
+
+
+def _restore_locking(cls: type, state: Dict[str, Any]) -> Any:
+    """Rebuilds a pickled locking game
+
+    :param cls: The original class of the game
+    :type cls: type
+    :param state: The slots of the game, without the lock
+    :type state: Dict[str, Any]
+    :return: The game, locking with a new lock
+    """
+
+    game = cls.__new__(cls)
+    for name, value in state.items():
+        setattr(game, name, value)
+    game._lock = None
+    game.set_locking()
+    return game
+
+
+def _reduce_locking(self, protocol: int) -> Tuple[Callable, Tuple[type, Dict[str, Any]]]:
+    """Pickles a locking game as a game of its original class, the lock is left out
+
+    :param protocol: The pickle protocol
+    :type protocol: int
+    :return: The function rebuilding the game and its arguments
+    :rtype: Tuple[Callable, Tuple[type, Dict[str, Any]]]
+    """
+
+    with self._lock:
+        state = {}
+        for name in _slot_names(self._unlocked_class):
+            if name != '_lock' and hasattr(self, name):
+                value = getattr(self, name)
+                # The lists of the state may change once the lock is released
+                state[name] = value[:] if isinstance(value, list) else value
+    return _restore_locking, (self._unlocked_class, state)
+
+
+def _locking_class(cls: type) -> type:
+    """Returns the locking subclass of a game class, with the same name and no new slots
+
+    :param cls: The game class
+    :type cls: type
+    :return: The locking subclass
+    :rtype: type
+    """
+
+    locking = _LOCKING_CLASSES.get(cls)
+    if locking is not None:
+        return locking
+
+    with _CLASSES_LOCK:
+        if cls in _LOCKING_CLASSES:
+            return _LOCKING_CLASSES[cls]
+
+        namespace = {'__slots__': (), '__module__': cls.__module__, '__qualname__': cls.__qualname__,
+                     '__doc__': cls.__doc__, '_unlocked_class': cls, '__reduce_ex__': _reduce_locking}
+        for name in _METHODS:
+            if hasattr(cls, name):
+                namespace[name] = _locked(getattr(cls, name))
+        for name in _PROPERTIES:
+            prop = getattr(cls, name, None)
+            if isinstance(prop, property):
+                namespace[name] = property(_locked(prop.fget), prop.fset and _locked(prop.fset), doc=prop.__doc__)
+
+        locking = _LOCKING_CLASSES[cls] = type(cls.__name__, (cls,), namespace)
+        return locking
+
+
+def _new_lock() -> RLock:
+    """Returns a new lock for a game
+
+    :return: The reentrant lock
+    :rtype: RLock
+    """
+    return RLock()
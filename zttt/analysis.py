@@ -0,0 +1,448 @@
+"""
+Module zttt.analysis
+======================
+
+A streaming pipeline analysing game records without building any game objects.
+
+The histories are consumed lazily, from any iterable, a text file or a game log (see zttt.gamelog),
+and every game is replayed on a pair of 9-bit masks. For every game the pipeline yields its winner,
+its length, the highlighted positions (as ZTBaseBoard.highlighted) and, when the engine's side is
+known, the engine moves which lost value according to the solver table (a won position no longer won,
+or a drawn position lost).
+
+1. analyse: Yields a GameAnalysis per game, in order
+2. summarise: Aggregates the games chunk by chunk into an AnalysisSummary
+
+Both take workers to fan the chunks out to a process pool, with a bounded number of chunks in flight,
+so the memory stays constant whatever the number of games.
+
+Usage: python -m zttt.analysis games.txt --engine 1 --workers 8
+"""
+
+import json
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Tuple, Dict, Iterable, Iterator, Sequence, Callable, Union, Any, NamedTuple, IO
+
+from ._zt_core import ZTBaseBoard
+from ._zt_core.zt_solver import _solver_table, _VALUE_SHIFT
+from .gamelog import GameLog, _HISTORY_MASK, _FLAGS_SHIFT, _LENGTH_SHIFT
+from .snapshot import _PVC, _ENGINE_FIRST
+from .zt_errors import ZTBadFunctionCall, ZTInvalidInput, ZTGameException
+
+
+History = Sequence[int]
+
+# (history, the player number of the engine or None), the unit of work of the pipeline
+_Game = Tuple[History, Union[int, None]]
+
+_POWERS = tuple(3 ** pos for pos in range(9))
+
+
+class GameAnalysis(NamedTuple):
+    """The analysis of a game"""
+
+    winner: Union[int, None]  # 0 is a draw, None if the game is not over
+    length: int
+    highlighted: Tuple[int, ...]  # Empty if there is no winner
+    deviations: Union[int, None]  # The engine moves which lost value, None if the engine is not known
+    first_deviation: Union[int, None]  # The index in the history of the first such move, None if none
+
+
+def _check_engine(engine: Union[int, None]) -> None:
+    """Checks the player number of the engine
+
+    :param engine: The player number of the engine, None if not known
+    :type engine: Union[int, None]
+    :return: None
+    :raise: ZTBadFunctionCall if the engine is neither 1, 2 nor None
+    """
+
+    if engine is not None and engine not in (1, 2):
+        raise ZTBadFunctionCall(f"The engine must be player 1 or 2 or None, not {engine!r}")
+
+
+def analyse_history(history: History, engine: Union[int, None] = None) -> GameAnalysis:
+    """Analyses a single game
+
+    :param history: The moves of the game
+    :type history: History
+    :param engine: The player number (1 or 2) of the engine whose moves are checked, no check if None
+    :type engine: Union[int, None]
+    :return: The analysis
+    :rtype: GameAnalysis
+    :raise: ZTBadFunctionCall if the engine is neither 1, 2 nor None
+    :raise: ZTInvalidInput if a move is not valid
+    :raise: ZTGameException if a move is played after the game is over
+    """
+
+    _check_engine(engine)
+    masks = [0, 0, 0]
+    empty = ZTBaseBoard._FULL_MASK
+    pos_line_masks = ZTBaseBoard._POS_LINE_MASKS
+    table = _solver_table() if engine else None
+    key = 0
+    winner = None
+    highlighted = ()
+    deviations = 0 if engine else None
+    first_deviation = None
+
+    for i, pos in enumerate(history):
+        if winner is not None:
+            raise ZTGameException(f"Move {i} is played after the game is over")
+        if not 0 <= pos < 9 or not empty >> pos & 1:
+            raise ZTInvalidInput(f"Invalid position {pos} at move {i}")
+
+        player = 1 if i % 2 == 0 else 2
+        child = key + player * _POWERS[pos]
+        # The value of the position for the side to move is the negated value of the child for the opponent
+        if player == engine and table[child] >> _VALUE_SHIFT & 3 != 2 - (table[key] >> _VALUE_SHIFT & 3):
+            deviations += 1
+            if first_deviation is None:
+                first_deviation = i
+
+        bit = 1 << pos
+        mask = masks[player] = masks[player] | bit
+        empty ^= bit
+        key = child
+
+        if i >= 4:
+            winning = None
+            for line_mask, line in pos_line_masks[pos]:
+                if mask & line_mask == line_mask:
+                    winning = [pos] if winning is None else winning
+                    winning.extend(line)
+            if winning is not None:
+                winner, highlighted = player, tuple(winning)
+            elif i == 8:
+                winner = 0
+
+    return GameAnalysis(winner, len(history), highlighted, deviations, first_deviation)
+
+
+def _analyse_chunk(games: List[_Game]) -> List[GameAnalysis]:
+    """Analyses a chunk of games, picklable for the process pool
+
+    :param games: The games
+    :type games: List[_Game]
+    :return: The analyses
+    :rtype: List[GameAnalysis]
+    """
+    return [analyse_history(history, engine) for history, engine in games]
+
+
+class AnalysisSummary:
+    """The aggregated analysis of many games"""
+
+    def __init__(self) -> None:
+        """Initialize the empty summary"""
+
+        self.games: int = 0
+        # Winner (0 is a draw, 3 is an unfinished game) -> games
+        self.outcomes: List[int] = [0, 0, 0, 0]
+        # Length -> games
+        self.lengths: List[int] = [0] * 10
+        # The index of the line in ZTBaseBoard._LINE_MASKS -> games won on that line
+        self.lines: List[int] = [0] * len(ZTBaseBoard._LINE_MASKS)
+        # Games whose engine is known, the engine moves which lost value and the games with at least one
+        self.checked_games: int = 0
+        self.deviations: int = 0
+        self.deviated_games: int = 0
+
+    def add(self, result: GameAnalysis) -> None:
+        """Adds a game
+
+        :param result: The analysis of the game
+        :type result: GameAnalysis
+        :return: None
+        """
+
+        self.games += 1
+        self.outcomes[3 if result.winner is None else result.winner] += 1
+        self.lengths[result.length] += 1
+        if result.highlighted:
+            mask = 0
+            for pos in result.highlighted:
+                mask |= 1 << pos
+            for i, line_mask in enumerate(ZTBaseBoard._LINE_MASKS):
+                if mask & line_mask == line_mask:
+                    self.lines[i] += 1
+        if result.deviations is not None:
+            self.checked_games += 1
+            self.deviations += result.deviations
+            self.deviated_games += result.deviations > 0
+
+    def merge(self, other: 'AnalysisSummary') -> None:
+        """Adds the games of another summary to this one
+
+        :param other: The other summary
+        :type other: AnalysisSummary
+        :return: None
+        """
+
+        self.games += other.games
+        for counts, other_counts in ((self.outcomes, other.outcomes), (self.lengths, other.lengths),
+                                     (self.lines, other.lines)):
+            for i in range(len(counts)):
+                counts[i] += other_counts[i]
+        self.checked_games += other.checked_games
+        self.deviations += other.deviations
+        self.deviated_games += other.deviated_games
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the summary to a JSON serializable dictionary
+
+        :return: The summary
+        :rtype: Dict[str, Any]
+        """
+
+        return {
+            'games': self.games,
+            'outcomes': {'draw': self.outcomes[0], 'player1': self.outcomes[1], 'player2': self.outcomes[2],
+                         'unfinished': self.outcomes[3]},
+            'lengths': self.lengths,
+            'lines': self.lines,
+            'checked_games': self.checked_games,
+            'deviations': self.deviations,
+            'deviated_games': self.deviated_games,
+        }
+
+
+def _summarise_chunk(games: List[_Game]) -> AnalysisSummary:
+    """Analyses and aggregates a chunk of games, picklable for the process pool
+
+    :param games: The games
+    :type games: List[_Game]
+    :return: The summary of the chunk
+    :rtype: AnalysisSummary
+    """
+
+    summary = AnalysisSummary()
+    for history, engine in games:
+        summary.add(analyse_history(history, engine))
+    return summary
+
+
+# Sources
+
+def read_histories(file: Union[str, IO[str]]) -> Iterator[List[int]]:
+    """Lazily reads histories from a text file, one game per line
+
+    A line is either the digits of the moves ('04812') or the moves separated by commas or spaces.
+    Blank lines are skipped.
+
+    :param file: The path or the open text file
+    :type file: Union[str, IO[str]]
+    :return: Iterator over the histories
+    :rtype: Iterator[List[int]]
+    :raise: ZTInvalidInput if a line is not a history
+    """
+
+    if isinstance(file, str):
+        with open(file) as f:
+            yield from read_histories(f)
+        return
+
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            if line.isdigit():
+                yield [int(char) for char in line]
+            else:
+                yield [int(move) for move in line.replace(',', ' ').split()]
+        except ValueError:
+            raise ZTInvalidInput(f"Line {number} is not a history")
+
+
+def log_games(log: GameLog) -> Iterator[_Game]:
+    """Lazily reads the games of a game log along with the side of the engine of the PvC games
+
+    :param log: The game log
+    :type log: GameLog
+    :return: Iterator over (history, the player number of the engine or None)
+    :rtype: Iterator[_Game]
+    """
+
+    for record in log.iter_records():
+        length = record >> _LENGTH_SHIFT & 0xF
+        history = record & _HISTORY_MASK
+        flags = record >> _FLAGS_SHIFT
+        engine = (1 if flags & _ENGINE_FIRST else 2) if flags & _PVC else None
+        yield [history >> 4 * i & 0xF for i in range(length)], engine
+
+
+# Pipeline
+
+def _chunks(games: Iterable[_Game], chunk_size: int) -> Iterator[List[_Game]]:
+    """Lazily splits the games into lists of chunk_size games
+
+    :param games: The games
+    :type games: Iterable[_Game]
+    :param chunk_size: The number of games in a chunk
+    :type chunk_size: int
+    :return: Iterator over the chunks
+    :rtype: Iterator[List[_Game]]
+    """
+
+    iterator = iter(games)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_chunks(function: Callable[[List[_Game]], Any], games: Iterable[_Game], workers: Union[int, None],
+                chunk_size: int) -> Iterator[Any]:
+    """Applies a function to the chunks of the games in order, in a process pool if workers is given
+
+    At most 2 chunks per worker are in flight, so the input is consumed only as fast as it is processed.
+
+    :param function: The function, picklable for the process pool
+    :type function: Callable[[List[_Game]], Any]
+    :param games: The games
+    :type games: Iterable[_Game]
+    :param workers: The number of processes, the chunks are processed in this process if None
+    :type workers: Union[int, None]
+    :param chunk_size: The number of games in a chunk
+    :type chunk_size: int
+    :return: Iterator over the results of the chunks
+    :rtype: Iterator[Any]
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    if workers is None or workers < 2:
+        for chunk in _chunks(games, chunk_size):
+            yield function(chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for chunk in _chunks(games, chunk_size):
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _with_engine(histories: Iterable[History], engine: Union[int, None]) -> Iterator[_Game]:
+    """Pairs every history with the side of the engine
+
+    :param histories: The histories
+    :type histories: Iterable[History]
+    :param engine: The player number of the engine, None if not known
+    :type engine: Union[int, None]
+    :return: Iterator over the games
+    :rtype: Iterator[_Game]
+    :raise: ZTBadFunctionCall if the engine is neither 1, 2 nor None
+    """
+
+    _check_engine(engine)
+    for history in histories:
+        yield history, engine
+
+
+def analyse(histories: Iterable[History], engine: Union[int, None] = None, workers: Union[int, None] = None,
+            chunk_size: int = 10000) -> Iterator[GameAnalysis]:
+    """Lazily analyses games, yielding the analyses in the order of the histories
+
+    :param histories: The histories
+    :type histories: Iterable[History]
+    :param engine: The player number (1 or 2) of the engine whose moves are checked, no check if None
+    :type engine: Union[int, None]
+    :param workers: The number of processes, the games are analysed in this process if None
+    :type workers: Union[int, None]
+    :param chunk_size: The number of games sent to a process at once
+    :type chunk_size: int
+    :return: Iterator over the analyses
+    :rtype: Iterator[GameAnalysis]
+    :raise: ZTInvalidInput if a history is not a valid game
+    """
+
+    for results in _map_chunks(_analyse_chunk, _with_engine(histories, engine), workers, chunk_size):
+        yield from results
+
+
+def summarise(histories: Iterable[History], engine: Union[int, None] = None, workers: Union[int, None] = None,
+              chunk_size: int = 10000) -> AnalysisSummary:
+    """Analyses games and aggregates them, the chunks are aggregated where they are analysed
+
+    :param histories: The histories
+    :type histories: Iterable[History]
+    :param engine: The player number (1 or 2) of the engine whose moves are checked, no check if None
+    :type engine: Union[int, None]
+    :param workers: The number of processes, the games are analysed in this process if None
+    :type workers: Union[int, None]
+    :param chunk_size: The number of games sent to a process at once
+    :type chunk_size: int
+    :return: The summary
+    :rtype: AnalysisSummary
+    :raise: ZTInvalidInput if a history is not a valid game
+    """
+
+    return _summarise_games(_with_engine(histories, engine), workers, chunk_size)
+
+
+def summarise_log(log: GameLog, workers: Union[int, None] = None, chunk_size: int = 10000) -> AnalysisSummary:
+    """Analyses and aggregates the games of a game log, checking the engine moves of the PvC games
+
+    :param log: The game log
+    :type log: GameLog
+    :param workers: The number of processes, the games are analysed in this process if None
+    :type workers: Union[int, None]
+    :param chunk_size: The number of games sent to a process at once
+    :type chunk_size: int
+    :return: The summary
+    :rtype: AnalysisSummary
+    """
+    return _summarise_games(log_games(log), workers, chunk_size)
+
+
+def _summarise_games(games: Iterable[_Game], workers: Union[int, None], chunk_size: int) -> AnalysisSummary:
+    """Aggregates the summaries of the chunks of the games
+
+    :param games: The games
+    :type games: Iterable[_Game]
+    :param workers: The number of processes, the games are analysed in this process if None
+    :type workers: Union[int, None]
+    :param chunk_size: The number of games sent to a process at once
+    :type chunk_size: int
+    :return: The summary
+    :rtype: AnalysisSummary
+    """
+
+    summary = AnalysisSummary()
+    for chunk_summary in _map_chunks(_summarise_chunk, games, workers, chunk_size):
+        summary.merge(chunk_summary)
+    return summary
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    """The command line entry point"""
+
+    parser = ArgumentParser(prog='python -m zttt.analysis', description=__doc__.split('\n\n')[1])
+    parser.add_argument('file', help="a text file of histories, or a game log with --log")
+    parser.add_argument('--log', action='store_true', help="the file is a game log")
+    parser.add_argument('--engine', type=int, choices=(1, 2), default=None,
+                        help="the player whose moves are checked against the solver")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    if args.log:
+        with GameLog(args.file) as log:
+            summary = summarise_log(log, args.workers, args.chunk_size)
+    else:
+        summary = summarise(read_histories(args.file), args.engine, args.workers, args.chunk_size)
+    print(json.dumps(summary.to_dict(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Module zttt.book
+==================
+
+Generates the opening books of the m, n, k engines (see zttt._zt_core.zt_book).
+
+Every position reachable in fewer than depth moves is expanded and each of its moves is searched by the
+alpha-beta search of MNKPvC, to the end of the game by default (an exhaustive search, the values are exact)
+or to a search depth on the boards too large for that. The moves with the best score are kept.
+
+1. generate_book: Builds the book of a shape
+2. main: Writes a book, by default over the one shipped with the package
+
+Usage: python -m zttt.book 4 4 4 --depth 3 --search-depth 8 --workers 8
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Tuple, Union
+
+from ._zt_core.zt_book import ZTBook, book_path
+from ._zt_core.zt_mnk_board import ZTMNKBoard
+from ._zt_core.zt_search import _SearchTables, _iterative_deepening, _WIN_BOUND
+
+
+def _score_move(m: int, n: int, k: int, mask1: int, mask2: int, pos: int, search_depth: Union[int, None]) -> int:
+    """Searches a move of a position, picklable for the process pool
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param mask1: The mask of the positions played by player 1
+    :type mask1: int
+    :param mask2: The mask of the positions played by player 2
+    :type mask2: int
+    :param pos: The move
+    :type pos: int
+    :param search_depth: The depth of the search, to the end of the game if None
+    :type search_depth: Union[int, None]
+    :return: The score of the move for the side to move
+    :rtype: int
+    """
+
+    if bin(mask1).count('1') == bin(mask2).count('1'):
+        side, other, turn = mask1, mask2, 1
+    else:
+        side, other, turn = mask2, mask1, 2
+    return _iterative_deepening(m, n, k, side, other, turn, [pos], None, search_depth)[-1][1]
+
+
+def _book_positions(m: int, n: int, k: int, depth: int) -> List[Tuple[int, int]]:
+    """Lists the positions in progress reachable in fewer than depth moves
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param depth: The positions with fewer moves played are listed
+    :type depth: int
+    :return: The (mask of player 1, mask of player 2) of the positions, by the number of moves played
+    :rtype: List[Tuple[int, int]]
+    """
+
+    tables = _SearchTables.get(m, n, k)
+    full_mask = tables.shape.full_mask
+    positions = []
+    ply = [(0, 0)]
+    for moves in range(min(depth, tables.shape.cells)):
+        positions.extend(ply)
+        if moves == depth - 1:
+            break
+        following = set()
+        for mask1, mask2 in ply:
+            empty = full_mask & ~(mask1 | mask2)
+            for pos in range(tables.shape.cells):
+                bit = 1 << pos
+                if not empty & bit:
+                    continue
+                child = (mask1 | bit, mask2) if moves % 2 == 0 else (mask1, mask2 | bit)
+                played = child[moves % 2]
+                # The games just won or drawn are over
+                if empty != bit and not any(played & window == window for window in tables.pos_windows[pos]):
+                    following.add(child)
+        ply = sorted(following)
+    return positions
+
+
+def generate_book(m: int, n: int, k: int, depth: int, search_depth: Union[int, None] = None,
+                  workers: Union[int, None] = None) -> ZTBook:
+    """Builds the opening book of a shape
+
+    :param m: The number of rows
+    :type m: int
+    :param n: The number of columns
+    :type n: int
+    :param k: The number in a row needed to win
+    :type k: int
+    :param depth: The positions with fewer moves played are in the book
+    :type depth: int
+    :param search_depth: The depth every move is searched to, to the end of the game if None
+    :type search_depth: Union[int, None]
+    :param workers: The number of processes searching the moves, a single process if None
+    :type workers: Union[int, None]
+    :return: The book
+    :rtype: ZTBook
+    :raise: ZTBadFunctionCall if the dimensions are not valid
+    """
+
+    ZTMNKBoard(m, n, k)  # Validates the dimensions
+    book = ZTBook(m, n, k, depth, search_depth)
+    full_mask = (1 << m * n) - 1
+
+    tasks = []
+    for mask1, mask2 in _book_positions(m, n, k, depth):
+        empty = full_mask & ~(mask1 | mask2)
+        tasks.extend((mask1, mask2, pos) for pos in range(m * n) if empty >> pos & 1)
+
+    masks1, masks2, moves = zip(*tasks) if tasks else ((), (), ())
+    arguments = (repeat(m), repeat(n), repeat(k), masks1, masks2, moves, repeat(search_depth))
+    if workers is None or workers < 2:
+        scores = list(map(_score_move, *arguments))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            scores = list(executor.map(_score_move, *arguments, chunksize=max(1, len(tasks) // (4 * workers))))
+
+    best = {}
+    for (mask1, mask2, pos), score in zip(tasks, scores):
+        position = (mask1, mask2)
+        best_score, moves = best.get(position, (None, 0))
+        if best_score is None or score > best_score:
+            best[position] = (score, 1 << pos)
+        elif score == best_score:
+            best[position] = (score, moves | 1 << pos)
+
+    for (mask1, mask2), (score, moves) in best.items():
+        value = 1 if score > _WIN_BOUND else -1 if score < -_WIN_BOUND else 0
+        book._add(mask1, mask2, value, moves)
+    return book
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    """The command line entry point"""
+
+    parser = ArgumentParser(prog='python -m zttt.book', description=__doc__.split('\n\n')[1])
+    parser.add_argument('m', type=int)
+    parser.add_argument('n', type=int)
+    parser.add_argument('k', type=int)
+    parser.add_argument('--depth', type=int, default=4, help="the positions with fewer moves are in the book")
+    parser.add_argument('--search-depth', type=int, default=None,
+                        help="the depth the moves are searched to, to the end of the game by default")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help="the book shipped with the package by default")
+    args = parser.parse_args(argv)
+
+    book = generate_book(args.m, args.n, args.k, args.depth, args.search_depth, args.workers)
+    output = args.output or book_path(args.m, args.n, args.k)
+    book.save(output)
+    print(f"{len(book)} positions written to {output}")
+
+
+if __name__ == '__main__':
+    main()
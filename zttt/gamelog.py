@@ -0,0 +1,350 @@
+"""
+Module zttt.gamelog
+=====================
+
+An append-only binary log of finished games with memory-mapped random access.
+
+The file starts with an 8 byte header (the magic b'ZTGL', the version and 3 reserved bytes),
+followed by one 8 byte little endian record per game
+
+1. Bits 0 - 35: The history, 4 bits per move with 0xF marking the unplayed moves
+2. Bits 36 - 44: The mask of the highlighted positions
+3. Bits 45 - 46: The winner (0 is a draw)
+4. Bits 47 - 51: The players, the flags of zttt.snapshot (PvC, engine first, solver, center, liberty_move3)
+5. Bits 52 - 55: The number of moves
+
+Only the games of the 3 x 3 board are logged, not the m, n, k games.
+"""
+
+import mmap
+import os
+from struct import Struct
+from typing import List, Dict, Iterator, Callable, Union, NamedTuple
+
+from ._zt_core import ZTEventBus, ZTEvent
+from .pvc import PvC
+from .pvp import PvP
+from .snapshot import _check_encodable, _flags, _restore, _CENTER, _LIBERTY_MOVE3
+from .zt_errors import ZTInvalidInput, ZTGameException, ZTBadFunctionCall
+
+
+Game = Union[PvP, PvC]
+
+MAGIC = b'ZTGL'
+VERSION = 1
+
+_HEADER = Struct('<4sB3x')
+_RECORD = Struct('<Q')
+
+_HISTORY_MASK = (1 << 36) - 1
+_HIGHLIGHT_SHIFT = 36
+_WINNER_SHIFT = 45
+_FLAGS_SHIFT = 47
+_LENGTH_SHIFT = 52
+
+
+class GameRecord(NamedTuple):
+    """A finished game read from the log"""
+
+    history: List[int]
+    winner: int
+    highlighted: List[int]  # Sorted, the order of ZTBaseBoard.highlighted is not kept
+    flags: int
+
+
+def encode_record(game: Game) -> int:
+    """Packs a finished game into a record
+
+    :param game: The finished game
+    :type game: Game
+    :return: The 64-bit record
+    :rtype: int
+    :raise: ZTBadFunctionCall if the game is not a PvP or PvC game
+    :raise: ZTGameException if the game is still in progress
+    """
+
+    _check_encodable(game)
+    if game.status:
+        raise ZTGameException("Only finished games can be logged")
+
+    history = game._history
+    packed = _HISTORY_MASK
+    for i in range(len(history)):
+        packed ^= (0xF ^ history[i]) << 4 * i
+
+    highlight = 0
+    for pos in game.highlighted:
+        highlight |= 1 << pos
+
+    return (packed | highlight << _HIGHLIGHT_SHIFT | game.winner << _WINNER_SHIFT
+            | _flags(game) << _FLAGS_SHIFT | len(history) << _LENGTH_SHIFT)
+
+
+def decode_record(record: int) -> GameRecord:
+    """Unpacks a record
+
+    :param record: The 64-bit record
+    :type record: int
+    :return: The game record
+    :rtype: GameRecord
+    """
+
+    length = record >> _LENGTH_SHIFT & 0xF
+    highlight = record >> _HIGHLIGHT_SHIFT & 0x1FF
+    return GameRecord(
+        history=[record >> 4 * i & 0xF for i in range(length)],
+        winner=record >> _WINNER_SHIFT & 3,
+        highlighted=[pos for pos in range(9) if highlight >> pos & 1],
+        flags=record >> _FLAGS_SHIFT & 0x1F,
+    )
+
+
+class GameLogWriter:
+    """Appends finished games to a log file"""
+
+    def __init__(self, path: str) -> None:
+        """Opens the log for appending, creating it if needed
+
+        :param path: The path of the log file
+        :type path: str
+        :return: None
+        :raise: ZTInvalidInput if the file exists and is not a game log
+        """
+
+        self._file = open(path, 'ab+')
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION))
+        else:
+            self._file.seek(0)
+            _check_header(self._file.read(_HEADER.size))
+            self._file.seek(0, os.SEEK_END)
+
+    def __enter__(self) -> 'GameLogWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, game: Game) -> None:
+        """Appends a finished game
+
+        :param game: The finished game
+        :type game: Game
+        :return: None
+        :raise: ZTBadFunctionCall if the game is not a PvP or PvC game
+        :raise: ZTGameException if the game is still in progress
+        """
+        self._file.write(_RECORD.pack(encode_record(game)))
+
+    def attach(self, game: Game) -> None:
+        """Logs the game when it finishes, through its event bus
+
+        :param game: The game
+        :type game: Game
+        :return: None
+        """
+        self.subscribe(game.events)
+
+    def subscribe(self, bus: ZTEventBus) -> Callable[[], None]:
+        """Logs every game of an event bus (a bus shared by a GameStore for instance) when it finishes
+
+        The m, n, k games of the bus are skipped.
+
+        :param bus: The event bus
+        :type bus: ZTEventBus
+        :return: A function which stops the logging
+        :rtype: Callable[[], None]
+        """
+        return bus.subscribe(self.__log_finished, 'finish')
+
+    def __log_finished(self, event: ZTEvent) -> None:
+        """Writes the game of a finish event
+
+        :param event: The event
+        :type event: ZTEvent
+        :return: None
+        """
+
+        try:
+            self.write(event.game)
+        except ZTBadFunctionCall:
+            pass
+
+    def flush(self) -> None:
+        """Flushes the written records to the file
+
+        :return: None
+        """
+        self._file.flush()
+
+    def close(self) -> None:
+        """Closes the log
+
+        :return: None
+        """
+        self._file.close()
+
+
+def _check_header(header: bytes) -> None:
+    """Raises an error if the header is not the header of a supported game log
+
+    :param header: The first bytes of the file
+    :type header: bytes
+    :raise: ZTInvalidInput if the header is not valid
+    """
+
+    if len(header) < _HEADER.size:
+        raise ZTInvalidInput("Not a game log")
+    magic, version = _HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ZTInvalidInput("Not a game log")
+    if version != VERSION:
+        raise ZTInvalidInput(f"Unsupported game log version {version}")
+
+
+class GameLog:
+    """Reads a game log through a read-only memory map"""
+
+    def __init__(self, path: str) -> None:
+        """Maps the log
+
+        :param path: The path of the log file
+        :type path: str
+        :return: None
+        :raise: ZTInvalidInput if the file is not a game log
+        """
+
+        self._file = open(path, 'rb')
+        self._map: Union[mmap.mmap, None] = None
+        self.refresh()
+
+    def __enter__(self) -> 'GameLog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def refresh(self) -> None:
+        """Maps the file again to see the records appended since the log was opened
+
+        :return: None
+        :raise: ZTInvalidInput if the file is not a game log
+        """
+
+        if self._map is not None:
+            self._map.close()
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+            raise ZTInvalidInput("Not a game log")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self._map[:_HEADER.size])
+        self._count = (len(self._map) - _HEADER.size) // _RECORD.size
+
+    def close(self) -> None:
+        """Closes the log
+
+        :return: None
+        """
+
+        self._map.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, index: int) -> int:
+        """Returns the raw 64-bit record of a game
+
+        :param index: The index of the game, negative indices count from the end
+        :type index: int
+        :return: The record
+        :rtype: int
+        :raise: IndexError if there is no such game
+        """
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Game index out of range")
+        return _RECORD.unpack_from(self._map, _HEADER.size + index * _RECORD.size)[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[GameRecord, List[GameRecord]]:
+        if isinstance(index, slice):
+            return [decode_record(self.record(i)) for i in range(*index.indices(self._count))]
+        return decode_record(self.record(index))
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        return self.iter()
+
+    def iter_records(self, start: int = 0, stop: Union[int, None] = None) -> Iterator[int]:
+        """Iterates over the raw records of a range of games without copying the file
+
+        :param start: The index of the first game
+        :type start: int
+        :param stop: The index after the last game, the end of the log if None
+        :type stop: Union[int, None]
+        :return: Iterator over the 64-bit records
+        :rtype: Iterator[int]
+        """
+
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return
+        view = memoryview(self._map)[_HEADER.size + start * _RECORD.size: _HEADER.size + stop * _RECORD.size]
+        try:
+            for (record,) in _RECORD.iter_unpack(view):
+                yield record
+        finally:
+            view.release()
+
+    def iter(self, start: int = 0, stop: Union[int, None] = None) -> Iterator[GameRecord]:
+        """Iterates over a range of games
+
+        :param start: The index of the first game
+        :type start: int
+        :param stop: The index after the last game, the end of the log if None
+        :type stop: Union[int, None]
+        :return: Iterator over the game records
+        :rtype: Iterator[GameRecord]
+        """
+
+        for record in self.iter_records(start, stop):
+            yield decode_record(record)
+
+    def outcome_counts(self, start: int = 0, stop: Union[int, None] = None) -> Dict[int, int]:
+        """Counts the outcomes of a range of games without decoding the histories
+
+        :param start: The index of the first game
+        :type start: int
+        :param stop: The index after the last game, the end of the log if None
+        :type stop: Union[int, None]
+        :return: Dictionary from the winner (0 is a draw) to the number of games
+        :rtype: Dict[int, int]
+        """
+
+        counts = [0, 0, 0, 0]
+        for record in self.iter_records(start, stop):
+            counts[record >> _WINNER_SHIFT & 3] += 1
+        return {0: counts[0], 1: counts[1], 2: counts[2]}
+
+    def rebuild(self, index: int, ply: Union[int, None] = None) -> Game:
+        """Rebuilds the live game of a record after a number of moves
+
+        :param index: The index of the game, negative indices count from the end
+        :type index: int
+        :param ply: The number of moves to replay, all of them if None
+        :type ply: Union[int, None]
+        :return: The game, without any triggers
+        :rtype: Game
+        :raise: IndexError if there is no such game
+        """
+
+        game_record = self[index]
+        history, flags = game_record.history, game_record.flags
+        if ply is not None:
+            history = history[:ply]
+            # The flags of ZTPlayerFirst are set by the engine moves 2 and 4
+            if ply < 2:
+                flags &= ~_CENTER
+            if ply < 4:
+                flags &= ~_LIBERTY_MOVE3
+        return _restore(flags, history)
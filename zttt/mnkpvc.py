@@ -0,0 +1,74 @@
+from random import Random
+from typing import Union
+
+from ._zt_core import ZTSearchEngine
+from ._zt_core import ZTMCTSEngine
+
+
+class MNKPvC(ZTSearchEngine):
+    """Class for the PvC Game on a board of m rows and n columns where k in a row wins
+
+    The engine searches with iterative deepening alpha-beta within time_limit seconds per move
+    """
+
+    __slots__ = ()
+
+    def __init__(self, m: int = 4, n: int = 4, k: int = 4, _engine_first: bool = True,
+                 time_limit: Union[float, None] = 1.0, max_depth: Union[int, None] = None,
+                 workers: Union[int, None] = None) -> None:
+        """Initialize the Game
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :param _engine_first: Specifies if the engine starts first
+        :type _engine_first: bool
+        :param time_limit: The seconds the engine searches for per move, no limit if None
+        :type time_limit: Union[float, None]
+        :param max_depth: The deepest iteration of the search, no limit if None
+        :type max_depth: Union[int, None]
+        :param workers: The number of processes the root moves are split between, a single process if None
+        :type workers: Union[int, None]
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid
+        """
+        ZTSearchEngine.__init__(self, m, n, k, _engine_first, time_limit, max_depth, workers)
+
+
+class MCTSPvC(ZTMCTSEngine):
+    """Class for the PvC Game on a board of m rows and n columns where k in a row wins
+
+    The engine plays by Monte Carlo tree search and always moves within time_limit seconds or playouts
+    """
+
+    __slots__ = ()
+
+    def __init__(self, m: int = 4, n: int = 4, k: int = 4, _engine_first: bool = True,
+                 time_limit: Union[float, None] = 1.0, playouts: Union[int, None] = None,
+                 workers: Union[int, None] = None, rng: Union[Random, int, None] = None) -> None:
+        """Initialize the Game
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :param _engine_first: Specifies if the engine starts first
+        :type _engine_first: bool
+        :param time_limit: The seconds the engine searches for per move, no limit if None
+        :type time_limit: Union[float, None]
+        :param playouts: The number of playouts per move, no limit if None
+        :type playouts: Union[int, None]
+        :param workers: The number of processes growing trees, a single process if None
+        :type workers: Union[int, None]
+        :param rng: The generator the seeds of the searches are drawn from or its seed,
+            the module level generator of random if None
+        :type rng: Union[Random, int, None]
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid, there is no budget or the seed is not an integer
+        """
+        ZTMCTSEngine.__init__(self, m, n, k, _engine_first, time_limit, playouts, workers, rng)
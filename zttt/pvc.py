@@ -1,25 +1,128 @@
+from random import Random
+from typing import List, Iterable, Union
+
+from ._zt_core import ZTBaseEngine
 from ._zt_core import ZTEngineFirst
 from ._zt_core import ZTPlayerFirst
+from ._zt_core import ZTSolver
 
 
-class PvC(ZTEngineFirst, ZTPlayerFirst):
+class PvC(ZTEngineFirst, ZTPlayerFirst, ZTSolver):
     """Class for the PvC Game"""
 
-    def __init__(self, _engine_first: bool = True) -> None:
+    __slots__ = ('parent',)
+
+    def __init__(self, _engine_first: bool = True, _solver: bool = False,
+                 rng: Union[Random, int, None] = None) -> None:
         """Initialize the Game
 
         :param _engine_first: Specifies if the engine starts first
         :type _engine_first: bool
+        :param _solver: Specifies if the engine plays perfectly using the solver table instead of the heuristics
+        :type _solver: bool
+        :param rng: The generator of the engine's random choices or its seed, the same seed replays the same
+            engine moves against the same player moves. The module level generator of random if None
+        :type rng: Union[Random, int, None]
         :return: None
+        :raise: ZTBadFunctionCall if the seed is not an integer
         """
 
-        if _engine_first:
+        if _solver:
+            self.parent = ZTSolver
+            ZTSolver.__init__(self, _engine_first, rng)
+
+        elif _engine_first:
             self.parent = ZTEngineFirst
-            ZTEngineFirst.__init__(self)
+            ZTEngineFirst.__init__(self, rng)
 
         else:
             self.parent = ZTPlayerFirst
-            ZTPlayerFirst.__init__(self)
+            ZTPlayerFirst.__init__(self, rng)
+
+    @classmethod
+    def from_history(cls, history: Iterable[int], _engine_first: bool = True, _solver: bool = False,
+                     rng: Union[Random, int, None] = None) -> 'PvC':
+        """Rebuilds a game from its history in one call without letting the engine choose any move
+
+        The moves are applied by replay and the state of the engine is derived from the history,
+        so the game can be analysed or played on from any position.
+
+        :param history: The moves of the game, both the player's and the engine's
+        :type history: Iterable[int]
+        :param _engine_first: Specifies if the engine started first
+        :type _engine_first: bool
+        :param _solver: Specifies if the engine is the solver
+        :type _solver: bool
+        :param rng: The generator of the engine's random choices from here on or its seed
+        :type rng: Union[Random, int, None]
+        :return: The game
+        :rtype: PvC
+        :raise: ZTGameException if a move is played after the game is over
+        :raise: ZTInvalidInput if a move is invalid
+        """
+
+        game = cls.__new__(cls)
+        ZTBaseEngine.__init__(game, _engine_first, rng)
+
+        if _solver:
+            game.parent = ZTSolver
+        elif _engine_first:
+            game.parent = ZTEngineFirst
+            game.move1 = None
+        else:
+            game.parent = ZTPlayerFirst
+            game.center = False
+            game.liberty_move3 = False
+
+        game.replay(history)
+        return game
+
+    @classmethod
+    def _restore(cls, history: List[int], _engine_first: bool, _solver: bool = False,
+                 center: bool = False, liberty_move3: bool = False) -> 'PvC':
+        """Rebuilds a game from its history and the stored flags of ZTPlayerFirst
+
+        :param history: The moves of the game, both the player's and the engine's
+        :type history: List[int]
+        :param _engine_first: Specifies if the engine started first
+        :type _engine_first: bool
+        :param _solver: Specifies if the engine is the solver
+        :type _solver: bool
+        :param center: The center flag of ZTPlayerFirst
+        :type center: bool
+        :param liberty_move3: The liberty_move3 flag of ZTPlayerFirst
+        :type liberty_move3: bool
+        :return: The game
+        :rtype: PvC
+        :raise: ZTGameException if a move is played after the game is over
+        :raise: ZTInvalidInput if a move is invalid
+        """
+
+        game = cls.from_history(history, _engine_first, _solver)
+        if game.parent is ZTPlayerFirst:
+            game.center = center
+            game.liberty_move3 = liberty_move3
+        return game
+
+    def _clone_into(self, game: 'PvC') -> None:
+        """Copies the state of the game into a new object
+
+        :param game: The new object
+        :type game: PvC
+        :return: None
+        """
+
+        super()._clone_into(game)
+        game.parent = self.parent
+
+    @property
+    def solver(self) -> bool:
+        """Whether the engine plays using the solver table
+
+        :return: True if the engine is the solver, False otherwise
+        :rtype: bool
+        """
+        return self.parent is ZTSolver
 
     def play(self, pos: int) -> None:
         """Plays the player's move at the position specified
@@ -32,3 +135,17 @@ class PvC(ZTEngineFirst, ZTPlayerFirst):
         """
 
         self.parent.play(self, pos)
+
+
+def __getattr__(name: str):
+    """Imports MNKPvC and MCTSPvC from zttt.mnkpvc, where they moved so that PvC does not load the searches
+
+    :param name: The name
+    :type name: str
+    :return: The class
+    :raise: AttributeError if the module has no such name
+    """
+
+    if name not in ('MNKPvC', 'MCTSPvC'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(__import__(f'{__package__}.mnkpvc', fromlist=[name]), name)
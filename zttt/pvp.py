@@ -1,12 +1,32 @@
-from ._zt_core import ZTBaseBoard
+from typing import Iterable
+
+from ._zt_core import ZTBaseBoard, ZTMNKBoard
 
 
 class PvP(ZTBaseBoard):
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """Initialize the Game"""
         super().__init__()
 
+    @classmethod
+    def from_history(cls, history: Iterable[int]) -> 'PvP':
+        """Rebuilds a game from its history in one call, see replay
+
+        :param history: The moves of the game
+        :type history: Iterable[int]
+        :return: The game
+        :rtype: PvP
+        :raise: ZTGameException if a move is played after the game is over
+        :raise: ZTInvalidInput if a move is invalid
+        """
+
+        game = cls()
+        game.replay(history)
+        return game
+
     def play(self, pos: int) -> None:
         """Plays the player's move at the position specified
 
@@ -21,3 +41,45 @@ class PvP(ZTBaseBoard):
             super()._play_player_one_move(pos)
         else:
             super()._play_player_two_move(pos)
+
+
+class MNKPvP(PvP, ZTMNKBoard):
+    """PvP on a board of m rows and n columns where k in a row wins"""
+
+    __slots__ = ()
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3) -> None:
+        """Initialize the Game
+
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :return: None
+        :raise: ZTBadFunctionCall if the dimensions are not valid
+        """
+        ZTMNKBoard.__init__(self, m, n, k)
+
+    @classmethod
+    def from_history(cls, history: Iterable[int], m: int = 3, n: int = 3, k: int = 3) -> 'MNKPvP':
+        """Rebuilds a game from its history in one call, see replay
+
+        :param history: The moves of the game
+        :type history: Iterable[int]
+        :param m: The number of rows
+        :type m: int
+        :param n: The number of columns
+        :type n: int
+        :param k: The number in a row needed to win
+        :type k: int
+        :return: The game
+        :rtype: MNKPvP
+        :raise: ZTGameException if a move is played after the game is over
+        :raise: ZTInvalidInput if a move is invalid
+        """
+
+        game = cls(m, n, k)
+        game.replay(history)
+        return game
@@ -0,0 +1,505 @@
+"""
+Module zttt.server
+====================
+
+An asyncio game server hosting many concurrent sessions over a line delimited JSON protocol on TCP.
+
+Every request is a JSON object on a line with an "op" and an optional "id" which is echoed back.
+A response is {"id": ..., "ok": true, ...} or {"id": ..., "ok": false, "error": "..."}
+
+1. {"op": "new", "type": "pvp"}
+   {"op": "new", "type": "pvc", "engine_first": true, "solver": false}
+   {"op": "new", "type": "mnk", "m": 5, "n": 5, "k": 4, "engine": null | "search" | "mcts",
+   "engine_first": true, "time_limit": 1.0}
+   Creates a game and subscribes the client to it, responds with "game" (the ID) and "state".
+   m, n and time_limit are clamped to the maxima of the server (--max-side and --max-time-limit)
+2. {"op": "join", "game": ID}: Subscribes the client to a game, responds with "state"
+3. {"op": "leave", "game": ID}: Unsubscribes the client from a game
+4. {"op": "play", "game": ID, "pos": 4}: Plays a move (and the engine's reply), responds with "state"
+5. {"op": "undo", "game": ID}: Takes back the last move (the player's last move in a PvC game)
+6. {"op": "state", "game": ID}: Responds with "state"
+7. {"op": "close", "game": ID}: Removes the game
+
+The state is {"board": board_list, "history": [...], "turn": 1, "status": true, "winner": null, "highlighted": [...]}.
+The subscribers of a game are pushed {"event": "move", "game": ID, "player": 1, "pos": 4}
+for every move and {"event": "finish", "game": ID, "winner": 1} at the end of the game.
+
+Each client has a bounded queue of outgoing lines, written by its own task which waits for the
+transport to drain. Responses wait for room in the queue, so a client that stops reading stops being
+served, and a client whose queue overflows with events is disconnected. Engine moves of the m, n, k
+engines, and the construction of the m, n, k games, run in a thread pool so that they do not block the
+event loop, and the moves of a game are serialized by a lock per game. The games are kept in a GameStore, without spilling to disk since
+spilled games lose the triggers that push the events.
+
+Usage: python -m zttt.server --host 127.0.0.1 --port 8765
+"""
+
+import asyncio
+import json
+import math
+from argparse import ArgumentParser
+from threading import get_ident
+from typing import List, Dict, Set, Callable, Union, Any
+
+from ._zt_core import ZTMNKEngine
+from .pvc import PvC
+from .mnkpvc import MNKPvC, MCTSPvC
+from .pvp import PvP, MNKPvP
+from .store import GameStore
+from .zt_errors import ZTError
+
+
+Game = Union[PvP, PvC, MNKPvP, MNKPvC, MCTSPvC]
+
+MAX_LINE = 1 << 16  # The longest request line in bytes
+
+
+class _ClientError(Exception):
+    """An invalid request, reported to the client"""
+    pass
+
+
+class _Connection:
+    """A connected client with its queue of outgoing lines"""
+
+    def __init__(self, writer: asyncio.StreamWriter, max_queue: int) -> None:
+        """Initialize the connection
+
+        :param writer: The stream of the client
+        :type writer: asyncio.StreamWriter
+        :param max_queue: The number of lines waiting to be written before events disconnect the client
+        :type max_queue: int
+        :return: None
+        """
+
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: 'asyncio.Queue[Union[bytes, None]]' = asyncio.Queue(max_queue)
+        self.games: Set[str] = set()
+        self.closed: bool = False
+        self.task: asyncio.Task = asyncio.ensure_future(self.__write_loop())
+
+    async def __write_loop(self) -> None:
+        """Writes the queued lines, waiting for the transport to drain after each"""
+
+        try:
+            while True:
+                line = await self.queue.get()
+                if line is None:
+                    break
+                self.writer.write(line)
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Queues a message, waiting while the queue is full
+
+        :param message: The message
+        :type message: Dict[str, Any]
+        :return: None
+        """
+
+        if not self.closed:
+            await self.queue.put(_encode(message))
+
+    def push(self, message: Dict[str, Any]) -> None:
+        """Queues an event without waiting, the client is disconnected if its queue is full
+
+        :param message: The message
+        :type message: Dict[str, Any]
+        :return: None
+        """
+
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(_encode(message))
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self) -> None:
+        """Stops writing and closes the stream
+
+        :return: None
+        """
+
+        self.closed = True
+        self.task.cancel()
+        # Frees the queue for a response waiting in send
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Encodes a message as a line
+
+    :param message: The message
+    :type message: Dict[str, Any]
+    :return: The line
+    :rtype: bytes
+    """
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def _state(game: Game) -> Dict[str, Any]:
+    """Returns the state of a game sent to the clients
+
+    :param game: The game
+    :type game: Game
+    :return: The state
+    :rtype: Dict[str, Any]
+    """
+
+    return {
+        'board': game.board_list,
+        'history': game.history,
+        'turn': game.turn,
+        'status': game.status,
+        'winner': game.winner,
+        'highlighted': game.highlighted,
+    }
+
+
+class GameServer:
+    """Hosts the games of many clients in one process"""
+
+    def __init__(self, store: Union[GameStore, None] = None, max_queue: int = 1024, max_side: int = 20,
+                 max_time_limit: float = 5.0) -> None:
+        """Initialize the server
+
+        :param store: The store of the games, a GameStore with the default limits if None.
+            The server sets its on_drop to forget the games leaving it, calling the on_drop set before
+        :type store: Union[GameStore, None]
+        :param max_queue: The number of lines waiting to be written to a client before events disconnect it
+        :type max_queue: int
+        :param max_side: The largest number of rows or columns of an m, n, k game
+        :type max_side: int
+        :param max_time_limit: The largest time limit per engine move of an m, n, k game, in seconds
+        :type max_time_limit: float
+        :return: None
+        """
+
+        self.store: GameStore = GameStore() if store is None else store
+        # The callback of the store is still called once the server has forgotten the game
+        self._store_on_drop: Union[Callable[[str], None], None] = self.store.on_drop
+        self.store.on_drop = self.__dropped
+        self.max_queue: int = max_queue
+        self.max_side: int = max_side
+        self.max_time_limit: float = max_time_limit
+
+        # Game ID -> the connections subscribed to the game
+        self._subscribers: Dict[str, Set[_Connection]] = {}
+        # Game ID -> the lock serializing the moves of the game
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        self._ops: Dict[str, Callable] = {
+            'new': self.__op_new, 'join': self.__op_join, 'leave': self.__op_leave, 'play': self.__op_play,
+            'undo': self.__op_undo, 'state': self.__op_state, 'close': self.__op_close,
+        }
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.AbstractServer:
+        """Starts listening
+
+        :param host: The host to listen on
+        :type host: str
+        :param port: The port to listen on, any free port if 0
+        :type port: int
+        :return: The server
+        :rtype: asyncio.AbstractServer
+        """
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves a client until it disconnects
+
+        :param reader: The stream from the client
+        :type reader: asyncio.StreamReader
+        :param writer: The stream to the client
+        :type writer: asyncio.StreamWriter
+        :return: None
+        """
+
+        connection = _Connection(writer, self.max_queue)
+        try:
+            while not connection.closed:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await connection.send({'ok': False, 'error': "Line too long"})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await connection.send(await self.__respond(connection, line))
+        finally:
+            for game_id in connection.games:
+                subscribers = self._subscribers.get(game_id)
+                if subscribers is not None:
+                    subscribers.discard(connection)
+            # The pending lines are still written unless the queue is full
+            try:
+                connection.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                connection.close()
+            await asyncio.gather(connection.task, return_exceptions=True)
+            writer.close()
+
+    async def __respond(self, connection: _Connection, line: bytes) -> Dict[str, Any]:
+        """Runs a request
+
+        :param connection: The client
+        :type connection: _Connection
+        :param line: The request line
+        :type line: bytes
+        :return: The response
+        :rtype: Dict[str, Any]
+        """
+
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise _ClientError("Invalid JSON")
+            if not isinstance(request, dict):
+                raise _ClientError("The request must be an object")
+            request_id = request.get('id')
+            name = request.get('op')
+            if not isinstance(name, str):
+                raise _ClientError("op must be a string")
+            op = self._ops.get(name)
+            if op is None:
+                raise _ClientError(f"Unknown op {name!r}")
+            response = await op(connection, request)
+        except (_ClientError, ZTError) as e:
+            response = {'ok': False, 'error': str(e)}
+        else:
+            response['ok'] = True
+        response['id'] = request_id
+        return response
+
+    # Helper Functions
+
+    @staticmethod
+    def __game_id(request: Dict[str, Any]) -> str:
+        """Returns the game ID of a request
+
+        :param request: The request
+        :type request: Dict[str, Any]
+        :return: The game ID
+        :rtype: str
+        :raise: _ClientError if the game ID is not a string
+        """
+
+        game_id = request.get('game')
+        if not isinstance(game_id, str):
+            raise _ClientError("game must be a string")
+        return game_id
+
+    def __game(self, request: Dict[str, Any]) -> Game:
+        """Returns the game of a request
+
+        :param request: The request
+        :type request: Dict[str, Any]
+        :return: The game
+        :rtype: Game
+        :raise: _ClientError if there is no such game
+        """
+
+        game_id = self.__game_id(request)
+        try:
+            return self.store.get(game_id)
+        except KeyError:
+            # The game may have expired or been evicted from the store
+            self.__forget(game_id)
+            raise _ClientError(f"Unknown game {game_id!r}")
+
+    def __forget(self, game_id: str) -> None:
+        """Drops the lock and the subscribers of a game
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :return: None
+        """
+
+        self._locks.pop(game_id, None)
+        for subscriber in self._subscribers.pop(game_id, ()):
+            subscriber.games.discard(game_id)
+
+    def __dropped(self, game_id: str) -> None:
+        """Forgets a game leaving the store and calls the on_drop the store had before the server
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :return: None
+        """
+
+        self.__forget(game_id)
+        if self._store_on_drop is not None:
+            self._store_on_drop(game_id)
+
+    def __wire(self, game_id: str, game: Game) -> None:
+        """Sets the triggers of a game to push the events to its subscribers
+
+        The events of the moves played in the thread pool are handed to the event loop, the others are
+        pushed at once so that they reach the clients before the response to the move.
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :param game: The game
+        :type game: Game
+        :return: None
+        """
+
+        loop = asyncio.get_event_loop()
+        loop_thread = get_ident()
+
+        def push(message: Dict[str, Any]) -> None:
+            for connection in list(self._subscribers.get(game_id, ())):
+                connection.push(message)
+
+        def publish(message: Dict[str, Any]) -> None:
+            if get_ident() == loop_thread:
+                push(message)
+            else:
+                loop.call_soon_threadsafe(push, message)
+
+        def on_move(player: int, pos: int) -> None:
+            publish({'event': 'move', 'game': game_id, 'player': player, 'pos': pos})
+
+        def on_finish(winner: int) -> None:
+            publish({'event': 'finish', 'game': game_id, 'winner': winner})
+
+        game.on_move = on_move
+        game.on_finish = on_finish
+
+    async def __run(self, game_id: str, game: Game, function: Callable[..., Any], *args: Any) -> Any:
+        """Runs a call on a game under its lock, in the thread pool for the m, n, k engines
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :param game: The game
+        :type game: Game
+        :param function: The call
+        :type function: Callable[..., Any]
+        :return: The result of the call
+        :rtype: Any
+        """
+
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        async with lock:
+            if isinstance(game, ZTMNKEngine):
+                return await asyncio.get_event_loop().run_in_executor(None, function, *args)
+            return function(*args)
+
+    # Operations
+
+    async def __op_new(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        kind = request.get('type', 'pvp')
+        engine_first = bool(request.get('engine_first', True))
+        if kind == 'pvp':
+            game = PvP()
+        elif kind == 'pvc':
+            game = PvC(engine_first, bool(request.get('solver', False)))
+        elif kind == 'mnk':
+            try:
+                m, n, k = int(request.get('m', 3)), int(request.get('n', 3)), int(request.get('k', 3))
+                time_limit = float(request.get('time_limit', 1.0))
+            except (TypeError, ValueError, OverflowError):
+                raise _ClientError("m, n, k and time_limit must be numbers")
+            if not math.isfinite(time_limit):
+                raise _ClientError("time_limit must be finite")
+            m, n = min(m, self.max_side), min(n, self.max_side)
+            time_limit = min(max(time_limit, 0.0), self.max_time_limit)
+
+            engine = request.get('engine')
+            if engine is None:
+                cls, args = MNKPvP, (m, n, k)
+            elif engine in ('search', 'mcts'):
+                cls = MNKPvC if engine == 'search' else MCTSPvC
+                args = (m, n, k, engine_first, time_limit)
+            else:
+                raise _ClientError(f"Unknown engine {engine!r}")
+            # The tables of the board are built, and the engine may move first, in the constructor
+            game = await asyncio.get_event_loop().run_in_executor(None, lambda: cls(*args))
+        else:
+            raise _ClientError(f"Unknown game type {kind!r}")
+
+        game_id = self.store.add(game)
+        self.__wire(game_id, game)
+        self._subscribers.setdefault(game_id, set()).add(connection)
+        connection.games.add(game_id)
+        return {'game': game_id, 'state': _state(game)}
+
+    async def __op_join(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        game = self.__game(request)
+        game_id = request['game']
+        self._subscribers.setdefault(game_id, set()).add(connection)
+        connection.games.add(game_id)
+        return {'state': _state(game)}
+
+    async def __op_leave(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        game_id = self.__game_id(request)
+        self._subscribers.get(game_id, set()).discard(connection)
+        connection.games.discard(game_id)
+        return {}
+
+    async def __op_play(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        game = self.__game(request)
+        pos = request.get('pos')
+        if not isinstance(pos, int) or isinstance(pos, bool):
+            raise _ClientError("pos must be an integer")
+        await self.__run(request['game'], game, game.play, pos)
+        return {'state': _state(game)}
+
+    async def __op_undo(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        game = self.__game(request)
+        await self.__run(request['game'], game, game.undo)
+        return {'state': _state(game)}
+
+    async def __op_state(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {'state': _state(self.__game(request))}
+
+    async def __op_close(self, connection: _Connection, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.__game(request)
+        game_id = request['game']
+        self.store.remove(game_id)
+        self.__forget(game_id)
+        return {}
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    """The command line entry point"""
+
+    parser = ArgumentParser(prog='python -m zttt.server', description=__doc__.split('\n\n')[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-games', type=int, default=100000)
+    parser.add_argument('--ttl', type=float, default=None, help="seconds after which idle games expire")
+    parser.add_argument('--max-side', type=int, default=20, help="the largest m and n of the m, n, k games")
+    parser.add_argument('--max-time-limit', type=float, default=5.0,
+                        help="the largest time limit per engine move of the m, n, k games")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = await GameServer(GameStore(args.max_games, args.ttl), max_side=args.max_side,
+                                  max_time_limit=args.max_time_limit).serve(args.host, args.port)
+        print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Module zttt.simulate
+======================
+
+Bulk simulation of random games.
+
+The games are played directly on bitboards with precomputed tables instead of PvP objects,
+and the results are returned as flat arrays holding all the games.
+"""
+
+from array import array
+from functools import reduce
+from operator import or_
+from random import Random
+from typing import List, Tuple, Dict, Union
+
+from ._zt_core import ZTBaseBoard
+
+
+# _WIN_MASK[mask] is the union of the complete lines in a 9-bit mask, 0 if there are none
+_WIN_MASK: Tuple[int, ...] = tuple(
+    reduce(or_, (line_mask for line_mask in ZTBaseBoard._LINE_MASKS if mask & line_mask == line_mask), 0)
+    for mask in range(1 << 9)
+)
+
+# Marks the unplayed moves of a game in the history array
+NO_MOVE = -1
+
+
+class SimulationResult:
+    """The results of a batch of simulated games
+
+    All the arrays are indexed by the game number. The history of game i is the slice
+    histories[9 * i: 9 * i + 9], padded with NO_MOVE after the last move.
+    """
+
+    def __init__(self, winners: array, histories: array, highlighted: array) -> None:
+        """Initialize the result
+
+        :param winners: The winner of each game (0 is a draw)
+        :type winners: array
+        :param histories: The moves of each game, 9 entries per game
+        :type histories: array
+        :param highlighted: The 9-bit mask of the highlighted positions of each game, 0 for a draw
+        :type highlighted: array
+        :return: None
+        """
+
+        self.winners: array = winners
+        self.histories: array = histories
+        self.highlighted: array = highlighted
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+    def history(self, game: int) -> List[int]:
+        """Returns the history of a game
+
+        :param game: The game number
+        :type game: int
+        :return: The list of moves played in the game
+        :rtype: List[int]
+        """
+        return [pos for pos in self.histories[9 * game: 9 * game + 9] if pos != NO_MOVE]
+
+    def highlighted_positions(self, game: int) -> List[int]:
+        """Returns the highlighted positions of a game
+
+        :param game: The game number
+        :type game: int
+        :return: The list of highlighted positions (in row major order), empty list for a draw
+        :rtype: List[int]
+        """
+        return list(ZTBaseBoard._MASK_POSITIONS[self.highlighted[game]])
+
+    def counts(self) -> Dict[int, int]:
+        """Counts the outcomes of the games
+
+        :return: Dictionary from the winner (0 is a draw) to the number of games
+        :rtype: Dict[int, int]
+        """
+        return {winner: self.winners.count(winner) for winner in (0, 1, 2)}
+
+
+def simulate_random_games(n: int, seed: Union[int, None] = None) -> SimulationResult:
+    """Plays n games where both players play uniformly random moves
+
+    :param n: The number of games
+    :type n: int
+    :param seed: The seed for the random moves, random if not specified
+    :type seed: Union[int, None]
+    :return: The results of the games
+    :rtype: SimulationResult
+    """
+
+    winners = array('b', bytes(n))
+    histories = array('b', [NO_MOVE]) * (9 * n)
+    highlighted = array('H', bytes(2 * n))
+
+    random = Random(seed).random
+    mask_positions = ZTBaseBoard._MASK_POSITIONS
+    win_mask = _WIN_MASK
+    full_mask = ZTBaseBoard._FULL_MASK
+
+    for game in range(n):
+        offset = 9 * game
+        empty = full_mask
+        masks = [0, 0]
+        for ply in range(9):
+            positions = mask_positions[empty]
+            pos = positions[int(random() * len(positions))]
+            empty ^= 1 << pos
+            histories[offset + ply] = pos
+
+            side = ply & 1
+            masks[side] |= 1 << pos
+            if ply >= 4:
+                line = win_mask[masks[side]]
+                if line:
+                    winners[game] = side + 1
+                    highlighted[game] = line
+                    break
+
+    return SimulationResult(winners, histories, highlighted)
@@ -0,0 +1,220 @@
+"""
+Module zttt.snapshot
+======================
+
+A compact, versioned binary encoding of PvP and PvC games, engine state included.
+
+Layout of a snapshot (version 1)
+
+1. Byte 0: The version in bits 5 - 7 and the flags in bits 0 - 4
+   (PvC, engine first, solver, center and liberty_move3 of ZTPlayerFirst)
+2. Byte 1: The number of moves in the low nibble and the first move in the high nibble
+3. The remaining moves packed 4 bits per move, two moves per byte with the earlier move in the low nibble
+
+A game takes 2 to 6 bytes. Snapshots are self delimiting, so many games are encoded by concatenation.
+Only the games of the 3 x 3 board are encoded, not the m, n, k games.
+"""
+
+from typing import List, Tuple, Iterable, Iterator, Union
+
+from ._zt_core import ZTMNKBoard
+from .pvc import PvC
+from .pvp import PvP
+from .zt_errors import ZTInvalidInput, ZTBadFunctionCall
+
+
+Game = Union[PvP, PvC]
+
+VERSION = 1
+
+# Flags of byte 0
+_PVC = 1
+_ENGINE_FIRST = 2
+_SOLVER = 4
+_CENTER = 8
+_LIBERTY_MOVE3 = 16
+_FLAGS_MASK = 0x1F
+_VERSION_SHIFT = 5
+
+
+def _check_encodable(game: Game) -> None:
+    """Raises an error if a game is not a PvP or PvC game of the 3 x 3 board
+
+    :param game: The game
+    :type game: Game
+    :return: None
+    :raise: ZTBadFunctionCall if the game cannot be encoded
+    """
+
+    if not isinstance(game, (PvP, PvC)) or isinstance(game, ZTMNKBoard):
+        raise ZTBadFunctionCall(f"Only the PvP and PvC games can be encoded, not {type(game).__name__}")
+
+
+def _flags(game: Game) -> int:
+    """Returns the flags of a game
+
+    :param game: The game
+    :type game: Game
+    :return: The flags of byte 0
+    :rtype: int
+    """
+
+    if not isinstance(game, PvC):
+        return 0
+
+    flags = _PVC
+    if game.engine_first:
+        flags |= _ENGINE_FIRST
+    if game.solver:
+        flags |= _SOLVER
+    elif not game.engine_first:
+        flags |= _CENTER * game.center | _LIBERTY_MOVE3 * game.liberty_move3
+    return flags
+
+
+def _restore(flags: int, history: List[int]) -> Game:
+    """Rebuilds a game from its flags and history
+
+    :param flags: The flags of byte 0
+    :type flags: int
+    :param history: The moves of the game
+    :type history: List[int]
+    :return: The game
+    :rtype: Game
+    :raise: ZTGameException if a move is played after the game is over
+    :raise: ZTInvalidInput if a move is invalid
+    """
+
+    if not flags & _PVC:
+        return PvP.from_history(history)
+    return PvC._restore(history, bool(flags & _ENGINE_FIRST), bool(flags & _SOLVER),
+                        bool(flags & _CENTER), bool(flags & _LIBERTY_MOVE3))
+
+
+def _encode_into(buffer: bytearray, game: Game) -> None:
+    """Appends the snapshot of a game to a buffer
+
+    :param buffer: The buffer
+    :type buffer: bytearray
+    :param game: The game
+    :type game: Game
+    :return: None
+    :raise: ZTBadFunctionCall if the game is not a PvP or PvC game
+    """
+
+    _check_encodable(game)
+    history = game._history
+    n = len(history)
+    buffer.append(VERSION << _VERSION_SHIFT | _flags(game))
+    buffer.append(n | (history[0] if n else 0) << 4)
+    for i in range(1, n, 2):
+        buffer.append(history[i] | (history[i + 1] if i + 1 < n else 0) << 4)
+
+
+def _decode_from(data: Union[bytes, bytearray, memoryview], offset: int) -> Tuple[Game, int]:
+    """Decodes the snapshot of a game starting at offset
+
+    :param data: The encoded data
+    :type data: Union[bytes, bytearray, memoryview]
+    :param offset: The offset of the snapshot in data
+    :type offset: int
+    :return: The game and the offset just after its snapshot
+    :rtype: Tuple[Game, int]
+    :raise: ZTInvalidInput if the data is not a valid snapshot
+    """
+
+    try:
+        header, counts = data[offset], data[offset + 1]
+        if header >> _VERSION_SHIFT != VERSION:
+            raise ZTInvalidInput(f"Unsupported snapshot version {header >> _VERSION_SHIFT}")
+
+        n = counts & 0xF
+        if n > 9:
+            raise ZTInvalidInput(f"Invalid number of moves {n} in the snapshot")
+        history = [counts >> 4] if n else []
+        end = offset + 2 + n // 2
+        for byte in data[offset + 2: end]:
+            history.append(byte & 0xF)
+            history.append(byte >> 4)
+        if end > len(data):
+            raise IndexError
+        del history[n:]
+    except IndexError:
+        raise ZTInvalidInput("Truncated snapshot")
+
+    return _restore(header & _FLAGS_MASK, history), end
+
+
+def dumps(game: Game) -> bytes:
+    """Encodes a game
+
+    :param game: The game
+    :type game: Game
+    :return: The snapshot
+    :rtype: bytes
+    :raise: ZTBadFunctionCall if the game is not a PvP or PvC game
+    """
+
+    buffer = bytearray()
+    _encode_into(buffer, game)
+    return bytes(buffer)
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> Game:
+    """Decodes a game
+
+    :param data: The snapshot
+    :type data: Union[bytes, bytearray, memoryview]
+    :return: The game, without any triggers
+    :rtype: Game
+    :raise: ZTInvalidInput if the data is not a valid snapshot
+    """
+
+    game, end = _decode_from(data, 0)
+    if end != len(data):
+        raise ZTInvalidInput("Trailing data after the snapshot")
+    return game
+
+
+def dumps_many(games: Iterable[Game]) -> bytearray:
+    """Encodes many games into a single buffer
+
+    :param games: The games
+    :type games: Iterable[Game]
+    :return: The concatenated snapshots
+    :rtype: bytearray
+    :raise: ZTBadFunctionCall if a game is not a PvP or PvC game
+    """
+
+    buffer = bytearray()
+    for game in games:
+        _encode_into(buffer, game)
+    return buffer
+
+
+def iter_loads(data: Union[bytes, bytearray, memoryview]) -> Iterator[Game]:
+    """Lazily decodes concatenated snapshots
+
+    :param data: The concatenated snapshots
+    :type data: Union[bytes, bytearray, memoryview]
+    :return: Iterator over the games
+    :rtype: Iterator[Game]
+    :raise: ZTInvalidInput if the data is not valid
+    """
+
+    offset = 0
+    while offset < len(data):
+        game, offset = _decode_from(data, offset)
+        yield game
+
+
+def loads_many(data: Union[bytes, bytearray, memoryview]) -> List[Game]:
+    """Decodes concatenated snapshots
+
+    :param data: The concatenated snapshots
+    :type data: Union[bytes, bytearray, memoryview]
+    :return: The list of the games
+    :rtype: List[Game]
+    :raise: ZTInvalidInput if the data is not valid
+    """
+    return list(iter_loads(data))
@@ -0,0 +1,274 @@
+"""
+Module zttt.store
+===================
+
+An in-process store of many PvP/PvC games addressed by an ID.
+
+Games are kept in least recently used order. Games which are not touched for ttl seconds expire,
+and the least recently used games past max_games are evicted. Evicted games are spilled to disk
+as snapshots (their history and the engine flags, see zttt.snapshot) when a spill path is given,
+and are rehydrated when they are looked up again. All the operations are O(1) (amortized for the expiry).
+
+Only the PvP and PvC games can be spilled, the m, n, k games are dropped when they are evicted.
+Spilled games lose their on_move and on_finish triggers. The event bus of the store (see ZTEventBus)
+is attached to every game added and is attached again to the games rehydrated from disk.
+"""
+
+import dbm
+from collections import OrderedDict
+from time import monotonic
+from typing import Tuple, Callable, Union
+from uuid import uuid4
+
+from ._zt_core import ZTEventBus
+from .pvc import PvC
+from .pvp import PvP
+from .snapshot import dumps, loads, _check_encodable
+from .zt_errors import ZTBadFunctionCall
+
+
+Game = Union[PvP, PvC]
+
+
+def _spillable(game: Game) -> bool:
+    """Checks if a game can be spilled to disk
+
+    :param game: The game
+    :type game: Game
+    :return: True for the PvP and PvC games, False for the m, n, k games
+    :rtype: bool
+    """
+
+    try:
+        _check_encodable(game)
+    except ZTBadFunctionCall:
+        return False
+    return True
+
+
+class GameStore:
+    """Stores games by ID with LRU eviction, TTL expiry and spilling to disk"""
+
+    def __init__(self, max_games: int = 100000, ttl: Union[float, None] = None,
+                 spill_path: Union[str, None] = None, clock: Callable[[], float] = monotonic,
+                 events: Union[ZTEventBus, None] = None, on_drop: Union[Callable[[str], None], None] = None) -> None:
+        """Initialize the store
+
+        :param max_games: The number of games kept in memory, older games are evicted
+        :type max_games: int
+        :param ttl: The seconds after the last access at which a game expires, never if None
+        :type ttl: Union[float, None]
+        :param spill_path: The dbm file that evicted games are spilled to, evicted games are dropped if None
+        :type spill_path: Union[str, None]
+        :param clock: The clock used for the expiry
+        :type clock: Callable[[], float]
+        :param events: The event bus attached to all the games of the store, the games keep their own if None
+        :type events: Union[ZTEventBus, None]
+        :param on_drop: Called with the ID of every game leaving the store (removed, expired or evicted without
+            being spilled), so that the state kept alongside the games can be dropped with them
+        :type on_drop: Union[Callable[[str], None], None]
+        :return: None
+        """
+
+        if max_games < 1:
+            raise ValueError("max_games must be at least 1")
+
+        self.max_games: int = max_games
+        self.ttl: Union[float, None] = ttl
+        self._clock: Callable[[], float] = clock
+        self.events: Union[ZTEventBus, None] = events
+        self.on_drop: Union[Callable[[str], None], None] = on_drop
+
+        # ID -> (game, last access), in least recently used order
+        self._games: 'OrderedDict[str, Tuple[Game, float]]' = OrderedDict()
+
+        # ID -> last access of the spilled games, in least recently used order
+        self._spilled: 'OrderedDict[str, float]' = OrderedDict()
+        self._disk = dbm.open(spill_path, 'n') if spill_path is not None else None
+
+    def __len__(self) -> int:
+        return len(self._games) + len(self._spilled)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games or game_id in self._spilled
+
+    @property
+    def in_memory(self) -> int:
+        """The number of games held in memory
+
+        :return: Number of games in memory
+        :rtype: int
+        """
+        return len(self._games)
+
+    def create(self, pvc: bool = False, _engine_first: bool = True, _solver: bool = False) -> Tuple[str, Game]:
+        """Creates a new game in the store
+
+        :param pvc: Creates a PvC game if True, a PvP game otherwise
+        :type pvc: bool
+        :param _engine_first: Specifies if the engine starts first in a PvC game
+        :type _engine_first: bool
+        :param _solver: Specifies if the engine is the solver in a PvC game
+        :type _solver: bool
+        :return: The ID and the game
+        :rtype: Tuple[str, Game]
+        """
+
+        game = PvC(_engine_first, _solver) if pvc else PvP()
+        return self.add(game), game
+
+    def add(self, game: Game, game_id: Union[str, None] = None) -> str:
+        """Adds a game to the store
+
+        :param game: The game
+        :type game: Game
+        :param game_id: The ID of the game, a new one is generated if None
+        :type game_id: Union[str, None]
+        :return: The ID of the game
+        :rtype: str
+        """
+
+        if game_id is None:
+            game_id = uuid4().hex
+        self.remove(game_id)
+
+        if self.events is not None:
+            game.events = self.events
+        self._games[game_id] = (game, self._clock())
+        self.expire()
+        while len(self._games) > self.max_games:
+            self.__evict()
+        return game_id
+
+    def get(self, game_id: str) -> Game:
+        """Looks up a game, rehydrating it if it was spilled to disk
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :return: The game
+        :rtype: Game
+        :raise: KeyError if there is no such game or it expired
+        :raise: ZTInvalidInput if the snapshot of a spilled game cannot be decoded, the game stays spilled
+        """
+
+        now = self._clock()
+        if game_id in self._games:
+            game, last_access = self._games[game_id]
+            if self.__expired(last_access, now):
+                self.remove(game_id)
+                raise KeyError(game_id)
+            self._games[game_id] = (game, now)
+            self._games.move_to_end(game_id)
+            return game
+
+        if game_id in self._spilled:
+            if self.__expired(self._spilled[game_id], now):
+                self.remove(game_id)
+                raise KeyError(game_id)
+            # The snapshot is only deleted once the game is decoded, a decoding error keeps it on disk
+            game = loads(self._disk[game_id])
+            del self._disk[game_id]
+            del self._spilled[game_id]
+            if self.events is not None:
+                game.events = self.events
+            self._games[game_id] = (game, now)
+            while len(self._games) > self.max_games:
+                self.__evict()
+            return game
+
+        raise KeyError(game_id)
+
+    def remove(self, game_id: str) -> None:
+        """Removes a game from the store, nothing happens if there is no such game
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :return: None
+        """
+
+        if self._games.pop(game_id, None) is None:
+            if game_id not in self._spilled:
+                return
+            del self._disk[game_id]
+            del self._spilled[game_id]
+        self.__dropped(game_id)
+
+    def expire(self) -> int:
+        """Removes the games whose ttl has passed
+
+        :return: The number of games removed
+        :rtype: int
+        """
+
+        if self.ttl is None:
+            return 0
+
+        now = self._clock()
+        removed = 0
+        # Both dictionaries are in least recently used order, so the expired games are at the front
+        while self._games:
+            game_id, (_, last_access) = next(iter(self._games.items()))
+            if not self.__expired(last_access, now):
+                break
+            del self._games[game_id]
+            self.__dropped(game_id)
+            removed += 1
+        while self._spilled:
+            game_id, last_access = next(iter(self._spilled.items()))
+            if not self.__expired(last_access, now):
+                break
+            del self._disk[game_id]
+            del self._spilled[game_id]
+            self.__dropped(game_id)
+            removed += 1
+        return removed
+
+    def close(self) -> None:
+        """Closes the spill file, the spilled games are lost
+
+        :return: None
+        """
+
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+        self._spilled.clear()
+
+    def __expired(self, last_access: float, now: float) -> bool:
+        """Checks if a game accessed at last_access is expired at now
+
+        :param last_access: The last access of the game
+        :type last_access: float
+        :param now: The current time
+        :type now: float
+        :return: True if the game is expired, False otherwise
+        :rtype: bool
+        """
+        return self.ttl is not None and now - last_access >= self.ttl
+
+    def __dropped(self, game_id: str) -> None:
+        """Reports a game leaving the store
+
+        :param game_id: The ID of the game
+        :type game_id: str
+        :return: None
+        """
+
+        if self.on_drop is not None:
+            self.on_drop(game_id)
+
+    def __evict(self) -> None:
+        """Evicts the least recently used game, spilling it to disk if possible
+
+        :return: None
+        """
+
+        game_id, (game, last_access) = next(iter(self._games.items()))
+        # The game leaves the memory only once its snapshot is written
+        if self._disk is not None and _spillable(game):
+            self._disk[game_id] = dumps(game)
+            self._spilled[game_id] = last_access
+            del self._games[game_id]
+        else:
+            del self._games[game_id]
+            self.__dropped(game_id)
@@ -0,0 +1,298 @@
+"""
+Module zttt.tournament
+========================
+
+Plays large numbers of games between two players across a pool of worker processes.
+
+A player is specified by one of the following
+
+1. 'engine': The PvC engine (ZTEngineFirst when it plays first, ZTPlayerFirst otherwise)
+2. 'solver': The PvC solver mode
+3. 'random': Plays uniformly random moves
+4. A callable taking (board_list, player) and returning the position to play.
+   It must be picklable (defined at the top level of a module) to be used with more than one worker.
+   From the command line it is given as 'module:function'.
+
+Usage: python -m zttt.tournament engine random --games 100000 --workers 8
+"""
+
+import json
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from time import perf_counter
+from typing import List, Tuple, Dict, Callable, Union, Any
+
+from ._zt_core.zt_random import ZTRandom
+from .pvc import PvC
+from .pvp import PvP
+
+
+PlayerSpec = Union[str, Callable[[List[int], int], int]]
+
+PLAYERS = ('engine', 'solver', 'random')
+
+
+class _Agent:
+    """Plays one side of a single game"""
+
+    def __init__(self, spec: PlayerSpec, player: int, rng: ZTRandom) -> None:
+        """Initialize the agent
+
+        :param spec: The player specification
+        :type spec: PlayerSpec
+        :param player: The side played by the agent (1 or 2)
+        :type player: int
+        :param rng: The random stream of the chunk
+        :type rng: ZTRandom
+        :return: None
+        """
+
+        self.spec = spec
+        self.player = player
+        self.rng = rng
+        self.engine: Union[PvC, None] = None
+
+    def move(self, game: PvP) -> int:
+        """Returns the move of the agent in the game
+
+        :param game: The game being played
+        :type game: PvP
+        :return: The position to play
+        :rtype: int
+        """
+
+        if self.spec == 'random':
+            return self.rng.choice(game._empty_positions)
+
+        if callable(self.spec):
+            return self.spec(game.board_list, self.player)
+
+        # The engines keep their own game which is kept in sync with the history of the game
+        history = game._history
+        if self.engine is None:
+            self.engine = PvC(self.player == 1, self.spec == 'solver', self.rng)
+        for pos in history[len(self.engine._history):]:
+            self.engine.play(pos)
+        return self.engine._history[len(history)]
+
+
+class TournamentResult:
+    """The results of a tournament from the point of view of the first player specification"""
+
+    def __init__(self) -> None:
+        """Initialize the empty result"""
+
+        self.games: int = 0
+        self.wins: int = 0
+        self.draws: int = 0
+        self.losses: int = 0
+
+        # Opening (first two moves) -> [wins, draws, losses]
+        self.openings: Dict[Tuple[int, ...], List[int]] = {}
+
+        # Total wall clock time of the tournament in seconds
+        self.elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """The games played per second
+
+        :return: Games per second
+        :rtype: float
+        """
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def _add(self, outcome: int, opening: Tuple[int, ...]) -> None:
+        """Records a game
+
+        :param outcome: 0 for a win, 1 for a draw and 2 for a loss
+        :type outcome: int
+        :param opening: The first two moves of the game
+        :type opening: Tuple[int, ...]
+        :return: None
+        """
+
+        self.games += 1
+        if outcome == 0:
+            self.wins += 1
+        elif outcome == 1:
+            self.draws += 1
+        else:
+            self.losses += 1
+        self.openings.setdefault(opening, [0, 0, 0])[outcome] += 1
+
+    def merge(self, other: 'TournamentResult') -> None:
+        """Adds the games of another result to this one
+
+        :param other: The other result
+        :type other: TournamentResult
+        :return: None
+        """
+
+        self.games += other.games
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        for opening, counts in other.openings.items():
+            total = self.openings.setdefault(opening, [0, 0, 0])
+            for i in range(3):
+                total[i] += counts[i]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the result to a JSON serializable dictionary
+
+        :return: The dictionary of the result
+        :rtype: Dict[str, Any]
+        """
+
+        return {
+            'games': self.games,
+            'wins': self.wins,
+            'draws': self.draws,
+            'losses': self.losses,
+            'elapsed': self.elapsed,
+            'throughput': self.throughput,
+            'openings': {
+                ','.join(map(str, opening)): dict(zip(('wins', 'draws', 'losses'), counts))
+                for opening, counts in sorted(self.openings.items())
+            }
+        }
+
+
+def _play_chunk(spec1: PlayerSpec, spec2: PlayerSpec, games: int, swap: bool, rng: ZTRandom) -> TournamentResult:
+    """Plays a chunk of games in a worker
+
+    :param spec1: The first player specification
+    :type spec1: PlayerSpec
+    :param spec2: The second player specification
+    :type spec2: PlayerSpec
+    :param games: The number of games to play
+    :type games: int
+    :param swap: Whether the players alternate playing first
+    :type swap: bool
+    :param rng: The random stream of the chunk, drawn from by both players
+    :type rng: ZTRandom
+    :return: The results of the chunk
+    :rtype: TournamentResult
+    """
+
+    result = TournamentResult()
+    for i in range(games):
+        first = 2 if swap and i % 2 else 1  # The side played by spec1
+        agents = {first: _Agent(spec1, first, rng), 3 - first: _Agent(spec2, 3 - first, rng)}
+
+        game = PvP()
+        while game.status:
+            game.play(agents[game.turn].move(game))
+
+        if game.winner == 0:
+            outcome = 1
+        else:
+            outcome = 0 if game.winner == first else 2
+        result._add(outcome, tuple(game._history[:2]))
+    return result
+
+
+def _chunk_streams(seed: Union[int, None], chunks: int) -> List[ZTRandom]:
+    """Spawns an independent random stream for every chunk
+
+    :param seed: The seed of the tournament, random if None
+    :type seed: Union[int, None]
+    :param chunks: The number of chunks
+    :type chunks: int
+    :return: The list of streams
+    :rtype: List[ZTRandom]
+    """
+    return ZTRandom(seed).spawn(chunks)
+
+
+def run_tournament(spec1: PlayerSpec, spec2: PlayerSpec, games: int, workers: Union[int, None] = None,
+                   chunk_size: int = 1000, swap: bool = True, seed: Union[int, None] = None) -> TournamentResult:
+    """Plays games between two players across a process pool
+
+    :param spec1: The first player specification
+    :type spec1: PlayerSpec
+    :param spec2: The second player specification
+    :type spec2: PlayerSpec
+    :param games: The number of games to play
+    :type games: int
+    :param workers: The number of worker processes, the number of CPUs if None and in process if 1
+    :type workers: Union[int, None]
+    :param chunk_size: The number of games given to a worker at once
+    :type chunk_size: int
+    :param swap: Whether the players alternate playing first
+    :type swap: bool
+    :param seed: The seed of the tournament, the same seed and chunk size replay the same games
+    :type seed: Union[int, None]
+    :return: The results from the point of view of spec1
+    :rtype: TournamentResult
+    :raise: ValueError if a player specification is invalid
+    """
+
+    for spec in (spec1, spec2):
+        if not callable(spec) and spec not in PLAYERS:
+            raise ValueError(f"Unknown player {spec!r}, expected a callable or one of {PLAYERS}")
+
+    sizes = [chunk_size] * (games // chunk_size)
+    if games % chunk_size:
+        sizes.append(games % chunk_size)
+    args = [(spec1, spec2, size, swap, rng)
+            for size, rng in zip(sizes, _chunk_streams(seed, len(sizes)))]
+
+    result = TournamentResult()
+    start = perf_counter()
+    if workers == 1:
+        for chunk in args:
+            result.merge(_play_chunk(*chunk))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            for chunk in executor.map(_play_chunk, *zip(*args)):
+                result.merge(chunk)
+    result.elapsed = perf_counter() - start
+    return result
+
+
+def _parse_player(spec: str) -> PlayerSpec:
+    """Parses a player given on the command line
+
+    :param spec: One of PLAYERS or 'module:function'
+    :type spec: str
+    :return: The player specification
+    :rtype: PlayerSpec
+    """
+
+    if spec in PLAYERS:
+        return spec
+    module, _, name = spec.partition(':')
+    return getattr(import_module(module), name)
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    """The command line entry point"""
+
+    parser = ArgumentParser(prog='python -m zttt.tournament', description=__doc__.split('\n\n')[1])
+    parser.add_argument('player1', help="engine, solver, random or module:function")
+    parser.add_argument('player2', help="engine, solver, random or module:function")
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--no-swap', action='store_true', help="player1 always plays first")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help="print the full result as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_tournament(_parse_player(args.player1), _parse_player(args.player2), args.games,
+                            args.workers, args.chunk_size, not args.no_swap, args.seed)
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+        return
+
+    print(f"{args.player1} vs {args.player2}: {result.games} games")
+    print(f"Wins: {result.wins}, Draws: {result.draws}, Losses: {result.losses}")
+    print(f"{result.throughput:.0f} games/s")
+
+
+if __name__ == '__main__':
+    main()